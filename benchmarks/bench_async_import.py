@@ -0,0 +1,166 @@
+"""
+Compare the async XML import (xml_to_mongodb_async.py) with the threaded
+import_parallel path of xml_to_mongodb.py.
+
+Writes synthetic NIRF XML files and imports them both ways into an
+in-process stand-in for the individuals collection that keeps documents in
+a dict and waits a fixed latency on every round trip (the hash lookup and
+the bulk write of each batch), like a remote server would. The synchronous
+path waits with time.sleep, one batch at a time; the async path waits with
+asyncio.sleep, so its concurrent batches overlap. Each import runs twice:
+the first run writes every document, the second finds them unchanged.
+
+Reports wall time of both runs, checks the counters match and that both
+collections end up with the same documents (import timestamps aside).
+No MongoDB server is needed.
+
+Usage: python benchmarks/bench_async_import.py [files] [latency_ms] [batch_size] [concurrency] [workers]
+"""
+import asyncio
+import contextlib
+import copy
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pymongo
+from bench_xml_parse import write_xml
+from xml_to_mongodb import IndividualBatchWriter, import_parallel
+from xml_to_mongodb_async import AsyncIndividualLoader, load_xml_files_async
+
+
+class MemoryCollection:
+    """The part of the collection API the individual writes use, on a dict of documents."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.docs = {}
+        self.round_trips = 0
+
+    def find_stored(self, query):
+        self.round_trips += 1
+        return [copy.deepcopy(self.docs[_id]) for _id in query['_id']['$in'] if _id in self.docs]
+
+    def apply(self, writes):
+        self.round_trips += 1
+        for write in writes:
+            # pymongo keeps the filter and document of a write operation in these attributes
+            _id = write._filter['_id']
+            if isinstance(write, pymongo.ReplaceOne):
+                self.docs[_id] = copy.deepcopy(write._doc)
+                continue
+            doc = self.docs[_id]
+            doc.update(copy.deepcopy(write._doc['$set']))
+            for field in write._doc.get('$unset', {}):
+                doc.pop(field, None)
+
+
+class SyncCollection:
+    def __init__(self, store):
+        self.store = store
+
+    def find(self, query, projection=None):
+        time.sleep(self.store.latency)
+        return self.store.find_stored(query)
+
+    def bulk_write(self, writes, ordered=True):
+        time.sleep(self.store.latency)
+        self.store.apply(writes)
+
+
+class AsyncCursor:
+    def __init__(self, store, query):
+        self.store = store
+        self.query = query
+
+    async def to_list(self, length=None):
+        await asyncio.sleep(self.store.latency)
+        return self.store.find_stored(self.query)
+
+
+class AsyncCollection:
+    def __init__(self, store):
+        self.store = store
+
+    def find(self, query, projection=None):
+        return AsyncCursor(self.store, query)
+
+    async def bulk_write(self, writes, ordered=True):
+        await asyncio.sleep(self.store.latency)
+        self.store.apply(writes)
+
+
+class StandInDatabase:
+    """db[name] for both drivers; every collection name maps to the one store."""
+
+    def __init__(self, store, collection_class):
+        self.store = store
+        self.collection_class = collection_class
+
+    def __getitem__(self, name):
+        return self.collection_class(self.store)
+
+
+def run_sync(paths, store, batch_size, workers):
+    writer = IndividualBatchWriter(StandInDatabase(store, SyncCollection), batch_size=batch_size)
+    start = time.perf_counter()
+    with contextlib.redirect_stderr(io.StringIO()):
+        failed = import_parallel(paths, writer, workers)
+    return time.perf_counter() - start, (writer.written, writer.skipped, writer.failed + failed)
+
+
+def run_async(paths, store, batch_size, concurrency, workers):
+    loader = AsyncIndividualLoader(StandInDatabase(store, AsyncCollection), batch_size=batch_size,
+                                   concurrency=concurrency)
+    start = time.perf_counter()
+    with contextlib.redirect_stderr(io.StringIO()):
+        failed = asyncio.run(load_xml_files_async(paths, loader, workers))
+    return time.perf_counter() - start, (loader.written, loader.skipped, loader.failed + failed)
+
+
+def comparable(store):
+    docs = copy.deepcopy(store.docs)
+    for doc in docs.values():
+        doc['metadata'].pop('imported_at', None)
+    return docs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 20.0) / 1000
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    concurrency = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else (os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index in range(count):
+            path = os.path.join(tmp, f"{index + 1:03d}-report.xml")
+            write_xml(path, index, 20)
+            paths.append(path)
+
+        sync_store = MemoryCollection(latency)
+        async_store = MemoryCollection(latency)
+        results = {}
+        for run in ("first", "repeat"):
+            results[run] = (run_sync(paths, sync_store, batch_size, workers),
+                            run_async(paths, async_store, batch_size, concurrency, workers))
+
+    print(f"{count} files, {latency * 1000:.0f} ms per round trip, batch size {batch_size}, "
+          f"{concurrency} concurrent writes, {workers} worker processes")
+    for run, ((sync_time, sync_counts), (async_time, async_counts)) in results.items():
+        assert sync_counts == async_counts, (run, sync_counts, async_counts)
+        written, skipped, failed = sync_counts
+        print(f"  {run:<7} written {written}, unchanged {skipped}, failed {failed}")
+        print(f"    import_parallel (threaded writer)  {sync_time:7.2f}s")
+        print(f"    xml_to_mongodb_async               {async_time:7.2f}s   (speedup {sync_time / async_time:.2f}x)")
+    assert comparable(sync_store) == comparable(async_store)
+    print(f"  round trips: threaded {sync_store.round_trips}, async {async_store.round_trips}")
+    print("  stored documents identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Compare the old per-cell numeric checks with cell_coercion.CellCoercer.
+
+Coerces the numeric columns of placement-shaped tables (the widest numeric
+table the parsers read) with the inline per-cell expressions the placement
+parser used to run and with a CellCoercer, in two workloads:
+
+- many small tables of 6 to 30 rows, as in real reports, with one coercer
+  per report of three tables,
+- one large table.
+
+The coercer is timed with its cache reset before the workload (cold) and
+with the cache left from earlier runs (warm, the usual case in a process
+that extracts many reports). Reports wall time (best of several runs),
+checks that the coercer agrees with the old checks wherever those found a
+value and prints the coercion counters, including cells the old code
+dropped (grouped numbers) that the coercer parses.
+
+Usage: python benchmarks/bench_cell_coercion.py [rows] [reports]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import cell_coercion
+from cell_coercion import CellCoercer, format_coercion_stats
+
+YEARS = ["2017-18", "2018-19", "2019-20", "2020-21", "2021-22", "2022-23"]
+# Column indexes of the numeric placement fields
+NUMERIC_COLUMNS = [1, 2, 6, 7, 8, 9]
+
+
+def make_rows(count, seed=0):
+    rng = random.Random(seed)
+
+    def count_cell(high):
+        return rng.choice(["-", "", str(rng.randint(0, high)), str(rng.randint(0, high))])
+
+    rows = []
+    for i in range(count):
+        salary = rng.choice(["-", f"{rng.randint(3, 18) * 50000}(Rupees {rng.randint(3, 18)} Lakhs)",
+                             f"{rng.randint(3, 18)},{rng.randint(10, 99)},000"])
+        rows.append([YEARS[i % 6], count_cell(240), count_cell(240), "-", "-", YEARS[(i + 3) % 6],
+                     count_cell(230), count_cell(200), salary, count_cell(30)])
+    return rows
+
+
+def per_cell(rows):
+    """The placement parser's inline checks, collected into columns."""
+    columns = [[] for _ in NUMERIC_COLUMNS]
+    for row in rows:
+        columns[0].append(int(row[1]) if len(row) > 1 and row[1] and row[1].strip() != '-' and row[1].strip().isdigit() else None)
+        columns[1].append(int(row[2]) if len(row) > 2 and row[2] and row[2].strip() != '-' and row[2].strip().isdigit() else None)
+        columns[2].append(int(row[6]) if len(row) > 6 and row[6] and row[6].strip() != '-' and row[6].strip().isdigit() else None)
+        columns[3].append(int(row[7]) if len(row) > 7 and row[7] and row[7].strip() != '-' and row[7].strip().isdigit() else None)
+        if len(row) > 8 and row[8] and row[8].strip() != '-':
+            salary_parts = row[8].split("(")
+            columns[4].append(int(salary_parts[0].strip()) if salary_parts[0].strip().isdigit() else None)
+        else:
+            columns[4].append(None)
+        columns[5].append(int(row[9]) if len(row) > 9 and row[9] and row[9].strip() != '-' and row[9].strip().isdigit() else None)
+    return columns
+
+
+def best_time(func, repeat=5, setup=None):
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def coerce_reports(reports):
+    """Coerce every table with one CellCoercer per report, as the extraction does."""
+    results = []
+    for tables in reports:
+        coercer = CellCoercer()
+        results.extend(coercer.table(rows, NUMERIC_COLUMNS) for rows in tables)
+    return results
+
+
+def check_agrees(old_columns, new_columns):
+    for old_column, new_column in zip(old_columns, new_columns):
+        assert all(old is None or old == new for old, new in zip(old_column, new_column))
+
+
+def report(label, old_time, cold_time, warm_time):
+    print(label)
+    print(f"  per-cell checks (old)   {old_time * 1000:8.2f} ms")
+    print(f"  CellCoercer, cold cache {cold_time * 1000:8.2f} ms   ({old_time / cold_time:.2f}x)")
+    print(f"  CellCoercer, warm cache {warm_time * 1000:8.2f} ms   ({old_time / warm_time:.2f}x)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    report_count = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    reports = [[make_rows(size, seed) for size in (6, 12, 30)] for seed in range(report_count)]
+    old_time, old_tables = best_time(lambda: [per_cell(rows) for tables in reports for rows in tables], 15)
+    cold_time, _ = best_time(lambda: coerce_reports(reports), 15, setup=cell_coercion._reset_cache)
+    warm_time, new_tables = best_time(lambda: coerce_reports(reports), 15)
+    for old_columns, new_columns in zip(old_tables, new_tables):
+        check_agrees(old_columns, new_columns)
+    report(f"{report_count} reports of 3 small tables", old_time, cold_time, warm_time)
+
+    rows = make_rows(count)
+    old_time, old_columns = best_time(lambda: per_cell(rows))
+    cold_time, _ = best_time(lambda: CellCoercer().table(rows, NUMERIC_COLUMNS), setup=cell_coercion._reset_cache)
+    warm_time, new_columns = best_time(lambda: CellCoercer().table(rows, NUMERIC_COLUMNS))
+    check_agrees(old_columns, new_columns)
+    report(f"one table of {count} rows, {count * len(NUMERIC_COLUMNS)} numeric cells", old_time, cold_time,
+           warm_time)
+
+    old_parsed = sum(value is not None for column in old_columns for value in column)
+    stats = CellCoercer()
+    stats.table(rows, NUMERIC_COLUMNS)
+    print(f"  old checks: {old_parsed} values; coercion: {format_coercion_stats(stats.stats)}")
+
+
+if __name__ == "__main__":
+    main()
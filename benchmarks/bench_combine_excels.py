@@ -0,0 +1,101 @@
+"""
+Peak memory and wall time of copy_excels_to_sheets: in-memory, streaming and
+parallel.
+
+Writes synthetic institute workbooks (one sheet of section rows, a formula
+column included) into a temporary directory and combines the first N of them
+for growing N with each mode. Reports tracemalloc peak memory (of the main
+process only, so for the parallel mode it covers the writer) and wall time,
+and checks that all combined workbooks hold the same values and formulas.
+
+Usage: python benchmarks/bench_combine_excels.py [max_files] [rows_per_file] [workers]
+"""
+import contextlib
+import functools
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from openpyxl import Workbook, load_workbook
+from copy_excels_to_sheets import copy_excel_sheets, copy_excel_sheets_parallel, copy_excel_sheets_streaming
+
+YEARS = ["2017-18", "2018-19", "2019-20", "2020-21", "2021-22", "2022-23"]
+
+
+def write_workbook(path, index, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Section", "Program", "Year", "Male", "Female", "Total"])
+    for i in range(rows):
+        r = i + 2
+        ws.append([f"Section {i // 50}", "UG [4 Years Program(s)]", YEARS[i % 6], (index + i) % 300, i % 120,
+                   f"=D{r}+E{r}"])
+    wb.save(path)
+
+
+def combine(func, excel_dir, output):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(excel_dir, output)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def sheet_values(path):
+    wb = load_workbook(path, read_only=True)
+    try:
+        return {ws.title: [row for row in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+    finally:
+        wb.close()
+
+
+def main():
+    max_files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+    parallel = functools.partial(copy_excel_sheets_parallel, workers=workers)
+    counts = sorted({max(1, max_files // 8), max(1, max_files // 4), max(1, max_files // 2), max_files})
+
+    tmp = tempfile.mkdtemp()
+    try:
+        source = os.path.join(tmp, "source")
+        os.mkdir(source)
+        names = [f"{index + 1}-Institute {index + 1}.xlsx" for index in range(max_files)]
+        for index, name in enumerate(names):
+            write_workbook(os.path.join(source, name), index, rows)
+
+        print(f"{rows} rows per file, {workers} workers")
+        print(f"{'files':>6} {'in-memory':>12} {'peak':>10} {'streaming':>12} {'peak':>10} "
+              f"{'parallel':>12} {'peak':>10}")
+        for count in counts:
+            excel_dir = os.path.join(tmp, f"files_{count}")
+            os.mkdir(excel_dir)
+            for name in names[:count]:
+                os.link(os.path.join(source, name), os.path.join(excel_dir, name))
+            old_out = os.path.join(tmp, f"old_{count}.xlsx")
+            new_out = os.path.join(tmp, f"new_{count}.xlsx")
+            par_out = os.path.join(tmp, f"par_{count}.xlsx")
+            old_time, old_peak = combine(copy_excel_sheets, excel_dir, old_out)
+            new_time, new_peak = combine(copy_excel_sheets_streaming, excel_dir, new_out)
+            par_time, par_peak = combine(parallel, excel_dir, par_out)
+            expected = sheet_values(old_out)
+            assert sheet_values(new_out) == expected and sheet_values(par_out) == expected
+            assert list(expected) == [name[name.index("-") + 1:-5] for name in names[:count]]
+            print(f"{count:>6} {old_time:>11.2f}s {old_peak / 1024 / 1024:>6.1f} MiB "
+                  f"{new_time:>11.2f}s {new_peak / 1024 / 1024:>6.1f} MiB "
+                  f"{par_time:>11.2f}s {par_peak / 1024 / 1024:>6.1f} MiB")
+        print("combined workbooks identical")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
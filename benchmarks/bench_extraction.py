@@ -0,0 +1,166 @@
+"""
+Benchmark the PDF extraction path on synthetic NIRF-shaped reports.
+
+Generates PDFs with benchmarks/synthetic_pdf.py, runs nirf_extraction
+(with section regions and with whole-page table detection) plus the XML sink
+over each of them and reports per-file and per-section wall time and peak
+memory. Timings come from runs without tracemalloc; peak memory is measured
+in a separate traced run, so tracing overhead does not distort the timings.
+
+Results are written as JSON so runs can be compared:
+
+  python benchmarks/bench_extraction.py --json before.json
+  (change the code)
+  python benchmarks/bench_extraction.py --json after.json --compare before.json
+
+Usage: python benchmarks/bench_extraction.py [--files N] [--pages N] [--rows N]
+       [--layouts nirf,no-headings,cluttered] [--modes regions,whole-page]
+       [--repeat N] [--json PATH] [--compare PATH]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pdfplumber
+from nirf_extraction import extract_report
+from nirf_sinks import XMLSink
+from synthetic_pdf import LAYOUTS, generate
+
+MODES = {"regions": True, "whole-page": False}
+
+
+def run_file(pdf_path, xml_dir, use_regions):
+    """Extract one PDF and write its XML; return (seconds, report, xml seconds)."""
+    start = time.perf_counter()
+    report = extract_report(pdf_path, use_regions=use_regions)
+    extracted = time.perf_counter()
+    XMLSink(xml_dir).write(report)
+    end = time.perf_counter()
+    return end - start, report, end - extracted
+
+
+def bench_file(pdf_path, xml_dir, use_regions, repeat):
+    """Time one file (best of repeat runs), then measure its peak memory."""
+    best = None
+    for _ in range(repeat):
+        seconds, report, xml_seconds = run_file(pdf_path, xml_dir, use_regions)
+        if best is None or seconds < best[0]:
+            best = (seconds, report, xml_seconds)
+    seconds, report, xml_seconds = best
+
+    tracemalloc.start()
+    run_file(pdf_path, xml_dir, use_regions)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sections = dict(report.section_seconds)
+    sections["XMLWrite"] = xml_seconds
+    return {
+        "file": os.path.basename(pdf_path),
+        "seconds": seconds,
+        "peak_bytes": peak,
+        "records": sum(len(records) for _, records in report.items()),
+        "sections": sections,
+    }
+
+
+def summarize(files):
+    seconds = [f["seconds"] for f in files]
+    section_totals = {}
+    for f in files:
+        for name, value in f["sections"].items():
+            section_totals[name] = section_totals.get(name, 0.0) + value
+    return {
+        "files": len(files),
+        "total_seconds": sum(seconds),
+        "mean_seconds": statistics.mean(seconds),
+        "median_seconds": statistics.median(seconds),
+        "max_seconds": max(seconds),
+        "max_peak_bytes": max(f["peak_bytes"] for f in files),
+        "records": sum(f["records"] for f in files),
+        "section_seconds": section_totals,
+    }
+
+
+def print_run(run):
+    summary = run["summary"]
+    print(f"\n{run['layout']} / {run['mode']}: {summary['files']} files, {summary['records']} records")
+    print(f"  per file   mean {summary['mean_seconds'] * 1000:8.1f} ms   median {summary['median_seconds'] * 1000:8.1f} ms"
+          f"   max {summary['max_seconds'] * 1000:8.1f} ms   peak {summary['max_peak_bytes'] / 1024 / 1024:6.1f} MiB")
+    for name, value in summary["section_seconds"].items():
+        print(f"  {name:<24} {value / summary['files'] * 1000:8.1f} ms/file")
+
+
+def compare(results, previous_path):
+    """Print the mean per-file time of each run against a previous results file."""
+    with open(previous_path, encoding="utf-8") as f:
+        previous = {(run["layout"], run["mode"]): run["summary"] for run in json.load(f)["runs"]}
+    print(f"\nCompared with {previous_path}:")
+    for run in results["runs"]:
+        before = previous.get((run["layout"], run["mode"]))
+        if before is None:
+            continue
+        after = run["summary"]
+        print(f"  {run['layout'] + ' / ' + run['mode']:<28} mean {before['mean_seconds'] * 1000:8.1f} -> "
+              f"{after['mean_seconds'] * 1000:8.1f} ms ({after['mean_seconds'] / before['mean_seconds']:.2f}x), "
+              f"peak {before['max_peak_bytes'] / 1024 / 1024:6.1f} -> {after['max_peak_bytes'] / 1024 / 1024:6.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction on synthetic NIRF reports")
+    parser.add_argument("--files", type=int, default=5, help="PDFs per layout (default: 5)")
+    parser.add_argument("--pages", type=int, default=4, help="Pages per PDF (default: 4)")
+    parser.add_argument("--rows", type=int, default=5, help="Data rows per variable-length table (default: 5)")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS), help="Comma-separated layouts to run")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated extraction modes to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per file, best is kept (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generated cell values")
+    parser.add_argument("--json", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="Compare with a previous JSON results file")
+    args = parser.parse_args()
+
+    layouts = args.layouts.split(",")
+    modes = args.modes.split(",")
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode {mode!r}, expected one of {list(MODES)}")
+
+    results = {
+        "config": {"files": args.files, "pages": args.pages, "rows": args.rows,
+                   "repeat": args.repeat, "seed": args.seed},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "pdfplumber": getattr(pdfplumber, "__version__", None)},
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_dir = os.path.join(tmp, "xml")
+        os.makedirs(xml_dir)
+        for layout in layouts:
+            pdf_dir = os.path.join(tmp, layout)
+            names = generate(pdf_dir, args.files, args.pages, args.rows, layout, args.seed)
+            for mode in modes:
+                files = [bench_file(os.path.join(pdf_dir, name), xml_dir, MODES[mode], args.repeat)
+                         for name in names]
+                run = {"layout": layout, "mode": mode, "files": files, "summary": summarize(files)}
+                results["runs"].append(run)
+                print_run(run)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
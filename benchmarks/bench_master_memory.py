@@ -0,0 +1,100 @@
+"""
+Measure the peak memory of the client-side master build as the individuals
+collection grows.
+
+Fills a scratch database on a running MongoDB server with synthetic college
+documents (several per college, like repeated yearly imports), runs
+xml_to_mongodb.create_master_database over each collection size under
+tracemalloc and prints time and peak traced memory. With the streamed,
+chunked build the peak should stay roughly flat as the size grows; it only
+depends on the chunk size.
+
+The scratch database is dropped at the end.
+
+Usage: python benchmarks/bench_master_memory.py [--host H] [--port N]
+       [--sizes 1000,5000,20000] [--chunk-size N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pymongo
+from xml_to_mongodb import MASTER_CHUNK_SIZE, create_master_database, prepare_individual_document
+
+YEARS = ["2017-18", "2018-19", "2019-20", "2020-21", "2021-22", "2022-23"]
+# Source documents per college
+DOCS_PER_COLLEGE = 3
+
+
+def make_document(index):
+    """One synthetic individual document shaped like parse_xml_to_dict output."""
+    college = index // DOCS_PER_COLLEGE
+    data = {
+        'institute': {'name': f"Synthetic Institute {college} [IR-S-{college:06d}]",
+                      'source_file': f"IR-S-{college:06d}-{index % DOCS_PER_COLLEGE}.pdf",
+                      'college_id': f"IR-S-{college:06d}"},
+        'sanctionedintake': [{'program_name': 'UG [4 Years Program(s)]', 'academic_year': year,
+                              'approved_intake': 60 + index % 300} for year in YEARS],
+        'placementdata': [{'academic_year': year, 'graduating_students': 110, 'placed': 90,
+                           'median_salary': 650000 + index} for year in YEARS],
+        'capitalexpenditure': [{'category': 'Library', 'academic_year': year,
+                                'amount': 1000000 + index} for year in YEARS[:3]],
+    }
+    return prepare_individual_document(data)
+
+
+def fill(collection, count, start):
+    """Add documents start..count-1 to the collection."""
+    batch = []
+    for index in range(start, count):
+        batch.append(make_document(index))
+        if len(batch) >= 1000:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of the master build by collection size")
+    parser.add_argument("--host", default="localhost", help="MongoDB host (default: localhost)")
+    parser.add_argument("--port", type=int, default=27017, help="MongoDB port (default: 27017)")
+    parser.add_argument("--sizes", default="1000,5000,20000",
+                        help="Comma-separated individuals collection sizes (default: 1000,5000,20000)")
+    parser.add_argument("--chunk-size", type=int, default=MASTER_CHUNK_SIZE,
+                        help=f"Documents per master build chunk (default: {MASTER_CHUNK_SIZE})")
+    parser.add_argument("--db", default="nirf_master_memory_bench", help="Scratch database, dropped at the end")
+    args = parser.parse_args()
+
+    client = pymongo.MongoClient(args.host, args.port)
+    db = client[args.db]
+    db.individuals.drop()
+    results = []
+    try:
+        filled = 0
+        for size in sorted(int(size) for size in args.sizes.split(",")):
+            fill(db.individuals, size, filled)
+            filled = size
+            db.master_database.drop()
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            create_master_database(db, 'individuals', 'master_database', chunk_size=args.chunk_size)
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append((size, seconds, peak))
+    finally:
+        client.drop_database(args.db)
+        client.close()
+
+    print(f"\nMaster build, chunk size {args.chunk_size}:")
+    for size, seconds, peak in results:
+        print(f"  {size:>8} documents   {seconds:8.2f} s   peak {peak / 1024 / 1024:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
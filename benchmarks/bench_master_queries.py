@@ -0,0 +1,137 @@
+"""
+Explain plans and latencies of the master_queries helpers before and after
+ensure_master_indexes.
+
+Fills a scratch collection on a running MongoDB server with synthetic master
+documents, runs every helper query without the managed indexes and then with
+them, and prints for each query the winning plan stages (COLLSCAN vs IXSCAN),
+the documents and index keys examined and the median client-side latency.
+
+The scratch database is dropped at the end.
+
+Usage: python benchmarks/bench_master_queries.py [--host H] [--port N]
+       [--colleges N] [--repeat N] [--json PATH]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pymongo
+import master_queries as mq
+
+YEARS = ["2017-18", "2018-19", "2019-20", "2020-21", "2021-22", "2022-23"]
+PROGRAMS = ["UG [4 Years Program(s)]", "UG [5 Years Program(s)]", "PG [2 Year Program(s)]",
+            "PG-Integrated [5 Years Program(s)]"]
+CATEGORIES = ["Library", "New Equipment and software for Laboratories", "Engineering Workshops"]
+
+# (label, helper call) pairs; each call returns a cursor
+QUERIES = [
+    ("placements_by_year", lambda c: mq.placements_by_year(c, "2021-22", min_median_salary=1500000)),
+    ("colleges_with_program", lambda c: mq.colleges_with_program(c, PROGRAMS[3], "2022-23")),
+    ("capital_expenditure_by_year", lambda c: mq.capital_expenditure_by_year(c, "2017-18", CATEGORIES[0])),
+    ("operational_expenditure_by_year", lambda c: mq.operational_expenditure_by_year(c, "2018-19")),
+    ("sponsored_projects_by_year", lambda c: mq.sponsored_projects_by_year(c, "2017-18")),
+    ("phd_by_type", lambda c: mq.phd_by_type(c, "PartTime_Graduated")),
+    ("find_colleges_by_name", lambda c: mq.find_colleges_by_name(c, "Synthetic Institute 12")),
+]
+
+
+def make_college(index):
+    """One synthetic master_database document."""
+    # Only some colleges run the integrated program, report part-time graduates
+    # or report the older years
+    programs = PROGRAMS if index % 10 == 0 else PROGRAMS[:3]
+    reported = YEARS[index % 6:]
+    return {
+        "college_id": f"IR-S-{index:06d}",
+        "college_name": f"Synthetic Institute {index}",
+        "metadata": {"source_files": [f"IR-S-{index:06d}.pdf"]},
+        "sanctionedintake": [{"program_name": program, "academic_year": year, "approved_intake": 60 + index % 300}
+                             for program in programs for year in YEARS],
+        "placementdata": [{"academic_year": year, "placed": 90, "graduatingstudents": 110,
+                           "median_salary": 300000 + (index * 7919 + i * 104729) % 1700000}
+                          for i, year in enumerate(YEARS)],
+        "capitalexpenditure": [{"category": category, "academic_year": year, "amount": 1000000 + index}
+                               for category in CATEGORIES for year in reported],
+        "operationalexpenditure": [{"category": "Salaries", "academic_year": year, "amount": 5000000 + index}
+                                   for year in reported],
+        "sponsoredprojects": [{"type": "Total no. of Sponsored Projects", "academic_year": year,
+                               "value": index % 200} for year in reported],
+        "phddata": [{"type": "FullTime_Total", "count": index % 300}]
+                   + ([{"type": "PartTime_Graduated", "count": 4}] if index % 25 == 0 else []),
+    }
+
+
+def measure(collection, repeat):
+    """Explain and time every query; return one result dict per query."""
+    results = []
+    for label, query in QUERIES:
+        explain = query(collection).explain()
+        stats = explain.get("executionStats", {})
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = len(list(query(collection)))
+            latencies.append(time.perf_counter() - start)
+        results.append({
+            "query": label,
+            "stages": mq.plan_stages(explain),
+            "returned": count,
+            "docs_examined": stats.get("totalDocsExamined"),
+            "keys_examined": stats.get("totalKeysExamined"),
+            "median_ms": statistics.median(latencies) * 1000,
+        })
+    return results
+
+
+def print_results(title, results):
+    print(f"\n{title}")
+    for r in results:
+        print(f"  {r['query']:<34} {r['median_ms']:8.2f} ms  {r['returned']:>6} returned  "
+              f"docs {r['docs_examined']!s:>7}  keys {r['keys_examined']!s:>7}  {' <- '.join(r['stages'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Explain plans and latencies of the master_database queries")
+    parser.add_argument("--host", default="localhost", help="MongoDB host (default: localhost)")
+    parser.add_argument("--port", type=int, default=27017, help="MongoDB port (default: 27017)")
+    parser.add_argument("--colleges", type=int, default=20000, help="Synthetic colleges (default: 20000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query, median is kept (default: 5)")
+    parser.add_argument("--db", default="nirf_query_bench", help="Scratch database, dropped at the end")
+    parser.add_argument("--json", default=None, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    client = pymongo.MongoClient(args.host, args.port)
+    collection = client[args.db]["master_database"]
+    try:
+        collection.drop()
+        for start in range(0, args.colleges, 1000):
+            collection.insert_many([make_college(i) for i in range(start, min(start + 1000, args.colleges))])
+
+        before = measure(collection, args.repeat)
+        start = time.perf_counter()
+        created = mq.ensure_master_indexes(collection)
+        index_seconds = time.perf_counter() - start
+        after = measure(collection, args.repeat)
+        # A second call has nothing left to do
+        assert mq.ensure_master_indexes(collection) == []
+    finally:
+        client.drop_database(args.db)
+        client.close()
+
+    print(f"{args.colleges} colleges")
+    print_results("Without indexes:", before)
+    print_results(f"With the managed indexes ({len(created)} created in {index_seconds:.2f}s):", after)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"colleges": args.colleges, "before": before, "after": after,
+                       "index_seconds": index_seconds}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
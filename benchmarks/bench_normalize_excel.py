@@ -0,0 +1,133 @@
+"""
+Compare the old normalize_excel_sheets.process_excel_file with the current one.
+
+Writes synthetic institute workbooks like the ones in All-Excels (padded
+text, numbers stored as text, NULL/None markers, blanks, a formula column),
+normalizes each file both ways and reports wall time and output file size.
+Checks that both outputs hold the same values; the old version wrote missing
+values as NaN where the current one leaves the cell empty. Run it with
+pandas < 3: on pandas 3 text columns are no longer object dtype and the old
+version skips stripping them.
+
+Usage: python benchmarks/bench_normalize_excel.py [rows_per_file] [files]
+"""
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, PatternFill
+from normalize_excel_sheets import process_excel_file
+
+YEARS = ["2017-18", "2018-19", "2019-20", "2020-21", "2021-22", "2022-23"]
+MARKERS = ["", "  ", "NULL", "None", "-"]
+
+
+def old_normalize_data(df):
+    df_normalized = df.copy()
+    for col in df_normalized.columns:
+        if df_normalized[col].dtype == 'object':
+            df_normalized[col] = df_normalized[col].astype(str).str.strip()
+    df_normalized = df_normalized.replace(['', 'nan', 'None', 'none', 'NULL', 'null'], np.nan)
+    for col in df_normalized.columns:
+        try:
+            df_normalized[col] = pd.to_numeric(df_normalized[col], errors='ignore')
+        except:
+            pass
+    return df_normalized
+
+
+def old_process_excel_file(file_path, output_path):
+    """process_excel_file before it loaded the workbook once and used conditional formatting."""
+    wb = load_workbook(file_path)
+    ws = wb.active
+    data = []
+    for row in ws.iter_rows(values_only=True):
+        data.append(row)
+    df = pd.DataFrame(data[1:], columns=data[0])
+    df_normalized = old_normalize_data(df)
+    wb_normalized = load_workbook(file_path)
+    ws_normalized = wb_normalized.active
+    for row in ws_normalized.iter_rows():
+        for cell in row:
+            cell.value = None
+    for r_idx, row in enumerate(df_normalized.itertuples(), 2):
+        for c_idx, value in enumerate(row[1:], 1):
+            ws_normalized.cell(row=r_idx, column=c_idx, value=value)
+    for c_idx, col_name in enumerate(df_normalized.columns, 1):
+        ws_normalized.cell(row=1, column=c_idx, value=col_name)
+        ws_normalized.cell(row=1, column=c_idx).font = Font(bold=True)
+    missing_fill = PatternFill(start_color='FFFF0000', end_color='FFFF0000', fill_type='solid')
+    for row in ws_normalized.iter_rows():
+        for cell in row:
+            if cell.value is None or str(cell.value).strip() == '':
+                cell.fill = missing_fill
+    wb_normalized.save(output_path)
+
+
+def write_workbook(path, index, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Section", "Program", "Academic Year", "Male", "Female", "Total", "Median Salary", "Remarks"])
+    for i in range(rows):
+        r = i + 2
+        male = MARKERS[i % 5] if i % 11 == 0 else f" {(index + i) % 300} "
+        ws.append([f"Section {i // 40}  ", " UG [4 Years Program(s)]", YEARS[i % 6], male, i % 120,
+                   f"=D{r}+E{r}", (i % 40 + 3) * 50000 if i % 9 else None,
+                   MARKERS[i % 5] if i % 3 else f"note {i}"])
+    wb.save(path)
+
+
+def cell_values(path):
+    wb = load_workbook(path, read_only=True)
+    try:
+        rows = list(wb.active.iter_rows(values_only=True))
+    finally:
+        wb.close()
+    # NaN written by the old version reads back as a float NaN
+    return [tuple(None if isinstance(v, float) and math.isnan(v) else v for v in row) for row in rows]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    # errors='ignore' in the old version is deprecated in recent pandas
+    warnings.simplefilter("ignore", FutureWarning)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index in range(count):
+            path = os.path.join(tmp, f"{index + 1}-Institute.xlsx")
+            write_workbook(path, index, rows)
+            paths.append(path)
+
+        results = {}
+        for label, func in (("old", old_process_excel_file), ("new", process_excel_file)):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for path in paths:
+                    func(path, path.replace(".xlsx", f".{label}.xlsx"))
+            size = sum(os.path.getsize(path.replace(".xlsx", f".{label}.xlsx")) for path in paths)
+            results[label] = (time.perf_counter() - start, size)
+        for path in paths:
+            assert cell_values(path.replace(".xlsx", ".old.xlsx")) == cell_values(path.replace(".xlsx", ".new.xlsx"))
+
+    old_time, old_size = results["old"]
+    new_time, new_size = results["new"]
+    print(f"{count} files, {rows} rows each")
+    print(f"  old (two loads, per-cell fills)         {old_time:7.2f}s   {old_size / 1024:8.1f} KiB")
+    print(f"  new (one load, conditional formatting)  {new_time:7.2f}s   {new_size / 1024:8.1f} KiB"
+          f"   ({old_time / new_time:.2f}x faster)")
+    print("  cell values identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compare the memory used by list-of-dict records with nirf_records.SectionTable.
+
+Simulates accumulating the records of many PDFs: every institute contributes
+intake, placement and capital expenditure rows shaped like the parsers' output.
+Both representations hold the same values; tracemalloc reports what each costs.
+
+Usage: python benchmarks/bench_records_memory.py [num_pdfs]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from nirf_records import SectionTable
+
+YEARS = ["2022-23", "2021-22", "2020-21", "2019-20", "2018-19", "2017-18"]
+PROGRAMS = ["UG [4 Years Program(s)]", "UG [5 Years Program(s)]",
+            "PG [2 Year Program(s)]", "PG-Integrated [5 Years Program(s)]"]
+CATEGORIES = ["Library", "New Equipment and software for Laboratories",
+              "Engineering Workshops", "Other expenditure on creation of Capital Assets"]
+
+
+def institute_rows(index):
+    """Yield (section, values) pairs for one synthetic institute."""
+    # Build the name at runtime like the parser does, so it is a fresh string per PDF
+    inst_name = "Synthetic Institute of Technology " + str(index)
+    for program in PROGRAMS:
+        for year in YEARS:
+            yield "SanctionedIntake", inst_name, {"Program": program, "Year": year,
+                                                  "ApprovedIntake": 60 + index % 300}
+    for year in YEARS:
+        yield "PlacementData", inst_name, {"AcademicYear": year, "FirstYearIntake": 120,
+                                           "FirstYearAdmitted": 118, "GraduatingYear": year,
+                                           "GraduatingStudents": 110, "Placed": 90,
+                                           "MedianSalary": 650000 + index, "HigherStudies": None}
+    for category in CATEGORIES:
+        for year in YEARS[:3]:
+            yield "CapitalExpenditure", inst_name, {"Category": category, "Year": year,
+                                                    "Amount": 100000 * (index + 1)}
+
+
+def build_dicts(num_pdfs):
+    sections = {}
+    for index in range(num_pdfs):
+        for section, inst_name, values in institute_rows(index):
+            record = {"Institute": inst_name}
+            # The parsers produce fresh strings for every table cell
+            record.update({key: "".join(value) if isinstance(value, str) else value
+                           for key, value in values.items()})
+            sections.setdefault(section, []).append(record)
+    return sections
+
+
+def build_tables(num_pdfs):
+    sections = {}
+    for index in range(num_pdfs):
+        per_pdf = {}
+        for section, inst_name, values in institute_rows(index):
+            if section not in per_pdf:
+                per_pdf[section] = SectionTable(section, constants={"Institute": inst_name})
+            per_pdf[section].append(**{key: "".join(value) if isinstance(value, str) else value
+                                       for key, value in values.items()})
+        for section, table in per_pdf.items():
+            if section in sections:
+                sections[section].extend(table)
+            else:
+                sections[section] = table
+    return sections
+
+
+def measure(builder, num_pdfs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = builder(num_pdfs)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    num_pdfs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    dicts, dict_bytes, dict_time = measure(build_dicts, num_pdfs)
+    tables, table_bytes, table_time = measure(build_tables, num_pdfs)
+    rows = sum(len(records) for records in dicts.values())
+
+    # Both representations must hold exactly the same records
+    for section, records in dicts.items():
+        assert list(tables[section]) == [dict(dict.fromkeys(tables[section].fields), **r) for r in records]
+
+    print(f"{num_pdfs} PDFs, {rows} records")
+    print(f"  list of dicts   {dict_bytes / 1024 / 1024:8.2f} MiB   built in {dict_time:.2f}s")
+    print(f"  SectionTable    {table_bytes / 1024 / 1024:8.2f} MiB   built in {table_time:.2f}s")
+    print(f"  ratio           {dict_bytes / table_bytes:8.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Compare the old ElementTree parse_xml_to_dict with the iterparse version.
+
+Writes large synthetic NIRF XML files (many entries per section, the same
+cell values repeating like in real reports), parses each file both ways and
+reports wall time (best of several runs) and tracemalloc peak memory. Checks
+that both parsers return the same documents, key order included.
+
+Usage: python benchmarks/bench_xml_parse.py [entries_per_section] [files]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from xml_to_mongodb import FIELD_MAPPINGS, SECTIONS, build_institute_info, parse_xml_to_dict
+
+YEARS = ["2017-18", "2018-19", "2019-20", "2020-21", "2021-22", "2022-23"]
+FIELDS = ["Program", "Year", "ApprovedIntake", "Male", "Female", "Total", "MedianSalary", "Amount"]
+
+
+def old_standardize_field_name(tag):
+    field_name = tag.lower().strip()
+    return FIELD_MAPPINGS.get(field_name, field_name)
+
+
+def old_convert_text_value(text):
+    try:
+        if text:
+            stripped = text.strip()
+            cleaned_text = stripped.replace(',', '').replace('₹', '').replace('$', '').strip()
+            if cleaned_text and cleaned_text.replace('-', '').replace('.', '').isdigit():
+                if '.' in cleaned_text:
+                    return float(cleaned_text)
+                return int(cleaned_text)
+            return stripped
+        return None
+    except (ValueError, TypeError):
+        return text
+
+
+def old_parse_xml_to_dict(xml_file):
+    """parse_xml_to_dict before it used iterparse."""
+    tree = ET.parse(xml_file)
+    root = tree.getroot()
+    nirf_data = {}
+    institute_elem = root.find('Institute')
+    if institute_elem is not None:
+        nirf_data['institute'] = build_institute_info(institute_elem.findtext('Name'),
+                                                      institute_elem.findtext('SourceFile'), xml_file)
+    for section in SECTIONS:
+        section_elem = root.find(section)
+        if section_elem is not None:
+            entries = []
+            for entry in section_elem.findall('Entry'):
+                entry_data = {}
+                for child in entry:
+                    entry_data[old_standardize_field_name(child.tag)] = old_convert_text_value(child.text)
+                if entry_data:
+                    entries.append(entry_data)
+            nirf_data[section.lower()] = entries
+    return nirf_data
+
+
+def cell(i, field):
+    if field == "Program":
+        return "UG [4 Years Program(s)]"
+    if field == "Year":
+        return YEARS[i % 6]
+    if field == "MedianSalary":
+        return f"{(i % 40 + 3) * 50000}(Rupees {i % 40 + 3} Lakhs)"
+    if field == "Amount":
+        return f"{i % 90},{i % 100:02d},000"
+    return "-" if i % 7 == 0 else str(i % 250)
+
+
+def write_xml(path, index, entries):
+    """Write one synthetic report the way the XML agents lay it out."""
+    name = f"Synthetic Institute & College {index}"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" ?>\n<NIRF_Data>\n  <Institute>\n')
+        f.write(f"    <Name>{escape(name)}</Name>\n    <SourceFile>{index:03d}-report.pdf</SourceFile>\n  </Institute>\n")
+        for section in SECTIONS:
+            f.write(f"  <{section}>\n")
+            for i in range(entries):
+                f.write("    <Entry>\n")
+                f.write(f"      <Institute>{escape(name)}</Institute>\n")
+                for field in FIELDS:
+                    f.write(f"      <{field}>{escape(cell(i, field))}</{field}>\n")
+                f.write("    </Entry>\n")
+            f.write(f"  </{section}>\n")
+        f.write("</NIRF_Data>\n")
+
+
+def best_time(func, paths, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(path) for path in paths]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def peak_memory(func, paths):
+    tracemalloc.start()
+    for path in paths:
+        func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for index in range(count):
+            path = os.path.join(tmp, f"{index:03d}-report.xml")
+            write_xml(path, index, entries)
+            paths.append(path)
+        size = sum(os.path.getsize(path) for path in paths)
+
+        old_time, old_docs = best_time(old_parse_xml_to_dict, paths)
+        new_time, new_docs = best_time(parse_xml_to_dict, paths)
+        for old, new in zip(old_docs, new_docs):
+            assert old == new and list(old) == list(new)
+            for section in SECTIONS:
+                key = section.lower()
+                assert [list(entry) for entry in old[key]] == [list(entry) for entry in new[key]]
+        old_peak = peak_memory(old_parse_xml_to_dict, paths)
+        new_peak = peak_memory(parse_xml_to_dict, paths)
+
+    print(f"{count} files, {entries} entries per section, {size / 1024 / 1024:.1f} MiB of XML")
+    print(f"  ET.parse + find (old)   {old_time * 1000:8.1f} ms   peak {old_peak / 1024 / 1024:7.1f} MiB")
+    print(f"  iterparse               {new_time * 1000:8.1f} ms   peak {new_peak / 1024 / 1024:7.1f} MiB"
+          f"   ({old_time / new_time:.2f}x faster)")
+    print("  documents identical")
+
+
+if __name__ == "__main__":
+    main()
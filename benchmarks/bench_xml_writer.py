@@ -0,0 +1,115 @@
+"""
+Compare the old ElementTree + minidom prettify() path with StreamingXMLWriter.
+
+Builds a synthetic report with many entries per section, writes it both ways
+and reports wall time and tracemalloc peak memory. Also checks that compat
+mode is byte-identical to prettify().
+
+Usage: python benchmarks/bench_xml_writer.py [entries_per_section]
+"""
+import os
+import sys
+import time
+import tracemalloc
+import tempfile
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from xml_stream_writer import StreamingXMLWriter
+
+SECTIONS = ["SanctionedIntake", "StudentStrength", "PlacementData", "PhDData",
+            "CapitalExpenditure", "OperationalExpenditure", "SponsoredProjects",
+            "ConsultancyProjects", "Facilities", "FacultyCount"]
+
+
+def prettify(elem):
+    """Return a pretty-printed XML string for the Element."""
+    rough_string = ET.tostring(elem, 'utf-8')
+    reparsed = minidom.parseString(rough_string)
+    return reparsed.toprettyxml(indent="  ")
+
+
+def make_sections(entries):
+    inst_name = "Synthetic Institute of Technology & Science"
+    sections = []
+    for s_idx, section in enumerate(SECTIONS):
+        records = []
+        for i in range(entries):
+            records.append({
+                "Institute": inst_name,
+                "Program": f"UG [{s_idx} Years Program(s)]",
+                "Year": f"20{10 + i % 13}-{11 + i % 13}",
+                "Value": i * 7,
+                "Missing": None,
+            })
+        sections.append((section, records))
+    return inst_name, sections
+
+
+def write_prettify(path, inst_name, sections):
+    root = ET.Element("NIRF_Data")
+    institute = ET.SubElement(root, "Institute")
+    ET.SubElement(institute, "Name").text = inst_name
+    ET.SubElement(institute, "SourceFile").text = "synthetic.pdf"
+    for section, records in sections:
+        elem = ET.SubElement(root, section)
+        for record in records:
+            entry = ET.SubElement(elem, "Entry")
+            for key, value in record.items():
+                if value is not None:
+                    ET.SubElement(entry, key).text = str(value)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(prettify(root))
+
+
+def write_streaming(path, inst_name, sections, compat):
+    with open(path, "w", encoding="utf-8") as f:
+        writer = StreamingXMLWriter(f, compat=compat)
+        writer.start("NIRF_Data")
+        writer.start("Institute")
+        writer.element("Name", inst_name)
+        writer.element("SourceFile", "synthetic.pdf")
+        writer.end()
+        for section, records in sections:
+            writer.section(section, records)
+        writer.end()
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    inst_name, sections = make_sections(entries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, "prettify.xml")
+        compat_path = os.path.join(tmp, "stream_compat.xml")
+        fast_path = os.path.join(tmp, "stream.xml")
+
+        results = [
+            ("minidom prettify", measure(write_prettify, old_path, inst_name, sections)),
+            ("streaming (compat)", measure(write_streaming, compat_path, inst_name, sections, True)),
+            ("streaming", measure(write_streaming, fast_path, inst_name, sections, False)),
+        ]
+
+        with open(old_path, "rb") as a, open(compat_path, "rb") as b:
+            identical = a.read() == b.read()
+        size = os.path.getsize(old_path)
+
+    print(f"{entries} entries x {len(SECTIONS)} sections, {size / 1024:.0f} KiB of XML")
+    for label, (elapsed, peak) in results:
+        print(f"  {label:<20} {elapsed * 1000:8.1f} ms   peak {peak / 1024:10.0f} KiB")
+    print(f"  compat output byte-identical to prettify(): {identical}")
+
+
+if __name__ == "__main__":
+    main()
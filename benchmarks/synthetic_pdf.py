@@ -0,0 +1,293 @@
+"""
+Generate synthetic NIRF-shaped PDF reports for the extraction benchmarks.
+
+Real NIRF reports cannot be shared, so this writes PDFs with the same page
+structure from scratch: the institute name at the top of page 0, a heading
+per section and ruled tables whose header cells match what the parsers in
+nirf_extraction.py look for. Only the standard Helvetica font and plain
+line drawing are used, so no PDF library is needed to create them.
+
+Layouts:
+  nirf        the four report pages with a heading above every section
+  no-headings the same tables without section headings (whole-page fallback)
+  cluttered   nirf plus paragraphs of filler text and unrelated tables
+
+Usage: python benchmarks/synthetic_pdf.py OUT_DIR [--files N] [--pages N]
+       [--rows N] [--layout nirf|no-headings|cluttered]
+"""
+import argparse
+import os
+import random
+
+LAYOUTS = ["nirf", "no-headings", "cluttered"]
+
+FONT_SIZE = 6
+# Upper bound of the Helvetica glyph width at 1pt, used to size cells
+CHAR_WIDTH = 0.6
+ROW_HEIGHT = 12
+CELL_PADDING = 4
+MARGIN = 36
+GAP = 18
+
+YEARS = ["2022-23", "2021-22", "2020-21", "2019-20", "2018-19", "2017-18"]
+PROGRAMS = ["UG [4 Years Program(s)]", "UG [5 Years Program(s)]", "PG [2 Year Program(s)]",
+            "PG [3 Year Program(s)]", "PG-Integrated [5 Years Program(s)]"]
+EXPENDITURE_CATEGORIES = ["Library", "New Equipment and software for Laboratories",
+                          "Engineering Workshops", "Studios",
+                          "Other expenditure on creation of Capital Assets"]
+OPERATIONAL_CATEGORIES = ["Salaries (Teaching and Non Teaching staff)",
+                          "Maintenance of Academic Infrastructure or consumables",
+                          "Seminars/Conferences/Workshops"]
+FILLER = ("The information furnished here is based on the data submitted by the institution "
+          "for the purpose of ranking and has not been independently verified")
+
+
+def _number(rng, low, high):
+    return str(rng.randint(low, high))
+
+
+def _cycle(values, count):
+    """Return count labels taken from values, numbering repeats."""
+    labels = []
+    for i in range(count):
+        label = values[i % len(values)]
+        labels.append(label if i < len(values) else f"{label} {i // len(values) + 1}")
+    return labels
+
+
+def build_sections(rng, rows):
+    """Return the report pages as lists of (heading, table rows) blocks."""
+    years = YEARS[:3]
+    programs = _cycle(PROGRAMS, rows)
+
+    intake = [["Academic Year"] + YEARS]
+    intake += [[program] + [rng.choice(["-", _number(rng, 30, 240)]) for _ in YEARS] for program in programs]
+    strength = [["(All programs of all years)", "No. of Male Students", "No. of Female Students",
+                 "Total Students", "Within State", "Outside State", "Outside Country",
+                 "Economically Backward", "Socially Challenged", "Full fee from State",
+                 "Full fee from Institution", "Full fee from Private Bodies",
+                 "Not receiving full tuition fee reimbursement"]]
+    strength += [[program] + [_number(rng, 0, 900) for _ in range(12)] for program in programs]
+
+    def placement(program_rows):
+        data = [["Academic Year", "No. of first year students intake in the year",
+                 "No. of first year students admitted in the year", "Academic Year",
+                 "No. of students admitted through Lateral entry", "Academic Year",
+                 "No. of students graduating in minimum stipulated time", "No. of students placed",
+                 "Median salary of placed graduates(Amount in Rs.)",
+                 "No. of students selected for Higher Studies"]]
+        for i in range(program_rows):
+            first, grad = YEARS[(i + 3) % len(YEARS)], YEARS[i % len(YEARS)]
+            salary = _number(rng, 300000, 1800000)
+            data.append([first, _number(rng, 60, 240), _number(rng, 50, 240), first, "-", grad,
+                         _number(rng, 40, 230), _number(rng, 10, 200),
+                         f"{salary}({rng.choice(['Six Lakhs', 'Nine Lakhs Fifty Thousand'])})",
+                         _number(rng, 0, 30)])
+        return data
+
+    phd = [["Ph.D (Student pursuing doctoral program till 2022-23 Students admitted in the academic "
+            "year 2023-24 should not be entered here.)"],
+           ["", "", "Total Students"],
+           ["Full Time", "", _number(rng, 0, 400)],
+           ["Part Time", "", _number(rng, 0, 100)],
+           ["No. of Ph.D students graduated (including Integrated Ph.D)"],
+           ["", *years],
+           ["Full Time", *[_number(rng, 0, 60) for _ in years]],
+           ["Part Time", *[_number(rng, 0, 20) for _ in years]]]
+
+    def expenditure(kind, categories):
+        data = [["Financial Year", *years],
+                ["", *["Utilised Amount"] * len(years)],
+                [f"Annual {kind} Expenditure", *[""] * len(years)]]
+        data += [[category] + [rng.choice(["-", _number(rng, 10000, 90000000)]) for _ in years]
+                 for category in categories]
+        return data
+
+    def projects(kind):
+        return [["Financial Year", *years],
+                [f"Total no. of {kind} Projects", *[_number(rng, 0, 200) for _ in years]],
+                ["Total no. of Funding Agencies", *[_number(rng, 0, 60) for _ in years]],
+                ["Total Amount Received (Amount in Rupees)", *[_number(rng, 0, 90000000) for _ in years]],
+                ["Amount Received in Words", *["Rupees only"] * len(years)]]
+
+    facilities = [["1. Do your institution buildings have Lifts/Ramps?", "Yes, more than 80% of the buildings",
+                   "2. Do you offer any separate cell for PwD students?", "Yes"]]
+    faculty = [["Number of faculty members entered", _number(rng, 20, 900)]]
+
+    return [
+        [("Sanctioned (Approved) Intake", intake),
+         ("Total Actual Student Strength (Program(s) Offered by Your Institution)", strength),
+         ("UG [4 Years Program(s)]: Placement & higher studies for previous 3 years", placement(rows))],
+        [("PG [2 Years Program(s)]: Placement & higher studies for previous 3 years", placement(rows)),
+         ("Ph.D Student Details", phd)],
+        [("Financial Resources: Utilised Amount for the Capital expenditure for previous 3 years",
+          expenditure("Capital", _cycle(EXPENDITURE_CATEGORIES, rows))),
+         ("Financial Resources: Utilised Amount for the Operational expenditure for previous 3 years",
+          expenditure("Operational", _cycle(OPERATIONAL_CATEGORIES, rows))),
+         ("Sponsored Research Details", projects("Sponsored")),
+         ("Consultancy Project Details", projects("Consultancy"))],
+        [("PCS Facilities: Facilities of physically challenged students", facilities),
+         ("Faculty Details", faculty)],
+    ]
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+class _Canvas:
+    """Collect text and line drawing operations for one page, top-down."""
+
+    def __init__(self):
+        self.ops = []
+        self.y = MARGIN
+        self.width = 0
+
+    def text(self, x, top, text):
+        self.ops.append(("text", x, top, text))
+        self.width = max(self.width, x + len(text) * FONT_SIZE * CHAR_WIDTH)
+
+    def line(self, x0, top0, x1, top1):
+        self.ops.append(("line", x0, top0, x1, top1))
+        self.width = max(self.width, x0, x1)
+
+    def paragraph(self, text, lines):
+        for _ in range(lines):
+            self.text(MARGIN, self.y, text)
+            self.y += ROW_HEIGHT
+        self.y += GAP
+
+    def table(self, rows):
+        """Draw a ruled table. A row with fewer cells spans its last cell to the right edge."""
+        columns = max(len(row) for row in rows)
+        widths = [0] * columns
+        for row in rows:
+            for j, cell in enumerate(row):
+                if len(row) == columns or j < len(row) - 1:
+                    widths[j] = max(widths[j], len(cell) * FONT_SIZE * CHAR_WIDTH + 2 * CELL_PADDING)
+        edges = [MARGIN]
+        for width in widths:
+            edges.append(edges[-1] + max(width, 20))
+        for row in rows:
+            last = edges[len(row) - 1]
+            if len(row) < columns and last + len(row[-1]) * FONT_SIZE * CHAR_WIDTH + 2 * CELL_PADDING > edges[-1]:
+                # A spanning cell is wider than the columns it covers
+                edges[-1] = last + len(row[-1]) * FONT_SIZE * CHAR_WIDTH + 2 * CELL_PADDING
+
+        top = self.y
+        for row in rows:
+            bottom = top + ROW_HEIGHT
+            self.line(edges[0], top, edges[-1], top)
+            for j, cell in enumerate(row):
+                self.line(edges[j], top, edges[j], bottom)
+                if cell:
+                    self.text(edges[j] + CELL_PADDING, top + 3, cell)
+            self.line(edges[-1], top, edges[-1], bottom)
+            top = bottom
+        self.line(edges[0], top, edges[-1], top)
+        self.y = top + GAP
+
+    def content(self, height):
+        """Return the page content stream, converting tops to PDF coordinates."""
+        out = ["0.5 w"]
+        for op in self.ops:
+            if op[0] == "text":
+                _, x, top, text = op
+                out.append(f"BT /F1 {FONT_SIZE} Tf {x:.2f} {height - top - FONT_SIZE:.2f} Td "
+                           f"({_escape(text)}) Tj ET")
+            else:
+                _, x0, top0, x1, top1 = op
+                out.append(f"{x0:.2f} {height - top0:.2f} m {x1:.2f} {height - top1:.2f} l S")
+        return "\n".join(out).encode("latin-1")
+
+
+def build_pages(institute, layout="nirf", pages=4, rows=5, seed=0):
+    """Lay out a report and return one (width, height, content) tuple per page."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}, expected one of {LAYOUTS}")
+    rng = random.Random(seed)
+    report = build_sections(rng, rows)
+    # Extra pages repeat unrelated tables, like the annexures of a real report
+    for extra in range(max(pages, len(report)) - len(report)):
+        report.append([(f"Annexure {extra + 1}", [["Item", "Value"]] +
+                        [[f"Item {i}", _number(rng, 0, 999)] for i in range(rows * 4)])])
+
+    result = []
+    for page_index, blocks in enumerate(report[:max(pages, 1)]):
+        canvas = _Canvas()
+        if page_index == 0:
+            canvas.text(MARGIN, canvas.y, "All programs ranking - NIRF India Rankings 2024")
+            canvas.y += ROW_HEIGHT
+            canvas.text(MARGIN, canvas.y, f"Institute Name: {institute}")
+            canvas.y += ROW_HEIGHT + GAP
+        if layout == "cluttered":
+            canvas.paragraph(FILLER, 6)
+            canvas.table([["Remarks", "Code"]] + [[FILLER[:40], str(i)] for i in range(4)])
+        for heading, rows_data in blocks:
+            if layout != "no-headings":
+                canvas.text(MARGIN, canvas.y, heading)
+                canvas.y += ROW_HEIGHT
+            canvas.table(rows_data)
+            if layout == "cluttered":
+                canvas.paragraph(FILLER, 2)
+        width = max(612, canvas.width + MARGIN)
+        height = max(792, canvas.y + MARGIN)
+        result.append((width, height, canvas.content(height)))
+    return result
+
+
+def write_pdf(path, pages):
+    """Write (width, height, content) pages as a minimal PDF file."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for width, height, content in pages:
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        content_ref = len(objects)
+        objects.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width:.0f} {height:.0f}] "
+                        f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>").encode())
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+
+
+def generate(out_dir, files=10, pages=4, rows=5, layout="nirf", seed=0):
+    """Write files synthetic reports into out_dir and return their file names."""
+    os.makedirs(out_dir, exist_ok=True)
+    names = []
+    for index in range(files):
+        name = f"{index + 1:03d}-synthetic-{layout}.pdf"
+        institute = f"Synthetic Institute of Technology {index + 1}"
+        write_pdf(os.path.join(out_dir, name),
+                  build_pages(institute, layout, pages, rows, seed=seed + index))
+        names.append(name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic NIRF-shaped PDF reports")
+    parser.add_argument("out_dir", help="Directory to write the PDFs into")
+    parser.add_argument("--files", type=int, default=10, help="Number of PDFs (default: 10)")
+    parser.add_argument("--pages", type=int, default=4, help="Pages per PDF, at least the 4 report pages")
+    parser.add_argument("--rows", type=int, default=5, help="Data rows per variable-length table (default: 5)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="nirf", help="Page layout (default: nirf)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the cell values")
+    args = parser.parse_args()
+
+    names = generate(args.out_dir, args.files, args.pages, args.rows, args.layout, args.seed)
+    print(f"Wrote {len(names)} PDFs to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Table-level coercion of extracted cell text to integers.
+
+The section parsers used to check every numeric cell inline
+(strip, compare with '-', isdigit, int) and handled median salaries with a
+separate split("("). A CellCoercer converts all the numeric cells of a table
+into columns of ints in one call, with the same rules for every section:
+
+- None, blank cells and dashes ("-", en and em dash) are missing,
+- plain digits, Indian digit grouping ("12,34,567") and Western grouping
+  ("1,234,567") are parsed as integers,
+- a trailing parenthesised annotation ("650000(Six Lakh Fifty Thousand)")
+  is ignored,
+- anything else is a coercion failure.
+
+Missing and failed cells are None in the returned columns.
+
+Extracted tables repeat the same few strings over and over (dashes, years,
+small counts), across the tables of one report and across reports. The rules
+run once per distinct string; the result is kept in a cache shared by every
+coercer of the process, so most cells cost one dictionary lookup. The cache
+starts out with the dashes and the numbers below 1000 that most count cells
+hold, and is reset when it reaches CACHE_MAX_ENTRIES strings.
+
+Every coercer counts the cells it parsed, found missing and failed to parse.
+"""
+import re
+
+# Digits with optional Indian or Western grouping, then an optional annotation.
+# Applied to stripped text.
+_NUMBER = re.compile(r"(\d{1,3}(?:,\d{2})*,\d{3}|\d{1,3}(?:,\d{3})+|\d+)\s*(?:\(.*\))?", re.DOTALL)
+MISSING_TEXT = frozenset(["", "-", "\u2013", "\u2014"])
+INT64_MAX = 2 ** 63 - 1
+
+CACHE_MAX_ENTRIES = 100000
+
+# Cached result of a cell that is neither a number nor missing
+_FAILED = object()
+# cell -> int, None (missing) or _FAILED
+_known = {}
+
+
+def _reset_cache():
+    _known.clear()
+    _known[None] = None
+    _known.update(dict.fromkeys(MISSING_TEXT))
+    _known.update((str(number), number) for number in range(1000))
+
+
+_reset_cache()
+
+
+def _coerce_text(cell):
+    """Apply the rules to one cell string, see the module docstring."""
+    text = cell.strip()
+    # Up to 18 digits always fit in an int64
+    if len(text) <= 18 and text.isdecimal():
+        return int(text)
+    if text in MISSING_TEXT:
+        return None
+    match = _NUMBER.fullmatch(text)
+    value = int(match.group(1).replace(",", "")) if match else None
+    return value if value is not None and value <= INT64_MAX else _FAILED
+
+
+class CellCoercer:
+    """Coerce cell text to integers and count the outcome, see the module docstring."""
+
+    def __init__(self):
+        self.stats = {'parsed': 0, 'missing': 0, 'failed': 0}
+
+    def ints(self, cells):
+        """Return a list with an int, or None if there is no value, for every cell."""
+        return self.table([[cell] for cell in cells], [0])[0]
+
+    def table(self, rows, columns):
+        """
+        Coerce the given column indexes of all rows in one batch.
+
+        Returns one list of ints per requested index, with None where a row
+        has no value. Cells past the end of a short row are missing.
+        """
+        columns = list(columns)
+        if len(_known) >= CACHE_MAX_ENTRIES:
+            _reset_cache()
+        known = _known
+        # Skip the per-cell length check when every row has all the columns
+        full = not rows or min(map(len, rows)) > max(columns, default=-1)
+        result = []
+        cells = nones = failed = 0
+        for col in columns:
+            values = []
+            add = values.append
+            for row in rows:
+                cell = row[col] if full or col < len(row) else None
+                try:
+                    add(known[cell])
+                except KeyError:
+                    value = known[cell] = _coerce_text(cell)
+                    add(value)
+            count = values.count(_FAILED)
+            if count:
+                failed += count
+                values = [None if value is _FAILED else value for value in values]
+            cells += len(values)
+            nones += values.count(None)
+            result.append(values)
+        self.stats['parsed'] += cells - nones
+        self.stats['missing'] += nones - failed
+        self.stats['failed'] += failed
+        return result
+
+
+def format_coercion_stats(stats):
+    """Return a one-line summary of a coercer's counters."""
+    return (f"{stats.get('parsed', 0)} cells parsed, {stats.get('missing', 0)} missing, "
+            f"{stats.get('failed', 0)} failed")
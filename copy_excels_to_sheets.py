@@ -1,5 +1,10 @@
 import os
 import re
+import sys
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from openpyxl import Workbook, load_workbook
 
 # Directory containing the Excel files
@@ -20,9 +25,9 @@ def extract_sheet_name(filename):
         return match.group(1)
     return filename.replace('.xlsx', '')
 
-def copy_excel_sheets():
+def copy_excel_sheets(excel_dir=EXCEL_DIR, output_file=OUTPUT_FILE):
     print("Starting to process Excel files...")
-    files = get_sorted_excel_files(EXCEL_DIR)
+    files = get_sorted_excel_files(excel_dir)
     print(f"Found {len(files)} Excel files to process")
     
     wb_out = Workbook()
@@ -32,7 +37,7 @@ def copy_excel_sheets():
 
     for index, file in enumerate(files, 1):
         print(f"\nProcessing file {index}/{len(files)}: {file}")
-        file_path = os.path.join(EXCEL_DIR, file)
+        file_path = os.path.join(excel_dir, file)
         wb_in = load_workbook(file_path, data_only=False)  # Keep formulas as formulas
         sheet_in = wb_in.active  # Assume only one sheet per file
         sheet_name = extract_sheet_name(file)
@@ -47,9 +52,121 @@ def copy_excel_sheets():
         
         print(f"Completed processing {file}")
 
-    print(f"\nSaving combined Excel file as {OUTPUT_FILE}...")
-    wb_out.save(OUTPUT_FILE)
+    print(f"\nSaving combined Excel file as {output_file}...")
+    wb_out.save(output_file)
     print("Process completed successfully!")
 
+def read_sheet_rows(file_path):
+    """Yield the rows of the first sheet of a workbook as tuples of values, formulas kept as formulas"""
+    wb_in = load_workbook(file_path, read_only=True, data_only=False)
+    try:
+        sheet_in = wb_in.worksheets[0]
+        # Files not written by openpyxl can carry a wrong dimension; read to the last row instead
+        sheet_in.reset_dimensions()
+        for row in sheet_in.iter_rows(values_only=True):
+            yield row
+    finally:
+        wb_in.close()
+
+def copy_excel_sheets_streaming(excel_dir=EXCEL_DIR, output_file=OUTPUT_FILE):
+    """
+    Combine the Excel files with read-only input and write-only output workbooks
+
+    Rows are read one at a time and appended straight to the output sheet,
+    which openpyxl writes to a temporary file that is closed once the sheet
+    is done, so memory does not grow with the number of files. Cell values and formulas are copied like in
+    copy_excel_sheets; neither mode copies styles.
+    """
+    print("Starting to process Excel files (streaming)...")
+    files = get_sorted_excel_files(excel_dir)
+    print(f"Found {len(files)} Excel files to process")
+
+    wb_out = Workbook(write_only=True)
+    for index, file in enumerate(files, 1):
+        print(f"Processing file {index}/{len(files)}: {file}")
+        ws_out = wb_out.create_sheet(title=extract_sheet_name(file))
+        for row in read_sheet_rows(os.path.join(excel_dir, file)):
+            ws_out.append(row)
+        # Flush the finished sheet to its temporary file instead of keeping its writer open until save
+        ws_out.close()
+
+    print(f"\nSaving combined Excel file as {output_file}...")
+    wb_out.save(output_file)
+    print("Process completed successfully!")
+
+def read_workbook(file_path):
+    """Rows of the first sheet of a workbook as a list of value tuples; runs in the worker processes"""
+    return list(read_sheet_rows(file_path))
+
+def copy_excel_sheets_parallel(excel_dir=EXCEL_DIR, output_file=OUTPUT_FILE, workers=None):
+    """
+    Combine the Excel files, reading and parsing them in a process pool
+
+    Unzipping and parsing a workbook is CPU-bound, so workers processes each
+    read whole files and send back their rows as plain tuples. The main
+    process appends them to a write-only workbook in the order of
+    get_sorted_excel_files, so the output is the same as with
+    copy_excel_sheets_streaming. At most 2 * workers files are read ahead of
+    the writer, which bounds memory.
+    """
+    workers = workers or os.cpu_count() or 1
+    print(f"Starting to process Excel files ({workers} worker processes)...")
+    files = get_sorted_excel_files(excel_dir)
+    print(f"Found {len(files)} Excel files to process")
+
+    wb_out = Workbook(write_only=True)
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        copied = 0
+
+        def write_next():
+            nonlocal copied
+            file, future = pending.popleft()
+            ws_out = wb_out.create_sheet(title=extract_sheet_name(file))
+            for row in future.result():
+                ws_out.append(row)
+            ws_out.close()
+            copied += 1
+            print(f"Copied file {copied}/{len(files)}: {file}")
+
+        for file in files:
+            pending.append((file, executor.submit(read_workbook, os.path.join(excel_dir, file))))
+            if len(pending) >= 2 * workers:
+                write_next()
+        while pending:
+            write_next()
+    finally:
+        # A file that fails to read stops the combine without waiting for the files queued behind it
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    print(f"\nSaving combined Excel file as {output_file}...")
+    wb_out.save(output_file)
+    print("Process completed successfully!")
+
+def main():
+    parser = argparse.ArgumentParser(description="Combine the Excel files into one workbook, one sheet per file")
+    parser.add_argument('--excel-dir', default=EXCEL_DIR, help=f"Directory with the Excel files (default: {EXCEL_DIR})")
+    parser.add_argument('--output', default=OUTPUT_FILE, help=f"Combined workbook (default: {OUTPUT_FILE})")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Read and write row by row so memory stays flat however many files are combined")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes reading the Excel files while one writer builds the combined workbook "
+                             "(default: 1 = read in turn, 0 = one per CPU core); implies --streaming output")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.excel_dir):
+        print(f"Error: Directory '{args.excel_dir}' does not exist.")
+        sys.exit(1)
+    start = time.perf_counter()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    if workers > 1:
+        copy_excel_sheets_parallel(args.excel_dir, args.output, workers)
+    elif args.streaming:
+        copy_excel_sheets_streaming(args.excel_dir, args.output)
+    else:
+        copy_excel_sheets(args.excel_dir, args.output)
+    print(f"Combined in {time.perf_counter() - start:.2f}s")
+
 if __name__ == '__main__':
-    copy_excel_sheets() 
\ No newline at end of file
+    main()
@@ -1,17 +1,11 @@
 import os
 import pandas as pd
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+import argparse
+from xml_stream_writer import StreamingXMLWriter
 
 # Directory containing the Excel files
 EXCEL_DIR = 'All-Excels'
 
-def prettify(elem):
-    """Return a pretty-printed XML string for the Element."""
-    rough_string = ET.tostring(elem, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent="  ")
-
 def get_sorted_excel_files(directory):
     files = [f for f in os.listdir(directory) if f.endswith('.xlsx')]
     # Sort by the numeric prefix
@@ -25,64 +19,71 @@ def extract_sheet_name(filename):
         return match[1].replace('.xlsx', '')
     return filename.replace('.xlsx', '')
 
-def convert_excel_to_xml(excel_file):
+def convert_excel_to_xml(excel_file, compat=False):
     print(f"Processing Excel file: {excel_file}")
     file_path = os.path.join(EXCEL_DIR, excel_file)
     
     # Extract institute name from filename
     institute_name = extract_sheet_name(excel_file)
     
-    # Create root XML element
-    root = ET.Element("NIRF_Data")
-    
-    # Add institute information
-    institute = ET.SubElement(root, "Institute")
-    ET.SubElement(institute, "Name").text = institute_name
-    ET.SubElement(institute, "SourceFile").text = excel_file
+    # Create XML filename
+    xml_filename = f"NIRF_Data_{excel_file.replace('.xlsx', '')}.xml"
     
     # Read Excel file with all sheets
     excel = pd.ExcelFile(file_path)
     
-    # Process each sheet in the Excel file
-    for sheet_name in excel.sheet_names:
-        # Read the sheet into a DataFrame
-        df = pd.read_excel(excel, sheet_name=sheet_name)
-        
-        # Skip empty sheets
-        if df.empty:
-            continue
+    # Stream the XML to disk one sheet at a time with pretty formatting
+    with open(xml_filename, "w", encoding="utf-8") as f:
+        writer = StreamingXMLWriter(f, compat=compat)
+        writer.start("NIRF_Data")
         
-        # Create a section in XML for this sheet
-        section = ET.SubElement(root, sheet_name)
+        # Add institute information
+        writer.start("Institute")
+        writer.element("Name", institute_name)
+        writer.element("SourceFile", excel_file)
+        writer.end()
         
-        # Convert each row to an XML entry
-        for _, row in df.iterrows():
-            entry = ET.SubElement(section, "Entry")
+        # Process each sheet in the Excel file
+        for sheet_name in excel.sheet_names:
+            # Read the sheet into a DataFrame
+            df = pd.read_excel(excel, sheet_name=sheet_name)
             
-            # Add each column as an element
-            for column, value in row.items():
-                # Skip NaN values
-                if pd.notna(value):
-                    # Convert to appropriate string representation
-                    if isinstance(value, (int, float)):
-                        value_str = str(int(value) if value.is_integer() else value)
-                    else:
-                        value_str = str(value)
-                    
-                    # Create element with column name and value
-                    ET.SubElement(entry, str(column)).text = value_str
-    
-    # Create XML filename
-    xml_filename = f"NIRF_Data_{excel_file.replace('.xlsx', '')}.xml"
-    
-    # Write to XML file with pretty formatting
-    with open(xml_filename, "w", encoding="utf-8") as f:
-        f.write(prettify(root))
+            # Skip empty sheets
+            if df.empty:
+                continue
+            
+            # Create a section in XML for this sheet
+            writer.start(sheet_name)
+            
+            # Convert each row to an XML entry
+            for _, row in df.iterrows():
+                writer.start("Entry")
+                
+                # Add each column as an element
+                for column, value in row.items():
+                    # Skip NaN values
+                    if pd.notna(value):
+                        # Convert to appropriate string representation
+                        if isinstance(value, (int, float)):
+                            value_str = str(int(value) if value.is_integer() else value)
+                        else:
+                            value_str = str(value)
+                        
+                        # Create element with column name and value
+                        writer.element(str(column), value_str)
+                writer.end()
+            writer.end()
+        writer.end()
     
     print(f"XML file created: {xml_filename}")
     return xml_filename
 
 def main():
+    parser = argparse.ArgumentParser(description="Convert NIRF Excel files to XML")
+    parser.add_argument("--minidom-compatible", action="store_true",
+                        help="Write XML byte-identical to the old minidom pretty-printer")
+    args = parser.parse_args()
+
     print("Starting Excel to XML conversion...")
     
     # Get list of Excel files
@@ -96,7 +97,7 @@ def main():
     
     # Process the first Excel file
     first_file = excel_files[0]
-    xml_file = convert_excel_to_xml(first_file)
+    xml_file = convert_excel_to_xml(first_file, compat=args.minidom_compatible)
     
     print("\nComparison of PDF-to-XML vs Excel-to-XML conversion approaches:")
     print("\nPDF-to-XML Benefits:")
@@ -0,0 +1,128 @@
+import os
+import json
+import hashlib
+
+# Bump when the manifest layout itself changes
+MANIFEST_VERSION = 1
+# Default manifest file name, stored next to the generated output
+MANIFEST_NAME = ".extraction_manifest.json"
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionManifest:
+    """
+    Persistent record of which source files have already been extracted.
+
+    Each entry stores the content hash, size and modification time of a source
+    file, the parser version that produced its output and the output of every
+    sink it was written to (XML file, Excel workbook, MongoDB collection). A
+    file is current when its content and the parser version are unchanged and
+    every sink the run asks for holds its output, so re-runs only extract new
+    or modified files and files a newly enabled sink has not seen yet.
+    Unchanged size and mtime are trusted without re-hashing the file.
+    """
+
+    def __init__(self, path, parser_version):
+        self.path = path
+        self.parser_version = str(parser_version)
+        self.entries = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring unreadable manifest {self.path}: {e}")
+            return
+        if data.get("manifest_version") == MANIFEST_VERSION:
+            self.entries = data.get("files", {})
+
+    def fingerprint(self, source_path, previous=None):
+        """Return the size/mtime/hash fingerprint of a source file."""
+        stat = os.stat(source_path)
+        if (previous and previous.get("size") == stat.st_size
+                and previous.get("mtime_ns") == stat.st_mtime_ns):
+            sha256 = previous["sha256"]
+        else:
+            sha256 = file_sha256(source_path)
+        return {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @staticmethod
+    def recorded_outputs(entry):
+        """The sink -> output mapping of a manifest entry."""
+        outputs = entry.get("outputs")
+        if outputs is None:
+            # Entries written before outputs were tracked per sink held the XML path only
+            outputs = {"xml": entry["output"]} if entry.get("output") else {}
+        return outputs
+
+    def check(self, name, source_path, outputs):
+        """
+        Return (is_current, fingerprint) for a source file.
+
+        outputs maps every sink the run writes to its output: a file path,
+        which must still exist, or for sinks that do not write files a target
+        URI such as "mongodb://host:port/db/collection". Each must match the
+        output recorded for that sink.
+
+        The fingerprint should be passed back to record() once the file has
+        been extracted successfully.
+        """
+        previous = self.entries.get(name)
+        fingerprint = self.fingerprint(source_path, previous)
+        is_current = (previous is not None
+                      and previous.get("parser_version") == self.parser_version
+                      and previous.get("sha256") == fingerprint["sha256"]
+                      and previous.get("size") == fingerprint["size"])
+        if is_current:
+            recorded = self.recorded_outputs(previous)
+            is_current = all(recorded.get(sink) == output and ("://" in output or os.path.exists(output))
+                             for sink, output in outputs.items())
+        if is_current:
+            # Remember a touched-but-unchanged file so it is not re-hashed next run
+            previous["mtime_ns"] = fingerprint["mtime_ns"]
+        return is_current, fingerprint
+
+    def record(self, name, fingerprint, outputs):
+        """
+        Mark a source file as extracted with the current parser version.
+
+        outputs maps each sink the file was written to to its output, as in
+        check(). Outputs recorded for other sinks are kept while the content
+        and parser version are unchanged.
+        """
+        previous = self.entries.get(name)
+        entry = dict(fingerprint)
+        entry["parser_version"] = self.parser_version
+        entry["outputs"] = {}
+        if (previous is not None and previous.get("parser_version") == self.parser_version
+                and previous.get("sha256") == fingerprint["sha256"]):
+            entry["outputs"].update(self.recorded_outputs(previous))
+        entry["outputs"].update(outputs)
+        self.entries[name] = entry
+
+    def forget(self, name):
+        """Drop a source file so that it is extracted again on the next run."""
+        self.entries.pop(name, None)
+
+    def save(self):
+        """Write the manifest atomically so an interrupted run cannot corrupt it."""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"manifest_version": MANIFEST_VERSION, "files": self.entries},
+                      f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
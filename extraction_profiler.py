@@ -0,0 +1,175 @@
+"""
+Opt-in per-stage profiling of the PDF extraction path.
+
+A StageTimer is handed to PageCache and extract_report; the pdfplumber calls
+and the section parsers run inside named stages:
+
+  open           pdfplumber.open
+  find_tables    table detection (whole page or cropped region)
+  extract        turning detected tables into rows
+  extract_words  reading the word lines used to locate sections
+  extract_text   whole-page text extraction
+  coerce         section parser time outside the calls above: cell checks,
+                 numeric conversion and record building
+  xml_write      writing the XML file (excel_write for the Excel sink)
+  document       building the MongoDB document (--mongo)
+  close          closing the PDF
+
+Stages may nest; each stage only counts the time not spent in an inner
+stage, so the totals add up to the profiled wall time. pdfplumber parses a
+page lazily, so that cost lands in whichever stage touches the page first.
+
+When profiling is off the extraction code uses NULL_TIMER, whose stages do
+nothing.
+
+build_profile_report() turns the per-file results into a JSON-serializable
+report naming the files, sections and stages that dominate wall time.
+capture_profile() re-runs a function under cProfile and/or tracemalloc for
+the slowest files.
+"""
+import time
+
+# Functions listed per cProfile capture
+PROFILE_FUNCTIONS = 25
+# Allocation sites listed per tracemalloc capture
+TRACEMALLOC_SITES = 15
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "start", "inner")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.inner = 0.0
+        self.timer._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = self.timer._stack
+        stack.pop()
+        totals = self.timer.totals
+        totals[self.name] = totals.get(self.name, 0.0) + elapsed - self.inner
+        if stack:
+            stack[-1].inner += elapsed
+        return False
+
+
+class StageTimer:
+    """Accumulate exclusive wall time per named stage, see the module docstring."""
+
+    def __init__(self):
+        self.totals = {}
+        self._stack = []
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _NullTimer:
+    """Timer used when profiling is off; its stages do nothing."""
+
+    totals = {}
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+
+NULL_TIMER = _NullTimer()
+
+
+def _ranked(totals, wall):
+    """Return [{name, seconds, share}] sorted by seconds, largest first."""
+    return [{"name": name, "seconds": seconds, "share": seconds / wall if wall > 0 else 0.0}
+            for name, seconds in sorted(totals.items(), key=lambda item: item[1], reverse=True)]
+
+
+def build_profile_report(files, top_n=5, captures=None):
+    """
+    Build the JSON profile report.
+
+    files is a list of dicts with "file", "seconds", "stages" and "sections"
+    (section name -> seconds); captures maps a file name to the result of
+    capture_profile for that file.
+    """
+    wall = sum(f["seconds"] for f in files)
+    stage_totals = {}
+    section_totals = {}
+    for f in files:
+        for name, seconds in f["stages"].items():
+            stage_totals[name] = stage_totals.get(name, 0.0) + seconds
+        for name, seconds in f["sections"].items():
+            section_totals[name] = section_totals.get(name, 0.0) + seconds
+
+    slowest = sorted(files, key=lambda f: f["seconds"], reverse=True)
+    return {
+        "files_profiled": len(files),
+        "wall_seconds": wall,
+        "dominant": {
+            "files": [{"file": f["file"], "seconds": f["seconds"],
+                       "share": f["seconds"] / wall if wall > 0 else 0.0}
+                      for f in slowest[:top_n]],
+            "sections": _ranked(section_totals, wall)[:top_n],
+            "stages": _ranked(stage_totals, wall),
+        },
+        "stage_totals": stage_totals,
+        "section_totals": section_totals,
+        "files": slowest,
+        "captures": captures or {},
+    }
+
+
+def capture_profile(func, use_cprofile=True, use_tracemalloc=True):
+    """Run func() under cProfile and/or tracemalloc and return what they recorded."""
+    capture = {}
+    profiler = None
+    if use_tracemalloc:
+        import tracemalloc
+        tracemalloc.start(5)
+    if use_cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        func()
+    finally:
+        capture["seconds"] = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+        if use_tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    if profiler is not None:
+        import pstats
+        stats = pstats.Stats(profiler)
+        rows = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({"function": f"{filename}:{line}({function})", "calls": calls,
+                         "tottime": tottime, "cumtime": cumtime})
+        rows.sort(key=lambda row: row["cumtime"], reverse=True)
+        capture["cprofile"] = rows[:PROFILE_FUNCTIONS]
+    if use_tracemalloc:
+        capture["tracemalloc"] = {
+            "peak_bytes": peak,
+            "top": [{"location": str(stat.traceback[0]), "size_bytes": stat.size, "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:TRACEMALLOC_SITES]],
+        }
+    return capture
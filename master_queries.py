@@ -0,0 +1,139 @@
+"""
+Indexes and query helpers for the master_database collection.
+
+The dashboards look colleges up by fields inside the embedded section arrays
+(placement year, program name, expenditure year, ...). Without indexes each
+of those lookups scans the whole collection. MASTER_INDEXES is the managed
+index set: compound multikey indexes on the array fields the helpers below
+query, plus the unique college_id index the master build relies on.
+ensure_master_indexes() creates whatever is missing and is safe to call on
+every import.
+
+The helpers return cursors, so callers can iterate them, add sort/limit or
+call explain(). Conditions on the fields of one array entry use $elemMatch
+so they must hold for the same entry, which is also what lets MongoDB use
+the compound indexes; the matched entry is returned with a positional
+projection.
+"""
+import re
+import pymongo
+
+# (index name, keys, options); compound indexes only combine fields of the
+# same array, which MongoDB requires for multikey indexes
+MASTER_INDEXES = [
+    ("college_id_1", [("college_id", pymongo.ASCENDING)], {"unique": True}),
+    ("college_name_1", [("college_name", pymongo.ASCENDING)], {}),
+    ("placement_year_salary", [("placementdata.academic_year", pymongo.ASCENDING),
+                               ("placementdata.median_salary", pymongo.DESCENDING)], {}),
+    ("intake_program_year", [("sanctionedintake.program_name", pymongo.ASCENDING),
+                             ("sanctionedintake.academic_year", pymongo.ASCENDING)], {}),
+    ("capex_year_category", [("capitalexpenditure.academic_year", pymongo.ASCENDING),
+                             ("capitalexpenditure.category", pymongo.ASCENDING)], {}),
+    ("opex_year_category", [("operationalexpenditure.academic_year", pymongo.ASCENDING),
+                            ("operationalexpenditure.category", pymongo.ASCENDING)], {}),
+    ("phd_type", [("phddata.type", pymongo.ASCENDING)], {}),
+    ("sponsored_year_type", [("sponsoredprojects.academic_year", pymongo.ASCENDING),
+                             ("sponsoredprojects.type", pymongo.ASCENDING)], {}),
+    ("consultancy_year_type", [("consultancyprojects.academic_year", pymongo.ASCENDING),
+                               ("consultancyprojects.type", pymongo.ASCENDING)], {}),
+]
+
+# Fields returned with every college by the helpers
+COLLEGE_FIELDS = {"_id": 0, "college_id": 1, "college_name": 1}
+
+
+def ensure_master_indexes(collection):
+    """
+    Create the MASTER_INDEXES that are missing on collection.
+
+    An index whose name is taken by a different key pattern or options is
+    dropped and recreated. Returns the names of the indexes created.
+    """
+    existing = collection.index_information()
+    models = []
+    for name, keys, options in MASTER_INDEXES:
+        info = existing.get(name)
+        if info is not None:
+            if ([tuple(key) for key in info["key"]] == keys
+                    and all(info.get(option) == value for option, value in options.items())):
+                continue
+            collection.drop_index(name)
+        models.append(pymongo.IndexModel(keys, name=name, **options))
+    if models:
+        collection.create_indexes(models)
+    return [model.document["name"] for model in models]
+
+
+def _elem_match(collection, section, conditions):
+    """Colleges with an entry of section matching every condition, with that entry."""
+    conditions = {field: value for field, value in conditions.items() if value is not None}
+    projection = dict(COLLEGE_FIELDS)
+    projection[f"{section}.$"] = 1
+    return collection.find({section: {"$elemMatch": conditions}}, projection)
+
+
+def find_college(collection, college_id, sections=None):
+    """Return one college, with only the given sections if sections is set."""
+    projection = None
+    if sections is not None:
+        projection = dict(COLLEGE_FIELDS)
+        projection.update({section: 1 for section in sections})
+    return collection.find_one({"college_id": college_id}, projection)
+
+
+def find_colleges_by_name(collection, name_prefix):
+    """Colleges whose name starts with name_prefix (case-sensitive, uses the name index)."""
+    return collection.find({"college_name": {"$regex": "^" + re.escape(name_prefix)}}, COLLEGE_FIELDS)
+
+
+def placements_by_year(collection, academic_year, min_median_salary=None):
+    """Colleges with placement data for academic_year, optionally with a minimum median salary."""
+    salary = {"$gte": min_median_salary} if min_median_salary is not None else None
+    return _elem_match(collection, "placementdata", {"academic_year": academic_year, "median_salary": salary})
+
+
+def colleges_with_program(collection, program_name, academic_year=None):
+    """Colleges with a sanctioned intake for program_name, optionally in academic_year."""
+    return _elem_match(collection, "sanctionedintake",
+                       {"program_name": program_name, "academic_year": academic_year})
+
+
+def capital_expenditure_by_year(collection, academic_year, category=None):
+    """Colleges with capital expenditure in academic_year, optionally of one category."""
+    return _elem_match(collection, "capitalexpenditure", {"academic_year": academic_year, "category": category})
+
+
+def operational_expenditure_by_year(collection, academic_year, category=None):
+    """Colleges with operational expenditure in academic_year, optionally of one category."""
+    return _elem_match(collection, "operationalexpenditure",
+                       {"academic_year": academic_year, "category": category})
+
+
+def sponsored_projects_by_year(collection, academic_year, project_type=None):
+    """Colleges with sponsored research figures for academic_year."""
+    return _elem_match(collection, "sponsoredprojects", {"academic_year": academic_year, "type": project_type})
+
+
+def consultancy_projects_by_year(collection, academic_year, project_type=None):
+    """Colleges with consultancy project figures for academic_year."""
+    return _elem_match(collection, "consultancyprojects", {"academic_year": academic_year, "type": project_type})
+
+
+def phd_by_type(collection, phd_type):
+    """Colleges with a Ph.D. row of the given type, e.g. "FullTime_Total"."""
+    return _elem_match(collection, "phddata", {"type": phd_type})
+
+
+def plan_stages(explain):
+    """Return the stage names of the winning plan in an explain() result, outermost first."""
+    planner = explain.get("queryPlanner", {})
+    plan = planner.get("winningPlan", {})
+    # Slot-based execution nests the classic plan one level down
+    plan = plan.get("queryPlan", plan)
+    stages = []
+    while plan:
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        children = plan.get("inputStages") or ([plan["inputStage"]] if "inputStage" in plan else [])
+        plan = children[0] if children else None
+    return stages
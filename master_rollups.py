@@ -0,0 +1,173 @@
+"""
+Materialized per-year rollups of the master_database collection.
+
+Cross-institute questions (median placement salary by year, total capital
+expenditure by year, Ph.D. graduates by year, ...) would otherwise scan the
+embedded arrays of every college and aggregate them on each request. Two
+collections hold the answers ahead of time:
+
+- rollup_college_facts: one document per college, metric and year with the
+  college's value, e.g. its total capital expenditure in 2022-23.
+- rollup_metrics: one document per metric and year, with _id
+  "<metric>|<year>", holding the number of colleges and the total, mean,
+  median, minimum and maximum of their values.
+
+refresh_rollups() recomputes the facts of the given colleges only and then
+the metric/year documents those facts touch, so a refresh after an import
+costs as much as the import changed. A full refresh builds both collections
+under staging names and renames them over the live ones, so readers never
+see them empty or half built. Medians are computed in Python from
+the facts of one metric and year, which the (metric, year) index makes a
+point lookup. get_rollup() and rollup_series() read the results.
+"""
+import statistics
+from datetime import datetime
+
+import pymongo
+
+FACTS_COLLECTION = 'rollup_college_facts'
+METRICS_COLLECTION = 'rollup_metrics'
+# Suffix of the collections a full refresh builds before renaming them
+STAGING_SUFFIX = '_staging'
+
+# metric -> (section, year field, value field, type prefix or None, how a
+# college's rows of one year are combined: 'sum' or 'median')
+ROLLUP_METRICS = {
+    'approved_intake': ('sanctionedintake', 'academic_year', 'approved_intake', None, 'sum'),
+    # Placement rows are per program; the year is the graduating year
+    'median_salary': ('placementdata', 'graduatingyear', 'median_salary', None, 'median'),
+    'students_placed': ('placementdata', 'graduatingyear', 'placed', None, 'sum'),
+    'graduating_students': ('placementdata', 'graduatingyear', 'graduatingstudents', None, 'sum'),
+    'higher_studies': ('placementdata', 'graduatingyear', 'higherstudies', None, 'sum'),
+    'phd_graduates': ('phddata', 'academic_year', 'graduated', None, 'sum'),
+    'capital_expenditure': ('capitalexpenditure', 'academic_year', 'amount', None, 'sum'),
+    'operational_expenditure': ('operationalexpenditure', 'academic_year', 'amount', None, 'sum'),
+    'sponsored_projects': ('sponsoredprojects', 'academic_year', 'value', 'Total no. of Sponsored Projects', 'sum'),
+    'sponsored_amount': ('sponsoredprojects', 'academic_year', 'value', 'Total Amount Received', 'sum'),
+    'consultancy_projects': ('consultancyprojects', 'academic_year', 'value',
+                             'Total no. of Consultancy Projects', 'sum'),
+    'consultancy_amount': ('consultancyprojects', 'academic_year', 'value', 'Total Amount Received', 'sum'),
+}
+
+
+def college_facts(college):
+    """Return the fact documents of one master_database document."""
+    college_id = college['college_id']
+    facts = []
+    for metric, (section, year_field, value_field, type_prefix, combine) in ROLLUP_METRICS.items():
+        by_year = {}
+        for entry in college.get(section) or []:
+            year = entry.get(year_field)
+            value = entry.get(value_field)
+            if not year or isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if type_prefix is not None and not str(entry.get('type', '')).startswith(type_prefix):
+                continue
+            by_year.setdefault(year, []).append(value)
+        for year, values in by_year.items():
+            value = sum(values) if combine == 'sum' else statistics.median(values)
+            facts.append({'_id': f"{college_id}|{metric}|{year}", 'college_id': college_id,
+                          'metric': metric, 'year': year, 'value': value})
+    return facts
+
+
+def _metric_document(metric, year, values, now):
+    return {
+        'metric': metric,
+        'year': year,
+        'colleges': len(values),
+        'total': sum(values),
+        'mean': statistics.fmean(values),
+        'median': statistics.median(values),
+        'min': min(values),
+        'max': max(values),
+        'updated_at': now,
+    }
+
+
+def _create_indexes(facts, metrics):
+    facts.create_index([('metric', pymongo.ASCENDING), ('year', pymongo.ASCENDING)], name='metric_year')
+    facts.create_index('college_id', name='college_id_1')
+    metrics.create_index([('metric', pymongo.ASCENDING), ('year', pymongo.ASCENDING)], name='metric_year')
+
+
+def ensure_rollup_indexes(db):
+    """Create the fact indexes used by the refresh; safe to call repeatedly."""
+    _create_indexes(db[FACTS_COLLECTION], db[METRICS_COLLECTION])
+
+
+def refresh_rollups(db, master_collection='master_database', college_ids=None, chunk_size=500):
+    """
+    Recompute the rollups for the given colleges (all if college_ids is None)
+
+    The facts of those colleges are replaced from their current master
+    documents, then every metric/year the old or new facts belong to is
+    recomputed from the facts. A full refresh fills staging collections and
+    renames them over the live ones when they are complete. Returns the
+    number of metric/year documents refreshed.
+    """
+    projection = {'_id': 0, 'college_id': 1}
+    for section, *_ in ROLLUP_METRICS.values():
+        projection[section] = 1
+
+    if college_ids is None:
+        facts = db[FACTS_COLLECTION + STAGING_SUFFIX]
+        metrics = db[METRICS_COLLECTION + STAGING_SUFFIX]
+        # Start empty, also after an interrupted full refresh
+        facts.drop()
+        metrics.drop()
+        _create_indexes(facts, metrics)
+        affected = set()
+        colleges = db[master_collection].find({}, projection, batch_size=chunk_size)
+    else:
+        facts = db[FACTS_COLLECTION]
+        metrics = db[METRICS_COLLECTION]
+        ensure_rollup_indexes(db)
+        college_ids = list(college_ids)
+        if not college_ids:
+            return 0
+        # The metric/years of the old facts change too, even if a college no longer reports them
+        affected = {(fact['metric'], fact['year']) for fact in facts.find(
+            {'college_id': {'$in': college_ids}}, {'_id': 0, 'metric': 1, 'year': 1})}
+        facts.delete_many({'college_id': {'$in': college_ids}})
+        colleges = db[master_collection].find({'college_id': {'$in': college_ids}}, projection,
+                                              batch_size=chunk_size)
+
+    batch = []
+    for college in colleges:
+        for fact in college_facts(college):
+            affected.add((fact['metric'], fact['year']))
+            batch.append(fact)
+        if len(batch) >= chunk_size:
+            facts.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        facts.insert_many(batch, ordered=False)
+
+    now = datetime.now()
+    writes = []
+    for metric, year in sorted(affected):
+        values = [fact['value'] for fact in facts.find({'metric': metric, 'year': year}, {'_id': 0, 'value': 1})]
+        key = f"{metric}|{year}"
+        if values:
+            writes.append(pymongo.ReplaceOne({'_id': key}, _metric_document(metric, year, values, now),
+                                             upsert=True))
+        else:
+            writes.append(pymongo.DeleteOne({'_id': key}))
+    if writes:
+        metrics.bulk_write(writes, ordered=False)
+    if college_ids is None:
+        # Each rename replaces a live collection in one step
+        facts.rename(FACTS_COLLECTION, dropTarget=True)
+        metrics.rename(METRICS_COLLECTION, dropTarget=True)
+    return len(writes)
+
+
+def get_rollup(db, metric, year):
+    """Return the rollup of one metric and year, or None."""
+    return db[METRICS_COLLECTION].find_one({'_id': f"{metric}|{year}"})
+
+
+def rollup_series(db, metric):
+    """Return the rollups of one metric for every year, oldest first."""
+    return list(db[METRICS_COLLECTION].find({'metric': metric}).sort('year', pymongo.ASCENDING))
@@ -0,0 +1,338 @@
+"""
+Shared extraction core for NIRF PDF reports.
+
+A PDF is opened and table-detected once and parsed into an ExtractedReport.
+Output formats (XML, Excel, MongoDB) are produced from that in-memory model
+by the sinks in nirf_sinks.py, so producing several formats no longer means
+running pdfplumber once per format.
+
+Each section parser asks a SectionLocator for the tables of its own region
+of a page instead of detecting tables on the whole page, and converts the
+numeric cells of a table in one batch with a CellCoercer.
+"""
+import os
+import time
+import pdfplumber
+from pdf_page_cache import PageCache
+from extraction_profiler import NULL_TIMER
+from nirf_records import SectionTable, STUDENT_STRENGTH_COLUMNS
+from section_locator import SectionLocator
+from cell_coercion import CellCoercer
+
+# Bump whenever a change to the section parsers alters the extracted records,
+# so the extraction manifest re-extracts files produced by the older parser
+PARSER_VERSION = "4"
+
+# Section names in output order. These are also the XML element names.
+SECTION_NAMES = ["SanctionedIntake", "StudentStrength", "PlacementData", "PhDData",
+                 "CapitalExpenditure", "OperationalExpenditure", "SponsoredProjects",
+                 "ConsultancyProjects", "Facilities", "FacultyCount"]
+
+
+class ExtractedReport:
+    """In-memory record model of one parsed NIRF PDF."""
+
+    def __init__(self, source_file, institute):
+        self.source_file = source_file
+        self.institute = institute
+        # Section name -> SectionTable, in SECTION_NAMES order
+        self.sections = {name: new_section(name, institute) for name in SECTION_NAMES}
+        self.cache_stats = {}
+        # Parser name -> seconds spent in it
+        self.section_seconds = {}
+        # Cells parsed, missing and failed, and failures per section
+        self.coercion_stats = {}
+        self.coercion_failures = {}
+
+    def items(self):
+        """Yield (section name, records) pairs in output order."""
+        for name in SECTION_NAMES:
+            yield name, self.sections[name]
+
+
+def new_section(name, inst_name):
+    """Return an empty SectionTable that stores the institute name once."""
+    return SectionTable(name, constants={"Institute": inst_name})
+
+
+def _find_institute_name(text_lines):
+    """Return the institute name from the first matching line, or None."""
+    for line in text_lines[:15]:  # Check first 15 lines
+        if "Institute Name:" in line:
+            return line.split("Institute Name:")[1].strip()
+        # Alternative patterns that might appear in the PDF
+        elif "Name of Institution:" in line:
+            return line.split("Name of Institution:")[1].strip()
+        elif "Institution:" in line:
+            return line.split("Institution:")[1].strip()
+    return None
+
+
+def extract_institute_name(locator):
+    """
+    Find the institute name near the top of page 0.
+
+    Only the lines in the top band of the page are read; the whole page text
+    is extracted only if the name is not found there.
+    """
+    inst_name = None
+    if locator.use_regions:
+        inst_name = _find_institute_name(locator.top_band_lines(0))
+    if inst_name is None:
+        inst_name = _find_institute_name(locator.cache.text(0).splitlines())
+    return inst_name if inst_name is not None else "Unknown Institute"
+
+
+def parse_sanctioned_intake(locator, inst_name, coercer):
+    intake_records = new_section("SanctionedIntake", inst_name)
+    tables, _ = locator.tables(0, "SanctionedIntake")
+    if tables and len(tables) > 0:
+        # The first table of the region (or of page0) is the intake table
+        intake_table = tables[0]
+        years = intake_table[0][1:]  # e.g. ['2022-23','2021-22',...]
+        rows = intake_table[1:]
+        intakes = coercer.table(rows, range(1, len(years) + 1))
+        for r, row in enumerate(rows):
+            program = row[0]
+            for i, year in enumerate(years):
+                # Skip if data is missing or '-'
+                if intakes[i][r] is not None:
+                    intake_records.append(Program=program, Year=year, ApprovedIntake=intakes[i][r])
+    return intake_records
+
+
+def parse_student_strength(locator, inst_name, coercer):
+    strength_records = new_section("StudentStrength", inst_name)
+    tables, in_region = locator.tables(0, "StudentStrength")
+    # The first table of the region, or the second table on page0, is the
+    # student strength breakdown
+    index = 0 if in_region else 1
+    if tables and len(tables) > index:
+        student_table = tables[index]
+        # The header spans multiple lines, but columns align with keys
+        rows = student_table[1:]
+        columns = coercer.table(rows, range(1, len(STUDENT_STRENGTH_COLUMNS) + 1))
+        for r, row in enumerate(rows):
+            rec = {"Program": row[0]}
+            for col, values in zip(STUDENT_STRENGTH_COLUMNS, columns):
+                rec[col] = values[r]
+            strength_records.append(**rec)
+    return strength_records
+
+
+def parse_placement(locator, inst_name, coercer):
+    placement_records = new_section("PlacementData", inst_name)
+    # Page0 table2 is UG 4-year placement; page1 tables for UG5Y, PG2Y, PG3Y
+    placement_pages = [0, 1] if len(locator.cache) > 1 else [0]
+    # Identify and parse each placement table by checking header text
+    for page_index in placement_pages:
+        tables, _ = locator.tables(page_index, "PlacementData")
+        for data in tables:
+            if not data or len(data) < 1:  # Check if data exists
+                continue
+
+            header = data[0]
+            if len(header) > 0 and header[0].startswith("Academic Year"):
+                # The program type (UG4, UG5, PG2, PG3) is not recorded; every
+                # placement table contributes rows in page order
+                rows = [row for row in data[1:] if row]  # Skip empty rows
+                # Median salary may have text in parentheses, which the coercer ignores
+                intake, admitted, graduating, placed, salary, higher = coercer.table(rows, [1, 2, 6, 7, 8, 9])
+                for r, row in enumerate(rows):
+                    placement_records.append(
+                        AcademicYear=row[0],
+                        FirstYearIntake=intake[r],
+                        FirstYearAdmitted=admitted[r],
+                        GraduatingYear=row[5] if len(row) > 5 else None,  # 2nd Academic Year in row
+                        GraduatingStudents=graduating[r],
+                        Placed=placed[r],
+                        MedianSalary=salary[r],
+                        HigherStudies=higher[r])
+    return placement_records
+
+
+def parse_phd(locator, inst_name, coercer):
+    phd_records = new_section("PhDData", inst_name)
+    # Page1 contains Ph.D student counts and graduations
+    if len(locator.cache) > 1:
+        tables, _ = locator.tables(1, "PhDData")
+        phd_tables = [data for data in tables if data[0][0].startswith("Ph.D")]
+        if phd_tables:  # Make sure we found a Ph.D table
+            phd_table = phd_tables[0]
+            # Parse total students
+            if len(phd_table) > 3:
+                total_full, total_part = coercer.table(phd_table[2:4], [2])[0]
+                if total_full is not None:
+                    phd_records.append(Type="FullTime_Total", Count=total_full)
+                if total_part is not None:
+                    phd_records.append(Type="PartTime_Total", Count=total_part)
+
+            # Parse graduates per year, skipping missing or unreadable counts
+            if len(phd_table) > 5:
+                year_header = phd_table[5]  # e.g., ['', '2022-23', '2021-22', '2020-21']
+                rows = [row for row in phd_table[6:] if len(row) > 0]
+                counts = coercer.table(rows, range(1, len(year_header)))
+                for r, row in enumerate(rows):
+                    mode = row[0]  # 'Full Time' or 'Part Time'
+                    for j, year in enumerate(year_header[1:]):
+                        if counts[j][r] is not None:
+                            phd_records.append(Type=mode, Year=year, Graduated=counts[j][r])
+    return phd_records
+
+
+def _parse_expenditure(data, records, coercer):
+    """Parse a capital or operational expenditure table into records."""
+    years = data[0][1:]
+    rows = data[3:]
+    amounts = coercer.table(rows, range(1, len(years) + 1))
+    for r, row in enumerate(rows):
+        for i, year in enumerate(years):
+            if amounts[i][r] is not None:
+                records.append(Category=row[0].strip(), Year=year, Amount=amounts[i][r])
+
+
+def _parse_projects(data, records, coercer):
+    """Parse a sponsored or consultancy projects table into records."""
+    years = data[0][1:]
+    rows = [row for row in data[1:4] if len(row) > 0]
+    values = coercer.table(rows, range(1, len(years) + 1))
+    for r, row in enumerate(rows):
+        key = row[0]
+        for i, year in enumerate(years, start=1):
+            if i < len(row):
+                records.append(Type=key, Year=year, Value=values[i - 1][r])
+
+
+def _parse_financial_section(locator, inst_name, coercer, section, matches, parse):
+    """Parse the page 2 tables of one financial section that match its header check."""
+    records = new_section(section, inst_name)
+    # Page2 tables: capital, operational, sponsored, consultancy
+    if len(locator.cache) > 2:
+        tables, _ = locator.tables(2, section)
+        for data in tables:
+            if matches(data):
+                parse(data, records, coercer)
+    return records
+
+
+def parse_capital_expenditure(locator, inst_name, coercer):
+    return _parse_financial_section(
+        locator, inst_name, coercer, "CapitalExpenditure",
+        lambda data: len(data) > 2 and data[0][0].startswith("Financial Year") and data[2][0].startswith("Annual Capital"),
+        _parse_expenditure)
+
+
+def parse_operational_expenditure(locator, inst_name, coercer):
+    return _parse_financial_section(
+        locator, inst_name, coercer, "OperationalExpenditure",
+        lambda data: len(data) > 2 and data[0][0].startswith("Financial Year") and data[2][0].startswith("Annual Operational"),
+        _parse_expenditure)
+
+
+def parse_sponsored_projects(locator, inst_name, coercer):
+    return _parse_financial_section(
+        locator, inst_name, coercer, "SponsoredProjects",
+        lambda data: len(data) > 1 and data[0][0] == "Financial Year" and "Sponsored Projects" in data[1][0],
+        _parse_projects)
+
+
+def parse_consultancy_projects(locator, inst_name, coercer):
+    return _parse_financial_section(
+        locator, inst_name, coercer, "ConsultancyProjects",
+        lambda data: len(data) > 1 and data[0][0] == "Financial Year" and "Consultancy Projects" in data[1][0],
+        _parse_projects)
+
+
+def parse_facilities(locator, inst_name, coercer):
+    facilities_records = new_section("Facilities", inst_name)
+    # Page3 may contain Q&A table (here simplified parse)
+    if len(locator.cache) > 3:
+        tables, _ = locator.tables(3, "Facilities")
+        for cells in tables:
+            # e.g. if first row is a question about lifts/ramps:
+            if len(cells) > 0 and len(cells[0]) > 0 and cells[0][0].startswith("1. Do your institution buildings"):
+                if len(cells[0]) > 1:
+                    facilities_records.append(Feature="Lifts/Ramps in Buildings", Available=cells[0][1])
+            if len(cells) > 0 and len(cells[0]) > 2 and cells[0][2].startswith("2. Do you offer any separate cell"):
+                if len(cells[0]) > 3:
+                    facilities_records.append(Feature="Special Facilities for Challenged", Available=cells[0][3])
+    return facilities_records
+
+
+def parse_faculty(locator, inst_name, coercer):
+    faculty_records = new_section("FacultyCount", inst_name)
+    # Last table on page3: faculty count
+    if len(locator.cache) > 3:
+        tables, _ = locator.tables(3, "FacultyCount")
+        for cells in tables:
+            if len(cells) > 0 and len(cells[0]) > 0 and cells[0][0].startswith("Number of faculty"):
+                if len(cells[0]) > 1:
+                    num_faculty = coercer.ints([cells[0][1]])[0]
+                    if num_faculty is not None:
+                        faculty_records.append(TotalFaculty=num_faculty)
+    return faculty_records
+
+
+# Section name -> parser, in SECTION_NAMES order
+SECTION_PARSERS = {
+    "SanctionedIntake": parse_sanctioned_intake,
+    "StudentStrength": parse_student_strength,
+    "PlacementData": parse_placement,
+    "PhDData": parse_phd,
+    "CapitalExpenditure": parse_capital_expenditure,
+    "OperationalExpenditure": parse_operational_expenditure,
+    "SponsoredProjects": parse_sponsored_projects,
+    "ConsultancyProjects": parse_consultancy_projects,
+    "Facilities": parse_facilities,
+    "FacultyCount": parse_faculty,
+}
+
+
+def parse_report(cache, source_file, use_regions=True):
+    """
+    Run every section parser over an open PDF's PageCache.
+
+    With use_regions=False every parser reads the whole-page tables, as the
+    extraction did before section regions were introduced.
+    """
+    locator = SectionLocator(cache, use_regions)
+    coercer = CellCoercer()
+    # Parser time not spent in pdfplumber calls is counted as coercion
+    coerce = cache.timer.stage("coerce")
+    start = time.perf_counter()
+    with coerce:
+        inst_name = extract_institute_name(locator)
+    institute_seconds = time.perf_counter() - start
+
+    report = ExtractedReport(source_file, inst_name)
+    report.section_seconds["Institute"] = institute_seconds
+    for name in SECTION_NAMES:
+        start = time.perf_counter()
+        failed = coercer.stats['failed']
+        with coerce:
+            report.sections[name] = SECTION_PARSERS[name](locator, inst_name, coercer)
+        report.section_seconds[name] = time.perf_counter() - start
+        if coercer.stats['failed'] > failed:
+            report.coercion_failures[name] = coercer.stats['failed'] - failed
+
+    report.cache_stats = dict(cache.stats)
+    report.coercion_stats = dict(coercer.stats)
+    return report
+
+
+def extract_report(path, source_file=None, use_regions=True, timer=NULL_TIMER):
+    """
+    Open a PDF, parse it into an ExtractedReport and close it again.
+
+    Pass an extraction_profiler.StageTimer to time the open, close and
+    per-page stages.
+    """
+    if source_file is None:
+        source_file = os.path.basename(path)
+    with timer.stage("open"):
+        pdf = pdfplumber.open(path)
+    try:
+        return parse_report(PageCache(pdf, timer), source_file, use_regions)
+    finally:
+        with timer.stage("close"):
+            pdf.close()
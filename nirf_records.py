@@ -0,0 +1,159 @@
+"""
+Compact, column-oriented containers for extracted NIRF section records.
+
+The section parsers used to build one dict per row, repeating the institute
+name, year and category strings and paying dict overhead for every record.
+A SectionTable stores each field as a column instead:
+
+- "const" fields (the institute) are stored once per table,
+- "cat" fields (years, programs, categories) are dictionary-encoded: each
+  distinct value is stored once and rows keep a small integer code,
+- "int" fields are packed into a typed array with a sentinel for missing values.
+
+Tables still iterate as record dicts, so the XML and MongoDB sinks are
+unchanged, and to_dataframe() builds a DataFrame straight from the columns.
+"""
+from array import array
+
+# Sentinel stored in "int" columns for a missing value (parsed values are never negative)
+NULL_INT = -(2 ** 63)
+
+# Student strength table columns after the program name
+STUDENT_STRENGTH_COLUMNS = ["Male", "Female", "Total", "WithinState", "OutsideState",
+                            "Abroad", "EconomicallyBackward", "SociallyChallenged",
+                            "FeeReimb_State", "FeeReimb_Inst", "FeeReimb_Private",
+                            "NoReimbursement"]
+
+# (field, kind) pairs per section, in the field order records are written.
+# Ph.D. totals and graduate rows use different fields; missing ones are
+# skipped on output, so each row keeps its original element order.
+SECTION_SCHEMAS = {
+    "SanctionedIntake": [("Institute", "const"), ("Program", "cat"), ("Year", "cat"),
+                         ("ApprovedIntake", "int")],
+    "StudentStrength": ([("Institute", "const"), ("Program", "cat")]
+                        + [(column, "int") for column in STUDENT_STRENGTH_COLUMNS]),
+    "PlacementData": [("Institute", "const"), ("AcademicYear", "cat"), ("FirstYearIntake", "int"),
+                      ("FirstYearAdmitted", "int"), ("GraduatingYear", "cat"),
+                      ("GraduatingStudents", "int"), ("Placed", "int"), ("MedianSalary", "int"),
+                      ("HigherStudies", "int")],
+    "PhDData": [("Institute", "const"), ("Type", "cat"), ("Count", "int"), ("Year", "cat"),
+                ("Graduated", "int")],
+    "CapitalExpenditure": [("Institute", "const"), ("Category", "cat"), ("Year", "cat"),
+                           ("Amount", "int")],
+    "OperationalExpenditure": [("Institute", "const"), ("Category", "cat"), ("Year", "cat"),
+                               ("Amount", "int")],
+    "SponsoredProjects": [("Institute", "const"), ("Type", "cat"), ("Year", "cat"), ("Value", "int")],
+    "ConsultancyProjects": [("Institute", "const"), ("Type", "cat"), ("Year", "cat"), ("Value", "int")],
+    "Facilities": [("Institute", "const"), ("Feature", "cat"), ("Available", "cat")],
+    "FacultyCount": [("Institute", "const"), ("TotalFaculty", "int")],
+}
+
+
+class SectionTable:
+    """Column-oriented records of one section, see the module docstring."""
+
+    __slots__ = ("name", "fields", "kinds", "_consts", "_levels", "_lookup", "_columns", "_length")
+
+    def __init__(self, name, schema=None, constants=None):
+        schema = schema if schema is not None else SECTION_SCHEMAS[name]
+        self.name = name
+        self.fields = [field for field, _ in schema]
+        self.kinds = dict(schema)
+        self._consts = dict(constants or {})
+        self._levels = {}
+        self._lookup = {}
+        self._columns = {}
+        self._length = 0
+        for field, kind in schema:
+            if kind == "cat":
+                self._levels[field] = []
+                self._lookup[field] = {}
+                self._columns[field] = array("I")
+            elif kind == "int":
+                self._columns[field] = array("q")
+            elif kind != "const":
+                raise ValueError(f"Unknown field kind {kind!r} for {name}.{field}")
+
+    def __len__(self):
+        return self._length
+
+    def append(self, **values):
+        """Add one record. Fields that are not given are stored as missing."""
+        for field, kind in self.kinds.items():
+            value = values.get(field)
+            if kind == "const":
+                if field in values and value != self._consts.get(field):
+                    raise ValueError(f"{self.name}.{field} is constant ({self._consts.get(field)!r})")
+            elif kind == "cat":
+                lookup = self._lookup[field]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(self._levels[field])
+                    self._levels[field].append(value)
+                self._columns[field].append(code)
+            else:
+                self._columns[field].append(NULL_INT if value is None else value)
+        self._length += 1
+
+    def column(self, field):
+        """Return the decoded values of one field as a list."""
+        kind = self.kinds[field]
+        if kind == "const":
+            return [self._consts.get(field)] * self._length
+        if kind == "cat":
+            levels = self._levels[field]
+            return [levels[code] for code in self._columns[field]]
+        return [None if value == NULL_INT else value for value in self._columns[field]]
+
+    def __iter__(self):
+        """Yield each record as a dict in field order, with None for missing values."""
+        columns = [self.column(field) for field in self.fields]
+        for row in zip(*columns):
+            yield dict(zip(self.fields, row))
+
+    def to_dataframe(self):
+        """Build a DataFrame directly from the columns."""
+        import pandas as pd
+
+        data = {}
+        for field in self.fields:
+            values = self.column(field)
+            data[field] = pd.array(values, dtype="Int64") if self.kinds[field] == "int" else values
+        return pd.DataFrame(data, columns=self.fields)
+
+    def extend(self, other):
+        """
+        Append all records of another table with the same schema.
+
+        A "const" field whose value differs between the tables (for example the
+        institute, when accumulating records across many PDFs) is turned into a
+        dictionary-encoded column.
+        """
+        if other.fields != self.fields:
+            raise ValueError(f"Cannot extend {self.name} with {other.name}: fields differ")
+        for field in self.fields:
+            if (self.kinds[field] == "const" and other.kinds[field] == "const"
+                    and self._consts.get(field) == other._consts.get(field)):
+                continue
+            if self.kinds[field] == "const":
+                self._promote(field)
+            values = other.column(field)
+            if self.kinds[field] == "cat":
+                lookup, levels, codes = self._lookup[field], self._levels[field], self._columns[field]
+                for value in values:
+                    code = lookup.get(value)
+                    if code is None:
+                        code = lookup[value] = len(levels)
+                        levels.append(value)
+                    codes.append(code)
+            else:
+                self._columns[field].extend(NULL_INT if value is None else value for value in values)
+        self._length += len(other)
+
+    def _promote(self, field):
+        """Turn a "const" field into a dictionary-encoded column."""
+        value = self._consts.pop(field, None)
+        self.kinds[field] = "cat"
+        self._levels[field] = [value]
+        self._lookup[field] = {value: 0}
+        self._columns[field] = array("I", [0]) * self._length
@@ -0,0 +1,153 @@
+"""
+Output sinks for ExtractedReport objects produced by nirf_extraction.
+
+Every sink has a write(report) method, so one parsed PDF can be emitted to
+XML, Excel and MongoDB in the same run. pandas and pymongo are only imported
+by the sinks that need them.
+"""
+import os
+from xml_stream_writer import StreamingXMLWriter
+
+# Excel sheet names that differ from the XML section names
+EXCEL_SHEET_NAMES = {"OperationalExpenditure": "OpExpenditure"}
+
+
+class XMLSink:
+    """Write each report as <xml_dir>/<pdf base name>.xml."""
+
+    def __init__(self, xml_dir, compat=False):
+        self.xml_dir = xml_dir
+        self.compat = compat
+
+    def path_for(self, source_file):
+        """Return the XML output path for a PDF file name."""
+        base_name = os.path.splitext(source_file)[0]
+        return os.path.join(self.xml_dir, f"{base_name}.xml")
+
+    def write(self, report):
+        xml_filename = self.path_for(report.source_file)
+
+        # Stream the XML straight to disk section by section. Write to a
+        # temporary file first so a failure never leaves a truncated XML behind
+        tmp_filename = xml_filename + ".tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            writer = StreamingXMLWriter(f, compat=self.compat)
+            writer.start("NIRF_Data")
+
+            # Add institute information
+            writer.start("Institute")
+            writer.element("Name", report.institute)
+            writer.element("SourceFile", report.source_file)
+            writer.end()
+
+            for section_name, records in report.items():
+                writer.section(section_name, records)
+            writer.end()
+        os.replace(tmp_filename, xml_filename)
+        return xml_filename
+
+
+class ExcelSink:
+    """Write each report as a workbook with one sheet per section."""
+
+    def __init__(self, excel_dir=".", prefix="NIRF_Data_"):
+        self.excel_dir = excel_dir
+        self.prefix = prefix
+
+    def path_for(self, source_file):
+        """Return the Excel output path for a PDF file name."""
+        return os.path.join(self.excel_dir, f"{self.prefix}{source_file.replace('.pdf', '')}.xlsx")
+
+    def write(self, report):
+        import pandas as pd
+
+        excel_filename = self.path_for(report.source_file)
+        # Write to Excel with separate sheets
+        with pd.ExcelWriter(excel_filename, engine="openpyxl") as writer:
+            for section_name, records in report.items():
+                sheet_name = EXCEL_SHEET_NAMES.get(section_name, section_name)
+                records.to_dataframe().to_excel(writer, sheet_name=sheet_name, index=False)
+        return excel_filename
+
+
+def report_to_document(report):
+    """
+    Convert a report to the document shape xml_to_mongodb.parse_xml_to_dict
+    produces for the report's XML file, without writing or parsing any XML.
+
+    Integer fields are taken as they are; other values go through the same
+    text conversion as XML text, once per distinct value, so the document
+    is the same as the one imported from the XML file.
+    """
+    from xml_to_mongodb import build_institute_info, standardize_field_name, convert_text_value
+
+    # The XML file shares the PDF's base name, so the college ID derived from
+    # the file name is the same either way
+    document = {'institute': build_institute_info(report.institute, report.source_file,
+                                                  report.source_file)}
+    values = {}
+    for section_name, records in report.items():
+        entries = []
+        for record in records:
+            entry_data = {}
+            for key, value in record.items():
+                if value is None:  # None values are not written to XML
+                    continue
+                if type(value) is not int:
+                    text = str(value)
+                    value = values.get(text, values)
+                    if value is values:
+                        value = values[text] = convert_text_value(text)
+                entry_data[standardize_field_name(key)] = value
+            if entry_data:
+                entries.append(entry_data)
+        document[section_name.lower()] = entries
+    return document
+
+
+class MongoSink:
+    """
+    Write reports to the MongoDB individuals collection in batches.
+
+    Documents go through xml_to_mongodb.IndividualBatchWriter, so unchanged
+    documents are skipped and the rest is written with bulk writes. Call
+    close() at the end to write the last batch.
+
+    A document is only stored once its batch has been written, so write(),
+    add_document() and close() return (stored, failed): the source files of
+    the documents whose write was settled by that call, split into those
+    MongoDB stored (or already held unchanged) and those that failed. Both
+    are empty while the documents are still buffered.
+    """
+
+    def __init__(self, db, collection_name='individuals', batch_size=500):
+        from xml_to_mongodb import IndividualBatchWriter
+        self.db = db
+        self.collection_name = collection_name
+        self.writer = IndividualBatchWriter(db, collection_name, batch_size)
+        self.pending = []
+        self.failures_seen = 0
+
+    def write(self, report):
+        from xml_to_mongodb import prepare_individual_document
+        return self.add_document(prepare_individual_document(report_to_document(report)))
+
+    def add_document(self, doc):
+        """Queue a document already prepared with xml_to_mongodb.prepare_individual_document."""
+        self.pending.append(doc['metadata']['source_file'])
+        self.writer.add_prepared(doc)
+        return self._settled()
+
+    def close(self):
+        self.writer.flush()
+        return self._settled()
+
+    def _settled(self):
+        if self.writer.buffer:
+            return [], []
+        failed = self.writer.failed_sources[self.failures_seen:]
+        self.failures_seen = len(self.writer.failed_sources)
+        failed_set = set(failed)
+        stored = [source_file for source_file in self.pending if source_file not in failed_set]
+        self.pending = []
+        return stored, failed
@@ -1,7 +1,11 @@
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
 import os
+import time
+import argparse
+import tempfile
 
 # Input and output files
 INPUT_FILE = 'Combined_Excels.xlsx'
@@ -18,27 +22,33 @@ def check_file_exists(file_path):
         return False
     return True
 
-def get_all_headers(wb):
+def get_all_headers(wb, input_file=INPUT_FILE):
     """
     Get all unique headers across all sheets
     """
     all_headers = set()
     for sheet_name in wb.sheet_names:
-        df = pd.read_excel(INPUT_FILE, sheet_name=sheet_name, nrows=1)
+        df = pd.read_excel(input_file, sheet_name=sheet_name, nrows=1)
         all_headers.update(df.columns)
     return sorted(list(all_headers))
 
-def normalize_combined_excel():
+def normalize_combined_excel_legacy(input_file=INPUT_FILE, output_file=OUTPUT_FILE):
+    """
+    The original normalizer, kept to time normalize_combined_excel against
+
+    Re-reads the workbook for every sheet's header and again for its data,
+    and writes the output cell by cell.
+    """
     print("Starting to normalize combined Excel file...")
     
     # Check if input file exists
-    if not check_file_exists(INPUT_FILE):
+    if not check_file_exists(input_file):
         return
     
     try:
         # Get all unique headers across sheets
-        wb = pd.ExcelFile(INPUT_FILE)
-        all_headers = get_all_headers(wb)
+        wb = pd.ExcelFile(input_file)
+        all_headers = get_all_headers(wb, input_file)
         print(f"\nFound {len(all_headers)} unique columns across all sheets")
         
         # Create a new workbook
@@ -51,7 +61,7 @@ def normalize_combined_excel():
             print(f"\nProcessing sheet: {sheet_name}")
             
             # Read the sheet into pandas
-            df = pd.read_excel(INPUT_FILE, sheet_name=sheet_name)
+            df = pd.read_excel(input_file, sheet_name=sheet_name)
             
             # Create a new DataFrame with all headers
             df_normalized = pd.DataFrame(columns=all_headers)
@@ -77,8 +87,8 @@ def normalize_combined_excel():
             print(f"Completed processing sheet: {sheet_name}")
         
         # Save the normalized workbook
-        print(f"\nSaving normalized file as {OUTPUT_FILE}...")
-        wb_normalized.save(OUTPUT_FILE)
+        print(f"\nSaving normalized file as {output_file}...")
+        wb_normalized.save(output_file)
         print("Normalization completed successfully!")
         
     except Exception as e:
@@ -86,5 +96,108 @@ def normalize_combined_excel():
         print("Please make sure the Combined_Excels.xlsx file is not open in Excel")
         print("and that you have write permissions in the current directory.")
 
+def normalize_combined_excel(input_file=INPUT_FILE, output_file=OUTPUT_FILE):
+    """
+    Give every sheet of the combined workbook the same columns
+
+    The workbook is read once, headers and data of all sheets together, so
+    columns whose first value is further down than the first data row are
+    kept, unlike in the legacy normalizer. Each sheet is reindexed to the sorted union of all headers, missing columns
+    left empty, and streamed to a write-only workbook with a bold header row.
+    Missing values are written as empty cells.
+    """
+    print("Starting to normalize combined Excel file...")
+    
+    # Check if input file exists
+    if not check_file_exists(input_file):
+        return
+    
+    try:
+        sheets = pd.read_excel(input_file, sheet_name=None)
+        all_headers = set()
+        for df in sheets.values():
+            all_headers.update(df.columns)
+        all_headers = sorted(all_headers)
+        print(f"\nFound {len(all_headers)} unique columns across all sheets")
+        
+        wb_normalized = Workbook(write_only=True)
+        bold = Font(bold=True)
+        for sheet_name, df in sheets.items():
+            print(f"Processing sheet: {sheet_name}")
+            df_normalized = df.reindex(columns=all_headers).astype(object)
+            df_normalized = df_normalized.where(df_normalized.notna(), None)
+            
+            ws_normalized = wb_normalized.create_sheet(title=sheet_name)
+            header = []
+            for title in all_headers:
+                cell = WriteOnlyCell(ws_normalized, value=title)
+                cell.font = bold
+                header.append(cell)
+            ws_normalized.append(header)
+            for row in df_normalized.itertuples(index=False, name=None):
+                ws_normalized.append(row)
+            ws_normalized.close()
+        
+        print(f"\nSaving normalized file as {output_file}...")
+        wb_normalized.save(output_file)
+        print("Normalization completed successfully!")
+        
+    except Exception as e:
+        print(f"\nAn error occurred: {str(e)}")
+        print("Please make sure the Combined_Excels.xlsx file is not open in Excel")
+        print("and that you have write permissions in the current directory.")
+
+def compare_normalizers(input_file=INPUT_FILE, output_file=OUTPUT_FILE):
+    """
+    Time normalize_combined_excel against normalize_combined_excel_legacy
+
+    The legacy output goes to a temporary file and is compared with the new
+    one. The legacy normalizer finds the headers from the first data row
+    only and drops columns that start further down; the new one keeps them,
+    so only the columns in both outputs are compared. NaN in the legacy
+    output and empty cells in the new one count as equal.
+    """
+    start = time.perf_counter()
+    normalize_combined_excel(input_file, output_file)
+    new_seconds = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_file = os.path.join(tmp, 'legacy.xlsx')
+        start = time.perf_counter()
+        normalize_combined_excel_legacy(input_file, legacy_file)
+        legacy_seconds = time.perf_counter() - start
+        if not (os.path.exists(output_file) and os.path.exists(legacy_file)):
+            return
+        new = pd.read_excel(output_file, sheet_name=None)
+        legacy = pd.read_excel(legacy_file, sheet_name=None)
+    same = list(new) == list(legacy) and all(
+        set(legacy[name].columns) <= set(new[name].columns)
+        and new[name][legacy[name].columns].equals(legacy[name]) for name in new)
+    # Every sheet has the same columns in either output
+    first = next(iter(new), None)
+    extra = len(new[first].columns) - len(legacy[first].columns) if same and first else 0
+    print(f"\nLegacy normalizer: {legacy_seconds:.2f}s")
+    print(f"Single-read normalizer: {new_seconds:.2f}s ({legacy_seconds / new_seconds:.1f}x faster)")
+    print("Outputs identical" if same else "Outputs differ", end="")
+    print(f", {extra} columns the legacy normalizer dropped are kept" if extra else "")
+
+def main():
+    parser = argparse.ArgumentParser(description="Give every sheet of the combined workbook the same columns")
+    parser.add_argument('--input', default=INPUT_FILE, help=f"Combined workbook (default: {INPUT_FILE})")
+    parser.add_argument('--output', default=OUTPUT_FILE, help=f"Normalized workbook (default: {OUTPUT_FILE})")
+    parser.add_argument('--compare', action='store_true',
+                        help="Also run the old normalizer, compare the outputs and report both timings")
+    parser.add_argument('--legacy', action='store_true', help="Use the old normalizer")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.compare:
+        compare_normalizers(args.input, args.output)
+        return
+    if args.legacy:
+        normalize_combined_excel_legacy(args.input, args.output)
+    else:
+        normalize_combined_excel(args.input, args.output)
+    print(f"Normalized in {time.perf_counter() - start:.2f}s")
+
 if __name__ == '__main__':
-    normalize_combined_excel() 
\ No newline at end of file
+    main()
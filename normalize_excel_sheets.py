@@ -1,7 +1,11 @@
 import os
 import re
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 from openpyxl import load_workbook
+from openpyxl.formatting.rule import FormulaRule
 from openpyxl.styles import PatternFill, Font
 import numpy as np
 
@@ -23,108 +27,186 @@ def extract_sheet_name(filename):
         return match.group(1)
     return filename.replace('.xlsx', '')
 
+# Cell texts that mean "no value"
+MISSING_TOKENS = ['', 'nan', 'None', 'none', 'NULL', 'null']
+
+# Fill of the conditional-formatting rule that marks empty cells
+MISSING_FILL = PatternFill(start_color='FFFF0000', end_color='FFFF0000', fill_type='solid')
+
 def normalize_data(df):
     """
     Normalize the data in the DataFrame
+
+    Text columns are stripped, the MISSING_TOKENS become NaN and columns
+    whose every value parses as a number are converted to numbers. The text
+    columns are handled as one block rather than column by column.
     """
-    # Create a copy to avoid modifying the original
     df_normalized = df.copy()
-    
-    # Convert all text to string and strip whitespace
-    for col in df_normalized.columns:
-        if df_normalized[col].dtype == 'object':
-            df_normalized[col] = df_normalized[col].astype(str).str.strip()
-    
-    # Replace empty strings and 'nan' with actual NaN
-    df_normalized = df_normalized.replace(['', 'nan', 'None', 'none', 'NULL', 'null'], np.nan)
-    
-    # Convert numeric columns to appropriate types
-    for col in df_normalized.columns:
-        try:
-            # Try to convert to numeric, if possible
-            df_normalized[col] = pd.to_numeric(df_normalized[col], errors='ignore')
-        except:
-            pass
+    # pandas 3 reads text into the str dtype rather than object
+    text_columns = [i for i, dtype in enumerate(df_normalized.dtypes)
+                    if dtype == 'object' or isinstance(dtype, pd.StringDtype)]
+    if not text_columns:
+        return df_normalized
+    
+    # Everything in a text column becomes its stripped string, None and NaN included
+    text = np.char.strip(df_normalized.iloc[:, text_columns].to_numpy().astype(str))
+    text = pd.DataFrame(text, index=df_normalized.index, dtype=object)
+    text = text.mask(text.isin(MISSING_TOKENS))
+    
+    # A column is numeric only if all of its values are; otherwise it stays text
+    numeric = text.apply(pd.to_numeric, errors='coerce')
+    convert = numeric.notna().sum() == text.notna().sum()
+    for position, column in enumerate(text_columns):
+        values = numeric[position] if convert[position] else text[position]
+        df_normalized.isetitem(column, values)
     
     return df_normalized
 
 def highlight_missing_values(worksheet):
     """
     Highlight missing values in the worksheet
+
+    One conditional-formatting rule over the used range fills every empty or
+    blank cell, instead of a fill on each cell.
     """
-    # Define the fill for missing values
-    missing_fill = PatternFill(start_color='FFFF0000', end_color='FFFF0000', fill_type='solid')
-    
-    # Iterate through all cells
-    for row in worksheet.iter_rows():
-        for cell in row:
-            if cell.value is None or str(cell.value).strip() == '':
-                cell.fill = missing_fill
+    worksheet.conditional_formatting.add(
+        worksheet.dimensions, FormulaRule(formula=['LEN(TRIM(A1))=0'], fill=MISSING_FILL))
 
 def process_excel_file(file_path, output_path):
     """
     Process a single Excel file
+
+    The workbook is loaded once: its values are normalized in a DataFrame and
+    written back into the same worksheet, which keeps its formatting.
+    Missing values are written as empty cells. The output is replaced
+    atomically. Returns the number of data rows written.
     """
     print(f"Processing file: {os.path.basename(file_path)}")
     
-    # Load the workbook
     wb = load_workbook(file_path)
     ws = wb.active
     
-    # Convert to DataFrame for easier processing
-    data = []
-    for row in ws.iter_rows(values_only=True):
-        data.append(row)
-    
+    data = list(ws.iter_rows(values_only=True))
     df = pd.DataFrame(data[1:], columns=data[0])
     
-    # Normalize the data
-    df_normalized = normalize_data(df)
-    
-    # Create a new workbook for the normalized data
-    wb_normalized = load_workbook(file_path)
-    ws_normalized = wb_normalized.active
-    
-    # Clear existing data
-    for row in ws_normalized.iter_rows():
-        for cell in row:
-            cell.value = None
-    
-    # Write the normalized data back to the worksheet
-    for r_idx, row in enumerate(df_normalized.itertuples(), 2):
-        for c_idx, value in enumerate(row[1:], 1):
-            ws_normalized.cell(row=r_idx, column=c_idx, value=value)
-    
-    # Write headers
-    for c_idx, col_name in enumerate(df_normalized.columns, 1):
-        ws_normalized.cell(row=1, column=c_idx, value=col_name)
-        # Make headers bold
-        ws_normalized.cell(row=1, column=c_idx).font = Font(bold=True)
-    
-    # Highlight missing values
-    highlight_missing_values(ws_normalized)
-    
-    # Save the normalized workbook
-    wb_normalized.save(output_path)
+    df_normalized = normalize_data(df).astype(object)
+    df_normalized = df_normalized.where(df_normalized.notna(), None)
+    
+    # The frame covers the whole used range, so every cell is overwritten in place
+    rows = ws.iter_rows(min_row=1, max_row=len(data), max_col=len(data[0]))
+    header_font = Font(bold=True)
+    for cell, col_name in zip(next(rows), df_normalized.columns):
+        cell.value = col_name
+        cell.font = header_font
+    for cells, values in zip(rows, df_normalized.itertuples(index=False, name=None)):
+        for cell, value in zip(cells, values):
+            cell.value = value
+    
+    highlight_missing_values(ws)
+    
+    # Save next to the output and rename it into place, so an interrupted save
+    # never leaves a truncated file that looks up to date on the next run
+    tmp_path = output_path + ".tmp"
+    try:
+        wb.save(tmp_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
     print(f"Saved normalized file: {os.path.basename(output_path)}")
+    return len(data) - 1
+
+def is_up_to_date(file_path, output_path):
+    """True if output_path exists and is newer than file_path"""
+    return os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(file_path)
 
-def normalize_excel_sheets():
+def normalize_excel_sheets(excel_dir=EXCEL_DIR, output_dir=OUTPUT_DIR, workers=1, force=False):
+    """
+    Normalize every Excel file of excel_dir into output_dir
+
+    Files whose output is newer than the input are skipped unless force is
+    set. With workers > 1 the files are processed in that many processes;
+    each writes its own output file, so they are independent. A file that
+    fails is reported and the others still run. Returns the number of files
+    that failed.
+    """
     print("Starting to normalize Excel files...")
     
     # Create output directory if it doesn't exist
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
     
-    files = get_sorted_excel_files(EXCEL_DIR)
+    files = get_sorted_excel_files(excel_dir)
     print(f"Found {len(files)} Excel files to process")
     
-    for index, file in enumerate(files, 1):
-        print(f"\nProcessing file {index}/{len(files)}: {file}")
-        file_path = os.path.join(EXCEL_DIR, file)
-        output_path = os.path.join(OUTPUT_DIR, file)
-        process_excel_file(file_path, output_path)
-    
-    print("\nNormalization completed successfully!")
+    jobs = []
+    for file in files:
+        file_path = os.path.join(excel_dir, file)
+        output_path = os.path.join(output_dir, file)
+        if force or not is_up_to_date(file_path, output_path):
+            jobs.append((file, file_path, output_path))
+    skipped = len(files) - len(jobs)
+    if skipped:
+        print(f"Skipping {skipped} files whose output is up to date (--force to redo them)")
+    
+    start = time.perf_counter()
+    rows = 0
+    input_bytes = 0
+    failed = []
+    if workers > 1 and len(jobs) > 1:
+        print(f"Using {workers} worker processes")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(process_excel_file, file_path, output_path): (file, file_path)
+                       for file, file_path, output_path in jobs}
+            for index, future in enumerate(as_completed(futures), 1):
+                file, file_path = futures[future]
+                try:
+                    rows += future.result()
+                    input_bytes += os.path.getsize(file_path)
+                    print(f"Finished file {index}/{len(jobs)}: {file}")
+                except Exception as e:
+                    print(f"Failed to normalize {file}: {e}")
+                    failed.append(file)
+    else:
+        for index, (file, file_path, output_path) in enumerate(jobs, 1):
+            print(f"\nProcessing file {index}/{len(jobs)}: {file}")
+            try:
+                rows += process_excel_file(file_path, output_path)
+                input_bytes += os.path.getsize(file_path)
+            except Exception as e:
+                print(f"Failed to normalize {file}: {e}")
+                failed.append(file)
+    elapsed = time.perf_counter() - start
+    
+    done = len(jobs) - len(failed)
+    seconds = elapsed if elapsed > 0 else float('inf')
+    print(f"\nNormalized {done} files ({rows} rows, {input_bytes / 1024 / 1024:.1f} MiB) in {elapsed:.2f}s: "
+          f"{done / seconds:.2f} files/sec, {rows / seconds:.0f} rows/sec, "
+          f"{input_bytes / 1024 / 1024 / seconds:.2f} MiB/sec")
+    print(f"Skipped (up to date): {skipped}, Failed: {len(failed)}")
+    if failed:
+        print("Failed files: " + ", ".join(failed))
+    else:
+        print("Normalization completed successfully!")
+    return len(failed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize the Excel files of All-Excels into Normalized-Excels")
+    parser.add_argument('--excel-dir', default=EXCEL_DIR, help=f"Directory with the Excel files (default: {EXCEL_DIR})")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR,
+                        help=f"Directory for the normalized files (default: {OUTPUT_DIR})")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Files normalized in parallel processes (default: 1, 0 = one per CPU core)")
+    parser.add_argument('--force', action='store_true', help="Also redo files whose output is newer than the input")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.excel_dir):
+        print(f"Error: Directory '{args.excel_dir}' does not exist.")
+        raise SystemExit(1)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    if normalize_excel_sheets(args.excel_dir, args.output_dir, workers, args.force):
+        raise SystemExit(1)
 
 if __name__ == '__main__':
-    normalize_excel_sheets() 
\ No newline at end of file
+    main()
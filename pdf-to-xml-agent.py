@@ -1,400 +1,307 @@
 import os
-import pdfplumber
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
-
-# Function to prettify XML output
-def prettify(elem):
-    """Return a pretty-printed XML string for the Element."""
-    rough_string = ET.tostring(elem, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent="  ")
+import time
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pdf_page_cache import merge_cache_stats, format_cache_stats
+from cell_coercion import format_coercion_stats
+from extraction_profiler import NULL_TIMER, StageTimer, build_profile_report, capture_profile
+from extraction_manifest import ExtractionManifest, MANIFEST_NAME
+from nirf_extraction import PARSER_VERSION, extract_report
+from nirf_sinks import XMLSink, ExcelSink, MongoSink, report_to_document
 
 # Define folder paths
 pdf_folder = "All-Pdfs"
 xml_folder = "All-XML"
 
-# Ensure the XML folder exists
-if not os.path.exists(xml_folder):
-    os.makedirs(xml_folder)
-    print(f"Created output directory: {xml_folder}")
-
-# Get all PDF files in the folder
-pdf_files = [f for f in os.listdir(pdf_folder) if f.lower().endswith(".pdf")]
-pdf_files.sort()  # Sort to ensure consistent processing order
+def convert_pdf_to_xml(fname, pdf_dir=pdf_folder, xml_dir=xml_folder, compat=False,
+                       excel_dir=None, build_document=False, use_regions=True, profile=False,
+                       write_xml=True):
+    """
+    Extract a single NIRF PDF and write it as XML into xml_dir.
 
-if not pdf_files:
-    print("No PDF files found in the All-Pdfs folder.")
-    exit()
+    The PDF is parsed once by nirf_extraction and handed to each file sink:
+    XML unless write_xml=False, and an Excel workbook when excel_dir is
+    given. With build_document=True the report is also converted to its
+    MongoDB document, content hashes included, and returned as
+    result["document"] so the parent process only has to write it.
 
-print(f"Found {len(pdf_files)} PDF files to process")
-
-# Process each PDF file
-for pdf_index, fname in enumerate(pdf_files):
-    print(f"\nProcessing PDF file {pdf_index+1}/{len(pdf_files)}: {fname}")
-    
-    # Reset data containers for each file
-    intake_records = []
-    strength_records = []
-    placement_records = []
-    phd_records = []
-    finance_capital = []
-    finance_operational = []
-    sponsored_records = []
-    consultancy_records = []
-    facilities_records = []
-    faculty_records = []
+    Errors are caught per file and returned in the result dict instead of being
+    printed, so the same function can run inside a worker process and the parent
+    can report results in a stable order. compat=True writes XML byte-identical
+    to the old minidom pretty-printer. use_regions=False detects tables on
+    whole pages instead of on the located section regions. profile=True
+    adds the time spent in each extraction stage as result["stages"].
+    """
+    result = {"file": fname, "institute": None, "xml_file": None, "excel_file": None,
+              "document": None, "error": None, "cache_stats": {}, "section_seconds": {},
+              "stages": {}, "coercion_stats": {}, "coercion_failures": {}}
+    timer = StageTimer() if profile else NULL_TIMER
+    start = time.perf_counter()
     
     try:
-        path = os.path.join(pdf_folder, fname)
-        pdf = pdfplumber.open(path)
-        
-        # Assume first page has institute name and intake table
-        page0 = pdf.pages[0]
-        
-        # Extract text and print first few lines to debug
-        text_lines = page0.extract_text().splitlines()
-        
-        # More robust institute name extraction
-        inst_name = "Unknown Institute"
-        for line in text_lines[:15]:  # Check first 15 lines
-            if "Institute Name:" in line:
-                inst_name = line.split("Institute Name:")[1].strip()
-                break
-            # Alternative patterns that might appear in the PDF
-            elif "Name of Institution:" in line:
-                inst_name = line.split("Name of Institution:")[1].strip()
-                break
-            elif "Institution:" in line:
-                inst_name = line.split("Institution:")[1].strip()
-                break
+        report = extract_report(os.path.join(pdf_dir, fname), fname, use_regions, timer)
+        result["institute"] = report.institute
+        result["cache_stats"] = report.cache_stats
+        result["section_seconds"] = report.section_seconds
+        result["coercion_stats"] = report.coercion_stats
+        result["coercion_failures"] = report.coercion_failures
         
-        print(f"Extracted institute name: {inst_name}")
+        if write_xml:
+            with timer.stage("xml_write"):
+                result["xml_file"] = XMLSink(xml_dir, compat=compat).write(report)
+        if excel_dir is not None:
+            with timer.stage("excel_write"):
+                result["excel_file"] = ExcelSink(excel_dir).write(report)
+        if build_document:
+            from xml_to_mongodb import prepare_individual_document
+            with timer.stage("document"):
+                result["document"] = prepare_individual_document(report_to_document(report))
         
-        # --- Sanctioned Intake --- 
-        tables = page0.find_tables()
-        if tables and len(tables) > 0:
-            # The first table on page0 is typically the intake table
-            intake_table = tables[0].extract()
-            years = intake_table[0][1:]  # e.g. ['2022-23','2021-22',...]
-            for row in intake_table[1:]:
-                program = row[0]
-                for i, year in enumerate(years):
-                    if i+1 < len(row):
-                        intake = row[i+1]
-                        # Skip if data is missing or '-'
-                        if intake is None or intake.strip() == '-':
-                            continue
-                        intake_records.append({
-                            "Institute": inst_name,
-                            "Program": program,
-                            "Year": year,
-                            "ApprovedIntake": int(intake)
-                        })
-        
-        # --- Student Strength / Demographics ---
-        if tables and len(tables) > 1:
-            # The second table on page0 is student strength breakdown
-            student_table = tables[1].extract()
-            # The header spans multiple lines, but columns align with keys:
-            columns = ["Male", "Female", "Total", "WithinState", "OutsideState", 
-                       "Abroad", "EconomicallyBackward", "SociallyChallenged", 
-                       "FeeReimb_State", "FeeReimb_Inst", "FeeReimb_Private", 
-                       "NoReimbursement"]
-            for row in student_table[1:]:
-                program = row[0]
-                values = row[1:]
-                rec = {"Institute": inst_name, "Program": program}
-                for col, val in zip(columns, values):
-                    # Improved handling of non-numeric values
-                    if val is not None and val.strip() and val.strip() != '-' and val.strip().isdigit():
-                        rec[col] = int(val.strip())
-                    else:
-                        rec[col] = None
-                strength_records.append(rec)
-        
-        # --- Placement & Higher Studies (UG/PG) ---
-        # Page0 table2 is UG 4-year placement; page1 tables for UG5Y, PG2Y, PG3Y
-        placement_pages = [pdf.pages[0], pdf.pages[1]] if len(pdf.pages) > 1 else [pdf.pages[0]]
-        # Identify and parse each placement table by checking header text
-        for page in placement_pages:
-            tbls = page.find_tables()
-            for tbl in tbls:
-                data = tbl.extract()
-                if not data or len(data) < 1:  # Check if data exists
-                    continue
-                    
-                header = data[0]
-                if len(header) > 0 and header[0].startswith("Academic Year"):
-                    # Determine program type by context in the PDF
-                    # For example, UG-4Y has caption on page0, UG-5Y on page1, etc.
-                    # Here we guess by number of intake columns or existing data.
-                    # For brevity, assume orders: UG4 (page0), UG5 (page1 first), PG2 (page1 second), PG3 (page1 third).
-                    # Use loop index or content to assign program.
-                    # Example for UG5:
-                    for row in data[1:]:
-                        if not row:  # Skip empty rows
-                            continue
-                            
-                        rec = {"Institute": inst_name}
-                        rec["AcademicYear"] = row[0] if len(row) > 0 else None
-                        
-                        # Safely access columns with length checks
-                        rec["FirstYearIntake"] = int(row[1]) if len(row) > 1 and row[1] and row[1].strip() != '-' and row[1].strip().isdigit() else None
-                        rec["FirstYearAdmitted"] = int(row[2]) if len(row) > 2 and row[2] and row[2].strip() != '-' and row[2].strip().isdigit() else None
-                        rec["GraduatingYear"] = row[5] if len(row) > 5 else None  # 2nd Academic Year in row
-                        rec["GraduatingStudents"] = int(row[6]) if len(row) > 6 and row[6] and row[6].strip() != '-' and row[6].strip().isdigit() else None
-                        rec["Placed"] = int(row[7]) if len(row) > 7 and row[7] and row[7].strip() != '-' and row[7].strip().isdigit() else None
-                        
-                        # Handle median salary which might have text in parentheses
-                        if len(row) > 8 and row[8] and row[8].strip() != '-':
-                            salary_parts = row[8].split("(")
-                            if salary_parts[0].strip().isdigit():
-                                rec["MedianSalary"] = int(salary_parts[0].strip())
-                            else:
-                                rec["MedianSalary"] = None
-                        else:
-                            rec["MedianSalary"] = None
-                            
-                        rec["HigherStudies"] = int(row[9]) if len(row) > 9 and row[9] and row[9].strip() != '-' and row[9].strip().isdigit() else None
-                        placement_records.append(rec)
-                    # (Repeat similarly for PG2Y, PG3Y using their specific table indices)
-        
-        # --- Ph.D. Data ---
-        # Page1 contains Ph.D student counts and graduations
-        if len(pdf.pages) > 1:
-            page1 = pdf.pages[1]
-            phd_tables = [tbl.extract() for tbl in page1.find_tables() if tbl.extract()[0][0].startswith("Ph.D")]
-            if phd_tables:  # Make sure we found a Ph.D table
-                phd_table = phd_tables[0]
-                # Parse total students - with error handling
-                if len(phd_table) > 3 and len(phd_table[2]) > 2 and phd_table[2][2] and phd_table[2][2].strip().isdigit():
-                    total_full = int(phd_table[2][2])
-                    phd_records.append({"Institute": inst_name, "Type": "FullTime_Total", "Count": total_full})
-                
-                if len(phd_table) > 3 and len(phd_table[3]) > 2 and phd_table[3][2] and phd_table[3][2].strip().isdigit():
-                    total_part = int(phd_table[3][2])
-                    phd_records.append({"Institute": inst_name, "Type": "PartTime_Total", "Count": total_part})
-                
-                # Parse graduates per year - with error handling
-                if len(phd_table) > 5:
-                    year_header = phd_table[5]  # e.g., ['', '2022-23', '2021-22', '2020-21']
-                    for row in phd_table[6:]:
-                        if len(row) > 0:
-                            mode = row[0]  # 'Full Time' or 'Part Time'
-                            for j, year in enumerate(year_header[1:], start=1):
-                                if j < len(row) and row[j] and row[j].strip() != '-':
-                                    try:
-                                        count = int(row[j])
-                                        phd_records.append({"Institute": inst_name, "Type": mode, "Year": year, "Graduated": count})
-                                    except ValueError:
-                                        # Skip if conversion fails
-                                        pass
-        
-        # --- Financial Resources ---
-        # Page2 tables: capital, operational, sponsored, consultancy
-        if len(pdf.pages) > 2:
-            page2 = pdf.pages[2]
-            for tbl in page2.find_tables():
-                data = tbl.extract()
-                if len(data) > 2 and data[0][0].startswith("Financial Year") and data[2][0].startswith("Annual Capital"):
-                    # Capital expenditures
-                    categories = [row[0] for row in data[3:]]
-                    amounts = data[3:]
-                    years = data[0][1:]
-                    for i, cat in enumerate(categories):
-                        for col_idx, year in enumerate(years, start=1):
-                            if 3+i < len(data) and col_idx < len(data[3+i]):
-                                amt = data[3+i][col_idx]
-                                if amt and amt.strip() != '-' and amt.strip().isdigit():
-                                    finance_capital.append({
-                                        "Institute": inst_name,
-                                        "Category": cat.strip(),
-                                        "Year": year,
-                                        "Amount": int(amt)
-                                    })
-                # Operational similar logic
-                if len(data) > 2 and data[0][0].startswith("Financial Year") and data[2][0].startswith("Annual Operational"):
-                    cats = [row[0] for row in data[3:]]
-                    years = data[0][1:]
-                    for i, cat in enumerate(cats):
-                        for col_idx, year in enumerate(years, start=1):
-                            if 3+i < len(data) and col_idx < len(data[3+i]):
-                                amt = data[3+i][col_idx]
-                                if amt and amt.strip() != '-' and amt.strip().isdigit():
-                                    finance_operational.append({
-                                        "Institute": inst_name,
-                                        "Category": cat.strip(),
-                                        "Year": year,
-                                        "Amount": int(amt)
-                                    })
-                # Sponsored Projects
-                if len(data) > 1 and data[0][0] == "Financial Year" and "Sponsored Projects" in data[1][0]:
-                    years = data[0][1:]
-                    for row in data[1:4]:
-                        if len(row) > 0:
-                            key = row[0]
-                            for i, year in enumerate(years, start=1):
-                                if i < len(row):
-                                    val = row[i]
-                                    if val and val.strip() != '-' and val.strip().isdigit():
-                                        rec = {"Institute": inst_name, "Type": key, "Year": year, "Value": int(val.strip())}
-                                        sponsored_records.append(rec)
-                                    else:
-                                        rec = {"Institute": inst_name, "Type": key, "Year": year, "Value": None}
-                                        sponsored_records.append(rec)
-                # Consultancy Projects
-                if len(data) > 1 and data[0][0] == "Financial Year" and "Consultancy Projects" in data[1][0]:
-                    years = data[0][1:]
-                    for row in data[1:4]:
-                        if len(row) > 0:
-                            key = row[0]
-                            for i, year in enumerate(years, start=1):
-                                if i < len(row):
-                                    val = row[i]
-                                    if val and val.strip() != '-' and val.strip().isdigit():
-                                        consultancy_records.append({
-                                            "Institute": inst_name, "Type": key, "Year": year, "Value": int(val.strip())
-                                        })
-                                    else:
-                                        consultancy_records.append({
-                                            "Institute": inst_name, "Type": key, "Year": year, "Value": None
-                                        })
-        
-        # --- Facilities for Physically Challenged ---
-        # Page3 may contain Q&A table (here simplified parse)
-        if len(pdf.pages) > 3:
-            page3 = pdf.pages[3]
-            for tbl in page3.find_tables():
-                cells = tbl.extract()
-                # e.g. if first row is a question about lifts/ramps:
-                if len(cells) > 0 and len(cells[0]) > 0 and cells[0][0].startswith("1. Do your institution buildings"):
-                    if len(cells[0]) > 1:
-                        has_lifts = cells[0][1]
-                        facilities_records.append({
-                            "Institute": inst_name,
-                            "Feature": "Lifts/Ramps in Buildings",
-                            "Available": has_lifts
-                        })
-                if len(cells) > 0 and len(cells[0]) > 2 and cells[0][2].startswith("2. Do you offer any separate cell"):
-                    if len(cells[0]) > 3:
-                        has_cell = cells[0][3]
-                        facilities_records.append({
-                            "Institute": inst_name,
-                            "Feature": "Special Facilities for Challenged",
-                            "Available": has_cell
-                        })
-            # --- Faculty Details ---
-            # Last table on page3: faculty count
-            for tbl in page3.find_tables():
-                cells = tbl.extract()
-                if len(cells) > 0 and len(cells[0]) > 0 and cells[0][0].startswith("Number of faculty"):
-                    if len(cells[0]) > 1 and cells[0][1] and cells[0][1].strip().isdigit():
-                        num_faculty = int(cells[0][1])
-                        faculty_records.append({"Institute": inst_name, "TotalFaculty": num_faculty})
-        
-        pdf.close()
+    except Exception as e:
+        result["error"] = str(e)
+    
+    result["seconds"] = time.perf_counter() - start
+    result["stages"] = dict(timer.totals)
+    return result
 
-        # Create XML structure
-        root = ET.Element("NIRF_Data")
-        
-        # Add institute information
-        institute = ET.SubElement(root, "Institute")
-        ET.SubElement(institute, "Name").text = inst_name
-        ET.SubElement(institute, "SourceFile").text = fname
-        
-        # Add sanctioned intake data
-        intake = ET.SubElement(root, "SanctionedIntake")
-        for record in intake_records:
-            entry = ET.SubElement(intake, "Entry")
-            for key, value in record.items():
-                if value is not None:  # Skip None values
-                    ET.SubElement(entry, key).text = str(value)
-        
-        # Add student strength data
-        strength = ET.SubElement(root, "StudentStrength")
-        for record in strength_records:
-            entry = ET.SubElement(strength, "Entry")
-            for key, value in record.items():
-                if value is not None:  # Skip None values
-                    ET.SubElement(entry, key).text = str(value)
-        
-        # Add placement data
-        placement = ET.SubElement(root, "PlacementData")
-        for record in placement_records:
-            entry = ET.SubElement(placement, "Entry")
-            for key, value in record.items():
-                if value is not None:  # Skip None values
-                    ET.SubElement(entry, key).text = str(value)
-        
-        # Add PhD data
-        phd = ET.SubElement(root, "PhDData")
-        for record in phd_records:
-            entry = ET.SubElement(phd, "Entry")
-            for key, value in record.items():
-                if value is not None:  # Skip None values
-                    ET.SubElement(entry, key).text = str(value)
-        
-        # Add financial data - capital expenditure
-        finance_cap = ET.SubElement(root, "CapitalExpenditure")
-        for record in finance_capital:
-            entry = ET.SubElement(finance_cap, "Entry")
-            for key, value in record.items():
-                if value is not None:  # Skip None values
-                    ET.SubElement(entry, key).text = str(value)
-        
-        # Add financial data - operational expenditure
-        finance_op = ET.SubElement(root, "OperationalExpenditure")
-        for record in finance_operational:
-            entry = ET.SubElement(finance_op, "Entry")
-            for key, value in record.items():
-                if value is not None:  # Skip None values
-                    ET.SubElement(entry, key).text = str(value)
-        
-        # Add sponsored projects data
-        sponsored = ET.SubElement(root, "SponsoredProjects")
-        for record in sponsored_records:
-            entry = ET.SubElement(sponsored, "Entry")
-            for key, value in record.items():
-                if value is not None:  # Skip None values
-                    ET.SubElement(entry, key).text = str(value)
-        
-        # Add consultancy projects data
-        consultancy = ET.SubElement(root, "ConsultancyProjects")
-        for record in consultancy_records:
-            entry = ET.SubElement(consultancy, "Entry")
-            for key, value in record.items():
-                if value is not None:  # Skip None values
-                    ET.SubElement(entry, key).text = str(value)
-        
-        # Add facilities data
-        facilities = ET.SubElement(root, "Facilities")
-        for record in facilities_records:
-            entry = ET.SubElement(facilities, "Entry")
-            for key, value in record.items():
-                if value is not None:  # Skip None values
-                    ET.SubElement(entry, key).text = str(value)
-        
-        # Add faculty data
-        faculty = ET.SubElement(root, "FacultyCount")
-        for record in faculty_records:
-            entry = ET.SubElement(faculty, "Entry")
-            for key, value in record.items():
-                if value is not None:  # Skip None values
-                    ET.SubElement(entry, key).text = str(value)
-        
-        # Create a new XML file name based on the PDF file name (without extension)
-        base_name = os.path.splitext(fname)[0]
-        xml_filename = os.path.join(xml_folder, f"{base_name}.xml")
-        
-        # Write to XML file with pretty formatting
-        with open(xml_filename, "w", encoding="utf-8") as f:
-            f.write(prettify(root))
-        
-        print(f"XML file created: {xml_filename}")
+def report_result(index, total, result):
+    """Print the progress lines for one processed PDF."""
+    print(f"\nProcessing PDF file {index}/{total}: {result['file']}")
+    if result["institute"] is not None:
+        print(f"Extracted institute name: {result['institute']}")
+    if result["error"] is not None:
+        print(f"Error processing {result['file']}: {result['error']}")
+    else:
+        if result["xml_file"] is not None:
+            print(f"XML file created: {result['xml_file']}")
+        if result["excel_file"] is not None:
+            print(f"Excel file created: {result['excel_file']}")
+
+def expected_outputs(args, fname, mongo_target):
+    """The manifest outputs a run with these arguments produces for fname."""
+    outputs = {}
+    if not args.no_xml:
+        outputs["xml"] = XMLSink(args.xml_dir).path_for(fname)
+    if args.excel_dir is not None:
+        outputs["excel"] = ExcelSink(args.excel_dir).path_for(fname)
+    if args.mongo:
+        outputs["mongo"] = mongo_target
+    return outputs
+
+def result_outputs(result):
+    """The manifest outputs of the files a successful conversion wrote."""
+    outputs = {}
+    if result["xml_file"] is not None:
+        outputs["xml"] = result["xml_file"]
+    if result["excel_file"] is not None:
+        outputs["excel"] = result["excel_file"]
+    return outputs
+
+def record_mongo_writes(manifest, fingerprints, unsettled, mongo_target, stored, failed):
+    """
+    Record the files whose MongoDB write is settled; unsettled maps the
+    files still waiting for their batch to their file outputs
+    """
+    for fname in stored:
+        outputs = unsettled.pop(fname)
+        outputs["mongo"] = mongo_target
+        manifest.record(fname, fingerprints[fname], outputs)
+    for fname in failed:
+        unsettled.pop(fname, None)
+        manifest.forget(fname)
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert NIRF PDF reports to XML")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes (default: 1, 0 = one per CPU core)")
+    parser.add_argument("--pdf-dir", default=pdf_folder, help="Directory containing the PDF files")
+    parser.add_argument("--xml-dir", default=xml_folder, help="Directory for the XML output files")
+    parser.add_argument("--manifest", default=None,
+                        help=f"Path of the extraction manifest (default: <xml-dir>/{MANIFEST_NAME})")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-extract every PDF even if the manifest says it is unchanged")
+    parser.add_argument("--minidom-compatible", action="store_true",
+                        help="Write XML byte-identical to the old minidom pretty-printer")
+    parser.add_argument("--whole-page-tables", action="store_true",
+                        help="Detect tables on whole pages instead of on the located section regions")
+    parser.add_argument("--profile", default=None, metavar="PATH",
+                        help="Time every extraction stage and section parser and write a JSON report to PATH")
+    parser.add_argument("--profile-top", type=int, default=5,
+                        help="Number of slowest files, sections and captures in the profile (default: 5)")
+    parser.add_argument("--profile-cprofile", action="store_true",
+                        help="Re-run the slowest files under cProfile and add the top functions to the profile")
+    parser.add_argument("--profile-tracemalloc", action="store_true",
+                        help="Re-run the slowest files under tracemalloc and add peak memory to the profile")
+    parser.add_argument("--excel-dir", default=None,
+                        help="Also write an Excel workbook per PDF into this directory")
+    parser.add_argument("--mongo", action="store_true",
+                        help="Also insert each parsed PDF into the MongoDB individuals collection "
+                             "and rebuild the master database")
+    parser.add_argument("--mongo-host", default="localhost", help="MongoDB host (default: localhost)")
+    parser.add_argument("--mongo-port", type=int, default=27017, help="MongoDB port (default: 27017)")
+    parser.add_argument("--mongo-db", default="nirf_database", help="MongoDB database (default: nirf_database)")
+    parser.add_argument("--mongo-batch-size", type=int, default=500,
+                        help="Documents per MongoDB bulk write (default: 500)")
+    parser.add_argument("--no-xml", action="store_true",
+                        help="Do not write XML files; needs --mongo or --excel-dir")
+    args = parser.parse_args()
+    if args.no_xml and not (args.mongo or args.excel_dir):
+        parser.error("--no-xml needs --mongo or --excel-dir")
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    # Ensure the XML folder exists
+    if not os.path.exists(args.xml_dir):
+        os.makedirs(args.xml_dir)
+        print(f"Created output directory: {args.xml_dir}")
+    if args.excel_dir and not os.path.exists(args.excel_dir):
+        os.makedirs(args.excel_dir)
+        print(f"Created output directory: {args.excel_dir}")
+
+    # Get all PDF files in the folder
+    pdf_files = [f for f in os.listdir(args.pdf_dir) if f.lower().endswith(".pdf")]
+    pdf_files.sort()  # Sort to ensure consistent processing order
+
+    if not pdf_files:
+        print(f"No PDF files found in the {args.pdf_dir} folder.")
+        return
+
+    print(f"Found {len(pdf_files)} PDF files")
+
+    # Skip files whose content, size and parser version match the manifest
+    start = time.perf_counter()
+    # The output layout is part of the version so switching --minidom-compatible
+    # rewrites existing files
+    output_version = PARSER_VERSION + ("-minidom" if args.minidom_compatible else "")
+    manifest = ExtractionManifest(args.manifest or os.path.join(args.xml_dir, MANIFEST_NAME), output_version)
+    mongo_target = f"mongodb://{args.mongo_host}:{args.mongo_port}/{args.mongo_db}/individuals"
+    fingerprints = {}
+    to_process = []
+    skipped = 0
+    for fname in pdf_files:
+        is_current, fingerprint = manifest.check(fname, os.path.join(args.pdf_dir, fname),
+                                                 expected_outputs(args, fname, mongo_target))
+        if is_current and not args.force:
+            skipped += 1
+            continue
+        fingerprints[fname] = fingerprint
+        to_process.append(fname)
+
+    print(f"Skipping {skipped} unchanged PDF files, {len(to_process)} to process")
+    if not to_process:
+        manifest.save()
+        return
+
+    mongo_sink = None
+    client = None
+    if args.mongo:
+        from xml_to_mongodb import connect_to_mongodb
+        db, client = connect_to_mongodb(args.mongo_host, args.mongo_port, args.mongo_db)
+        if db is None:
+            print("Failed to connect to MongoDB.")
+            return
+        mongo_sink = MongoSink(db, batch_size=args.mongo_batch_size)
+
+    convert = partial(convert_pdf_to_xml, pdf_dir=args.pdf_dir, xml_dir=args.xml_dir,
+                      compat=args.minidom_compatible, excel_dir=args.excel_dir,
+                      build_document=mongo_sink is not None, use_regions=not args.whole_page_tables,
+                      profile=args.profile is not None, write_xml=not args.no_xml)
+    failed = 0
+    # Converted files whose MongoDB batch has not been written yet
+    unsettled = {}
+    cache_totals = {}
+    section_totals = {}
+    coercion_totals = {}
+    failure_totals = {}
+    profiled = []
+
+    if workers == 1:
+        results = map(convert, to_process)
+        executor = None
+    else:
+        print(f"Using {workers} worker processes")
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # map() yields results in submission order, so the report stays sorted
+        # by file name no matter which worker finishes first
+        results = executor.map(convert, to_process, chunksize=1)
+
+    try:
+        for pdf_index, result in enumerate(results):
+            report_result(pdf_index + 1, len(to_process), result)
+            if result["error"] is not None:
+                failed += 1
+                manifest.forget(result["file"])
+            elif mongo_sink is None:
+                manifest.record(result["file"], fingerprints[result["file"]], result_outputs(result))
+            else:
+                # Recorded once MongoDB confirms the write
+                unsettled[result["file"]] = result_outputs(result)
+                record_mongo_writes(manifest, fingerprints, unsettled, mongo_target,
+                                    *mongo_sink.add_document(result["document"]))
+            merge_cache_stats(cache_totals, result["cache_stats"])
+            merge_cache_stats(section_totals, result["section_seconds"])
+            merge_cache_stats(coercion_totals, result["coercion_stats"])
+            merge_cache_stats(failure_totals, result["coercion_failures"])
+            if args.profile is not None and result["error"] is None:
+                profiled.append({"file": result["file"], "seconds": result["seconds"],
+                                 "stages": result["stages"], "sections": result["section_seconds"]})
         
-    except Exception as e:
-        print(f"Error processing {fname}: {str(e)}")
+        if mongo_sink is not None:
+            record_mongo_writes(manifest, fingerprints, unsettled, mongo_target, *mongo_sink.close())
+            writer = mongo_sink.writer
+            print(f"\nWrote {writer.written} documents to MongoDB, {writer.skipped} unchanged, "
+                  f"{writer.failed} failed ({writer.write_seconds:.2f}s in bulk writes)")
+            from xml_to_mongodb import refresh_master_database
+            refresh_master_database(mongo_sink.db, mongo_sink.collection_name, 'master_database',
+                                    writer.changed_institutes, writer.written + writer.skipped)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        # Save even after an interruption so finished files are not redone
+        manifest.save()
+        if client is not None:
+            client.close()
+
+    elapsed = time.perf_counter() - start
+    rate = len(to_process) / elapsed if elapsed > 0 else 0.0
+    print(f"\nProcessed {len(to_process)} PDF files ({len(to_process) - failed} succeeded, {failed} failed), "
+          f"skipped {skipped} unchanged, in {elapsed:.2f}s ({rate:.2f} files/sec) using {workers} worker(s)")
+    print(f"Page cache: {format_cache_stats(cache_totals)}")
+    if section_totals:
+        print("Section time: " + ", ".join(f"{name} {seconds:.2f}s"
+                                           for name, seconds in section_totals.items()))
+
+    if coercion_totals:
+        failures = ", ".join(f"{name} {count}" for name, count in failure_totals.items())
+        print(f"Cell coercion: {format_coercion_stats(coercion_totals)}" + (f" ({failures})" if failures else ""))
+
+    if args.profile is not None:
+        write_profile(args, profiled, convert)
+
+def write_profile(args, profiled, convert):
+    """Write the --profile JSON report, capturing the slowest files if requested."""
+    captures = {}
+    if args.profile_cprofile or args.profile_tracemalloc:
+        slowest = sorted(profiled, key=lambda f: f["seconds"], reverse=True)[:args.profile_top]
+        for entry in slowest:
+            print(f"Capturing profile of {entry['file']}")
+            # Re-run in this process; the output files are rewritten unchanged
+            captures[entry["file"]] = capture_profile(partial(convert, entry["file"]),
+                                                      args.profile_cprofile, args.profile_tracemalloc)
+
+    report = build_profile_report(profiled, args.profile_top, captures)
+    with open(args.profile, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Profile written to {args.profile}")
+    dominant = report["dominant"]
+    print("Slowest files: " + ", ".join(f"{f['file']} {f['seconds']:.2f}s" for f in dominant["files"]))
+    print("Slowest stages: " + ", ".join(f"{s['name']} {s['share']:.0%}" for s in dominant["stages"]))
+
+if __name__ == "__main__":
+    main()
 
 # print("\nAll PDF files have been processed and saved to the All-XML folder.")
 
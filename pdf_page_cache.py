@@ -0,0 +1,171 @@
+from extraction_profiler import NULL_TIMER
+
+# Words whose tops are this close (in points) belong to the same text line
+LINE_TOLERANCE = 3
+
+
+def _group_lines(words):
+    """Join extract_words output into (top, text) lines, top to bottom."""
+    lines = []
+    current_top = None
+    current_words = []
+    for word in sorted(words, key=lambda w: (round(w['top']), w['x0'])):
+        if current_top is not None and abs(word['top'] - current_top) > LINE_TOLERANCE:
+            lines.append((current_top, " ".join(w['text'] for w in sorted(current_words, key=lambda w: w['x0']))))
+            current_words = []
+            current_top = None
+        if current_top is None:
+            current_top = word['top']
+        current_words.append(word)
+    if current_words:
+        lines.append((current_top, " ".join(w['text'] for w in sorted(current_words, key=lambda w: w['x0']))))
+    return lines
+
+
+class PageCache:
+    """
+    Memoize the expensive pdfplumber work for one open PDF.
+
+    Table detection (find_tables) and text extraction each walk every character
+    on a page, and the section parsers used to repeat them for the same page.
+    The cache runs them at most once per page and hands every parser the same
+    extracted table data (lists of rows). Table detection restricted to a
+    region of a page is memoized per region.
+
+    Pass an extraction_profiler.StageTimer as timer to time the pdfplumber
+    calls as find_tables, extract, extract_words and extract_text stages.
+    """
+
+    def __init__(self, pdf, timer=NULL_TIMER):
+        self.pdf = pdf
+        self.timer = timer
+        self._tables = {}
+        self._region_tables = {}
+        self._text = {}
+        self._lines = {}
+        self._region_lines = {}
+        self.stats = {
+            'find_tables_runs': 0,
+            'find_tables_saved': 0,
+            'table_extracts': 0,
+            'table_extracts_saved': 0,
+            'region_tables_runs': 0,
+            'region_tables_saved': 0,
+            'extract_text_runs': 0,
+            'extract_text_saved': 0,
+            'extract_words_runs': 0,
+        }
+
+    def __len__(self):
+        return len(self.pdf.pages)
+
+    def tables(self, page_index):
+        """Return the extracted tables of a page, running find_tables only once."""
+        if page_index in self._tables:
+            tables = self._tables[page_index]
+            self.stats['find_tables_saved'] += 1
+            self.stats['table_extracts_saved'] += len(tables)
+            return tables
+
+        page = self.pdf.pages[page_index]
+        with self.timer.stage("find_tables"):
+            found = page.find_tables()
+        with self.timer.stage("extract"):
+            tables = [tbl.extract() for tbl in found]
+        self.stats['find_tables_runs'] += 1
+        self.stats['table_extracts'] += len(tables)
+        self._tables[page_index] = tables
+        return tables
+
+    def region_tables(self, page_index, bbox):
+        """
+        Return the extracted tables inside bbox (x0, top, x1, bottom) of a page.
+
+        The page is cropped before detection, so only the objects of that
+        region are considered.
+        """
+        key = (page_index, bbox)
+        if key in self._region_tables:
+            tables = self._region_tables[key]
+            self.stats['region_tables_saved'] += 1
+            self.stats['table_extracts_saved'] += len(tables)
+            return tables
+
+        with self.timer.stage("find_tables"):
+            found = self.pdf.pages[page_index].crop(bbox).find_tables()
+        with self.timer.stage("extract"):
+            tables = [tbl.extract() for tbl in found]
+        self.stats['region_tables_runs'] += 1
+        self.stats['table_extracts'] += len(tables)
+        self._region_tables[key] = tables
+        return tables
+
+    def page_bbox(self, page_index):
+        """Return the (x0, top, x1, bottom) bounding box of a page."""
+        return tuple(self.pdf.pages[page_index].bbox)
+
+    def lines(self, page_index):
+        """
+        Return the text lines of a page as (top, text) pairs, top to bottom.
+
+        Built from one extract_words pass per page, so locating the headings
+        of a page does not need a separate text pass.
+        """
+        if page_index in self._lines:
+            return self._lines[page_index]
+
+        with self.timer.stage("extract_words"):
+            words = self.pdf.pages[page_index].extract_words()
+        self.stats['extract_words_runs'] += 1
+        lines = _group_lines(words)
+        self._lines[page_index] = lines
+        return lines
+
+    def region_lines(self, page_index, bbox):
+        """
+        Return the text lines inside bbox (x0, top, x1, bottom) of a page.
+
+        The page is cut down to the words inside bbox (within_bbox) before
+        extract_words runs, so only the characters of that region are read.
+        """
+        key = (page_index, bbox)
+        if key in self._region_lines:
+            return self._region_lines[key]
+
+        with self.timer.stage("extract_words"):
+            words = self.pdf.pages[page_index].within_bbox(bbox).extract_words()
+        self.stats['extract_words_runs'] += 1
+        lines = _group_lines(words)
+        self._region_lines[key] = lines
+        return lines
+
+    def text(self, page_index):
+        """Return the text of a page, running extract_text only once."""
+        if page_index in self._text:
+            self.stats['extract_text_saved'] += 1
+            return self._text[page_index]
+
+        with self.timer.stage("extract_text"):
+            text = self.pdf.pages[page_index].extract_text() or ""
+        self.stats['extract_text_runs'] += 1
+        self._text[page_index] = text
+        return text
+
+
+def merge_cache_stats(total, stats):
+    """Add the counters of one PageCache into a running total dict."""
+    for key, value in stats.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+
+def format_cache_stats(stats):
+    """Return a one-line summary of how much detection work the cache saved."""
+    return (f"find_tables: {stats.get('find_tables_runs', 0)} run, "
+            f"{stats.get('find_tables_saved', 0)} reused; "
+            f"table extract: {stats.get('table_extracts', 0)} run, "
+            f"{stats.get('table_extracts_saved', 0)} reused; "
+            f"region find_tables: {stats.get('region_tables_runs', 0)} run, "
+            f"{stats.get('region_tables_saved', 0)} reused; "
+            f"extract_text: {stats.get('extract_text_runs', 0)} run, "
+            f"{stats.get('extract_text_saved', 0)} reused")
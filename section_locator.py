@@ -0,0 +1,99 @@
+"""
+Locate NIRF report sections on a page and detect tables only inside them.
+
+Running find_tables on a whole page considers every line and character on
+it, and the parsers then pick the table they need by index or by checking
+its header. A SectionLocator reads each page's heading lines once (one
+extract_words pass through the PageCache), finds the anchor heading of every
+section, and crops the page from a section's first anchor down to the next
+heading of a different section before running table detection.
+
+When a section's anchor is not found on a page, the whole-page tables are
+used instead, so reports with unexpected headings parse as before.
+"""
+
+# Heading text that starts each section. Matching ignores case and whitespace.
+SECTION_ANCHORS = {
+    "SanctionedIntake": "Sanctioned (Approved) Intake",
+    "StudentStrength": "Total Actual Student Strength",
+    "PlacementData": "Placement & higher studies",
+    "PhDData": "Ph.D Student Details",
+    "CapitalExpenditure": "Utilised Amount for the Capital expenditure",
+    "OperationalExpenditure": "Utilised Amount for the Operational expenditure",
+    "SponsoredProjects": "Sponsored Research Details",
+    "ConsultancyProjects": "Consultancy Project Details",
+    "Facilities": "PCS Facilities",
+    "FacultyCount": "Faculty Details",
+}
+
+# Fraction of page 0 (from the top) that holds the institute name
+INSTITUTE_BAND = 0.25
+
+
+def _squash(text):
+    """Lower-case text with all whitespace removed, for anchor matching."""
+    return "".join(text.split()).casefold()
+
+
+_SQUASHED_ANCHORS = [(section, _squash(anchor)) for section, anchor in SECTION_ANCHORS.items()]
+
+
+class SectionLocator:
+    """Find section regions on the pages of one PDF, see the module docstring."""
+
+    def __init__(self, cache, use_regions=True):
+        self.cache = cache
+        self.use_regions = use_regions
+        self._anchors = {}
+
+    def anchors(self, page_index):
+        """Return the (top, section) anchor headings of a page, top to bottom."""
+        if page_index not in self._anchors:
+            found = []
+            for top, text in self.cache.lines(page_index):
+                squashed = _squash(text)
+                for section, anchor in _SQUASHED_ANCHORS:
+                    if anchor in squashed:
+                        found.append((top, section))
+                        break
+            self._anchors[page_index] = found
+        return self._anchors[page_index]
+
+    def region(self, page_index, section):
+        """
+        Return the (x0, top, x1, bottom) bbox of a section on a page, or None
+        if the section's anchor is not on that page.
+        """
+        anchors = self.anchors(page_index)
+        tops = [top for top, name in anchors if name == section]
+        if not tops:
+            return None
+        x0, page_top, x1, page_bottom = self.cache.page_bbox(page_index)
+        start = tops[0]
+        # The region ends at the next heading that belongs to another section
+        ends = [top for top, name in anchors if top > start and name != section]
+        return (x0, max(start, page_top), x1, min(ends) if ends else page_bottom)
+
+    def tables(self, page_index, section):
+        """
+        Return (tables, in_region) for a section on a page.
+
+        in_region is False when the whole-page tables are returned because
+        the section's anchor was not found (or regions are disabled).
+        """
+        if self.use_regions:
+            bbox = self.region(page_index, section)
+            if bbox is not None:
+                return self.cache.region_tables(page_index, bbox), True
+        return self.cache.tables(page_index), False
+
+    def top_band_lines(self, page_index=0, band=INSTITUTE_BAND):
+        """
+        Return the text lines in the top band of a page.
+
+        Only the band is cropped out and read; the rest of the page is not
+        touched.
+        """
+        x0, page_top, x1, page_bottom = self.cache.page_bbox(page_index)
+        bbox = (x0, page_top, x1, page_top + (page_bottom - page_top) * band)
+        return [text for _, text in self.cache.region_lines(page_index, bbox)]
@@ -0,0 +1,100 @@
+from xml.dom import minidom
+
+# Older minidom releases also escape double quotes in text nodes; compat mode
+# follows whatever the running interpreter's toprettyxml() does
+_MINIDOM_ESCAPES_QUOTES = minidom.Document().createTextNode('"').toxml() != '"'
+
+
+class StreamingXMLWriter:
+    """
+    Write indented XML straight to an open text file handle.
+
+    Replaces building a whole ElementTree and pretty-printing it through
+    minidom: elements are written as soon as they are produced, so memory use
+    is bounded by the section being written instead of the whole document.
+
+    With compat=True the output is byte-identical to the old
+    prettify()/minidom.toprettyxml(indent="  ") output: same XML declaration,
+    same escaping and the same "<Tag/>" form for empty elements. With
+    compat=False a standard declaration with the encoding is written and only
+    &, < and > are escaped.
+    """
+
+    def __init__(self, stream, indent="  ", compat=False):
+        self.stream = stream
+        self.indent = indent
+        self.compat = compat
+        self._stack = []
+        # True while the innermost start tag has not been written yet, so an
+        # element that never gets a child can still be written as <Tag/>
+        self._pending = False
+        if compat:
+            stream.write('<?xml version="1.0" ?>\n')
+        else:
+            stream.write('<?xml version="1.0" encoding="utf-8"?>\n')
+
+    def _escape(self, text):
+        if "&" in text:
+            text = text.replace("&", "&amp;")
+        if "<" in text:
+            text = text.replace("<", "&lt;")
+        if self.compat:
+            # minidom re-parses the serialized tree, which normalizes line
+            # endings, and may escape quotes in text nodes as well
+            if "\r" in text:
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+            if _MINIDOM_ESCAPES_QUOTES and '"' in text:
+                text = text.replace('"', "&quot;")
+        if ">" in text:
+            text = text.replace(">", "&gt;")
+        return text
+
+    def _flush_pending(self):
+        if self._pending:
+            depth = len(self._stack) - 1
+            self.stream.write(f"{self.indent * depth}<{self._stack[-1]}>\n")
+            self._pending = False
+
+    def start(self, tag):
+        """Open an element that will contain child elements."""
+        self._flush_pending()
+        self._stack.append(tag)
+        self._pending = True
+
+    def end(self):
+        """Close the innermost open element."""
+        tag = self._stack.pop()
+        if self._pending:
+            self.stream.write(f"{self.indent * len(self._stack)}<{tag}/>\n")
+            self._pending = False
+        else:
+            self.stream.write(f"{self.indent * len(self._stack)}</{tag}>\n")
+
+    def element(self, tag, text=None):
+        """Write a leaf element with optional text content."""
+        self._flush_pending()
+        prefix = self.indent * len(self._stack)
+        if text:
+            self.stream.write(f"{prefix}<{tag}>{self._escape(text)}</{tag}>\n")
+        else:
+            self.stream.write(f"{prefix}<{tag}/>\n")
+
+    def section(self, tag, records):
+        """
+        Write a section of <Entry> elements, one per record dict.
+
+        None values are skipped, matching the ElementTree code it replaces.
+        """
+        self.start(tag)
+        for record in records:
+            self.start("Entry")
+            for key, value in record.items():
+                if value is not None:  # Skip None values
+                    self.element(key, str(value))
+            self.end()
+        self.end()
+
+    def close(self):
+        """Close every element that is still open."""
+        while self._stack:
+            self.end()
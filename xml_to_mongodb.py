@@ -1,112 +1,194 @@
 import xml.etree.ElementTree as ET
+import bson
 import pymongo
 import sys
 import os
 import glob
+import time
+import json
+import hashlib
+import argparse
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from tqdm import tqdm
+from master_queries import ensure_master_indexes
+from master_rollups import refresh_rollups
+
+
+# Section element names in a NIRF XML file
+SECTIONS = ['SanctionedIntake', 'StudentStrength', 'PlacementData', 
+            'PhDData', 'CapitalExpenditure', 'OperationalExpenditure', 
+            'SponsoredProjects', 'ConsultancyProjects', 'Facilities', 'FacultyCount']
+
+# Document fields that are not data sections
+NON_SECTION_FIELDS = ['_id', 'metadata', 'institute']
+
+# Define field name mappings for standardization
+FIELD_MAPPINGS = {
+    # Common misspellings or variations
+    'acadmic_year': 'academic_year',
+    'academicyear': 'academic_year',
+    'acad_year': 'academic_year',
+    'year': 'academic_year',
+    'program': 'program_name',
+    'programname': 'program_name',
+    'prog': 'program_name',
+    'dept': 'department',
+    'department': 'department',
+    'male': 'male_count',
+    'female': 'female_count',
+    'total': 'total_count',
+    'approved_intake': 'approved_intake',
+    'approvedintake': 'approved_intake',
+    'sanctioned_intake': 'approved_intake',
+    'median_salary': 'median_salary',
+    'mediansalary': 'median_salary',
+    'salary': 'median_salary'
+}
+
+
+# XML tag -> standardized field name, filled as tags are seen
+_field_names = {}
+
+# Characters removed before checking for a number: thousands separators and
+# currency symbols, then the sign and decimal point
+_NUMBER_NOISE = str.maketrans('', '', ',₹$')
+_NUMBER_MARKS = str.maketrans('', '', '-.')
+
+
+def standardize_field_name(tag):
+    """
+    Return the standardized document field name for an XML tag
+    """
+    field_name = _field_names.get(tag)
+    if field_name is None:
+        field_name = tag.lower().strip()
+        # Apply mapping if available
+        field_name = FIELD_MAPPINGS.get(field_name, field_name)
+        _field_names[tag] = field_name
+    return field_name
+
+
+def convert_text_value(text):
+    """
+    Convert the text of an XML element to int, float or a stripped string
+    """
+    if not text:
+        return None
+    stripped = text.strip()
+    # Remove commas, currency symbols, etc.
+    cleaned_text = stripped.translate(_NUMBER_NOISE).strip()
+    
+    # Check if it's a number
+    if cleaned_text and cleaned_text.translate(_NUMBER_MARKS).isdigit():
+        # Convert to int or float as appropriate
+        try:
+            if '.' in cleaned_text:
+                return float(cleaned_text)
+            return int(cleaned_text)
+        except ValueError:
+            return text
+    return stripped
+
+
+def unnamed_college_id(name):
+    """
+    college_id of a college whose report has no ID: a hash of the name with
+    whitespace collapsed and case folded, the same in every process
+    """
+    normalized = ' '.join(name.split()).casefold()
+    return 'unnamed_' + hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:12]
+
+
+def build_institute_info(name, source_file, id_source_path):
+    """
+    Build the 'institute' sub-document, deriving college_id from the name or file name
+
+    Without an ID the master builds use unnamed_id, see unnamed_college_id.
+    """
+    institute = {
+        'name': name,
+        'source_file': source_file
+    }
+    
+    # Extract college ID from name if available
+    if name:
+        # Try to extract ID from format like "College Name [ID]"
+        if '[' in name and ']' in name:
+            college_id = name.split('[')[1].split(']')[0]
+            institute['college_id'] = college_id
+        # Try to extract ID from filename if available
+        elif os.path.basename(id_source_path).startswith(tuple([str(i).zfill(3) for i in range(1, 101)])):
+            file_id = os.path.basename(id_source_path).split('-')[0]
+            institute['college_id'] = file_id
+        else:
+            institute['unnamed_id'] = unnamed_college_id(name)
+    return institute
+
+
+def _entry_data(entry, values):
+    """Field dict of an Entry element; values caches converted text, cells repeat a lot"""
+    entry_data = {}
+    for child in entry:
+        text = child.text
+        value = values.get(text, values)
+        if value is values:
+            value = values[text] = convert_text_value(text)
+        # Standardize field name and convert numeric values
+        entry_data[standardize_field_name(child.tag)] = value
+    return entry_data
 
 
 def parse_xml_to_dict(xml_file):
     """
     Parse XML file and convert it to a Python dictionary with standardized structure
+
+    The file is read with iterparse: each Entry is converted when its element
+    closes and processed elements are removed from the tree, so a large
+    report is never held in memory as a whole.
     """
     try:
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
+        institute = None
+        sections = {}
+        entries = None  # entries of the section being read
+        values = {}
+        path = []
         
-        # Create main document
-        nirf_data = {}
-        
-        # Extract Institute information
-        institute_elem = root.find('Institute')
-        if institute_elem is not None:
-            nirf_data['institute'] = {
-                'name': institute_elem.findtext('Name'),
-                'source_file': institute_elem.findtext('SourceFile')
-            }
+        for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+            if event == 'start':
+                path.append(elem)
+                # Only the first element of each section is read
+                if len(path) == 2 and elem.tag in SECTIONS and elem.tag not in sections:
+                    entries = sections[elem.tag] = []
+                continue
             
-            # Extract college ID from name if available
-            name = institute_elem.findtext('Name')
-            if name:
-                # Try to extract ID from format like "College Name [ID]"
-                if '[' in name and ']' in name:
-                    college_id = name.split('[')[1].split(']')[0]
-                    nirf_data['institute']['college_id'] = college_id
-                # Try to extract ID from filename if available
-                elif os.path.basename(xml_file).startswith(tuple([str(i).zfill(3) for i in range(1, 101)])):
-                    file_id = os.path.basename(xml_file).split('-')[0]
-                    nirf_data['institute']['college_id'] = file_id
+            path.pop()
+            depth = len(path)
+            if depth == 2 and entries is not None and elem.tag == 'Entry':
+                entry_data = _entry_data(elem, values)
+                # Only add entries with actual data
+                if entry_data:
+                    entries.append(entry_data)
+                path[1].remove(elem)
+            elif depth == 1:
+                if elem.tag == 'Institute' and institute is None:
+                    # Extract Institute information
+                    institute = build_institute_info(elem.findtext('Name'), elem.findtext('SourceFile'),
+                                                     xml_file)
+                entries = None
+                path[0].remove(elem)
         
-        # Process each section with standardized field names
-        sections = ['SanctionedIntake', 'StudentStrength', 'PlacementData', 
-                   'PhDData', 'CapitalExpenditure', 'OperationalExpenditure', 
-                   'SponsoredProjects', 'ConsultancyProjects', 'Facilities', 'FacultyCount']
-        
-        # Define field name mappings for standardization
-        field_mappings = {
-            # Common misspellings or variations
-            'acadmic_year': 'academic_year',
-            'academicyear': 'academic_year',
-            'acad_year': 'academic_year',
-            'year': 'academic_year',
-            'program': 'program_name',
-            'programname': 'program_name',
-            'prog': 'program_name',
-            'dept': 'department',
-            'department': 'department',
-            'male': 'male_count',
-            'female': 'female_count',
-            'total': 'total_count',
-            'approved_intake': 'approved_intake',
-            'approvedintake': 'approved_intake',
-            'sanctioned_intake': 'approved_intake',
-            'median_salary': 'median_salary',
-            'mediansalary': 'median_salary',
-            'salary': 'median_salary'
-        }
-        
-        for section in sections:
-            section_elem = root.find(section)
-            if section_elem is not None:
-                entries = []
-                for entry in section_elem.findall('Entry'):
-                    entry_data = {}
-                    for child in entry:
-                        # Standardize field name
-                        field_name = child.tag.lower().strip()
-                        # Apply mapping if available
-                        field_name = field_mappings.get(field_name, field_name)
-                        
-                        # Try to convert numeric values
-                        try:
-                            # Handle different number formats
-                            if child.text:
-                                text = child.text.strip()
-                                # Remove commas, currency symbols, etc.
-                                cleaned_text = text.replace(',', '').replace('₹', '').replace('$', '').strip()
-                                
-                                # Check if it's a number
-                                if cleaned_text and cleaned_text.replace('-', '').replace('.', '').isdigit():
-                                    # Convert to int or float as appropriate
-                                    if '.' in cleaned_text:
-                                        entry_data[field_name] = float(cleaned_text)
-                                    else:
-                                        entry_data[field_name] = int(cleaned_text)
-                                else:
-                                    entry_data[field_name] = text
-                            else:
-                                entry_data[field_name] = None
-                        except (ValueError, TypeError):
-                            entry_data[field_name] = child.text
-                    
-                    # Only add entries with actual data
-                    if entry_data:
-                        entries.append(entry_data)
-                
+        # Create main document, sections in the standard order
+        nirf_data = {}
+        if institute is not None:
+            nirf_data['institute'] = institute
+        for section in SECTIONS:
+            if section in sections:
                 # Use standardized section names (lowercase)
-                section_key = section.lower()
-                nirf_data[section_key] = entries
+                nirf_data[section.lower()] = sections[section]
         
         return nirf_data
     
@@ -142,42 +224,500 @@ def connect_to_mongodb(host='localhost', port=27017, db_name='nirf_database'):
         return None, None
 
 
+def _content_hash(value):
+    """Hash of a JSON-like value that does not depend on dict key order"""
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def section_hashes(data):
+    """Content hash of every data section of a college document"""
+    return {section: _content_hash(value) for section, value in data.items()
+            if section not in NON_SECTION_FIELDS}
+
+
+def individual_document_id(institute):
+    """
+    Document ID of a college document, stable across re-imports of the same report
+    """
+    source_file = os.path.splitext(institute.get('source_file') or 'unknown')[0]
+    college_id = institute.get('college_id')
+    if college_id:
+        # Use college_id as part of the document ID for better organization
+        return f"individual_{college_id}_{source_file}"
+    return f"individual_{source_file}"
+
+
+def prepare_individual_document(data):
+    """
+    Add import metadata, content hashes and the document ID to a parsed college document
+    """
+    institute = data.get('institute', {})
+    hashes = section_hashes(data)
+    
+    # Add metadata
+    data['metadata'] = {
+        'imported_at': datetime.now(),
+        'source_file': institute.get('source_file', 'unknown'),
+        'section_hashes': hashes,
+        'content_hash': _content_hash({'institute': institute, 'sections': hashes})
+    }
+    data['_id'] = individual_document_id(institute)
+    return data
+
+
 def insert_individual_data(db, data, collection_name='individuals'):
     """
-    Insert individual college data into MongoDB collection
+    Insert or update individual college data in a MongoDB collection
+
+    Returns the document ID, also when the stored document was already up to date.
     """
+    doc = prepare_individual_document(data)
+    written, skipped, failures = write_individual_batch(db, [doc], collection_name)
+    for source_file, message in failures:
+        print(f"MongoDB error for {source_file}: {message}")
+    return doc['_id'] if written or skipped else None
+
+
+def _individual_write(doc, stored):
+    """
+    Return the write that brings the stored version of doc up to date, or
+    None if it already is. stored holds the stored document's metadata, or
+    None if there is no stored document.
+    """
+    if stored is None or 'section_hashes' not in stored:
+        return pymongo.ReplaceOne({'_id': doc['_id']}, doc, upsert=True)
+    if stored.get('content_hash') == doc['metadata']['content_hash']:
+        return None
+    
+    # Only rewrite the sections whose content changed
+    stored_hashes = stored['section_hashes']
+    new_hashes = doc['metadata']['section_hashes']
+    update = {'$set': {'institute': doc.get('institute', {}), 'metadata': doc['metadata']}}
+    for section, section_hash in new_hashes.items():
+        if stored_hashes.get(section) != section_hash:
+            update['$set'][section] = doc[section]
+    removed = [section for section in stored_hashes if section not in new_hashes]
+    if removed:
+        update['$unset'] = {section: '' for section in removed}
+    return pymongo.UpdateOne({'_id': doc['_id']}, update)
+
+
+# Raised by the BSON encoder for a document MongoDB cannot store, e.g. an
+# integer wider than 8 bytes; one such document fails a whole bulk_write call
+ENCODING_ERRORS = (bson.errors.BSONError, OverflowError)
+
+
+def write_individual_batch(db, docs, collection_name='individuals'):
+    """
+    Upsert prepared college documents whose content changed, with one unordered bulk_write.
+
+    The content hashes of the stored documents are read in one query; a
+    document with the same content hash is skipped, a changed one only has its
+    changed sections rewritten, and a new one is inserted. Unordered writes
+    keep going after a failed document, so one bad document does not lose the
+    rest of the batch. A batch the BSON encoder rejects is written again one
+    document at a time, so only the documents that cannot be encoded fail.
+
+    Returns (written documents, skipped count, failures), where failures is a
+    list of (source file, error message) pairs.
+    """
+    if not docs:
+        return [], 0, []
+    collection = db[collection_name]
     try:
-        # Get or create collection
-        collection = db[collection_name]
-        
-        # Add metadata
-        data['metadata'] = {
-            'imported_at': datetime.now(),
-            'source_file': data.get('institute', {}).get('source_file', 'unknown')
-        }
+        stored = collection.find(*stored_hashes_query(docs))
+        writes, changed = plan_individual_writes(docs, stored)
+    except pymongo.errors.PyMongoError as e:
+        return [], 0, [(doc['metadata']['source_file'], str(e)) for doc in docs]
+    
+    skipped = len(docs) - len(changed)
+    if not writes:
+        return [], skipped, []
+    
+    try:
+        collection.bulk_write(writes, ordered=False)
+        return changed, skipped, []
+    except ENCODING_ERRORS:
+        written, failures = write_one_by_one(collection, writes, changed)
+        return written, skipped, failures
+    except pymongo.errors.PyMongoError as e:
+        written, failures = bulk_write_failures(e, changed)
+        return written, skipped, failures
+
+
+def write_one_by_one(collection, writes, changed):
+    """
+    Return (written documents, failures) after applying each of writes on
+    its own. The writes are upserts and $set updates, so repeating one a
+    failed bulk_write already sent is harmless.
+    """
+    written = []
+    failures = []
+    for write, doc in zip(writes, changed):
+        try:
+            collection.bulk_write([write], ordered=False)
+            written.append(doc)
+        except (pymongo.errors.PyMongoError, *ENCODING_ERRORS) as e:
+            failures.append((doc['metadata']['source_file'], str(e)))
+    return written, failures
+
+
+def stored_hashes_query(docs):
+    """(filter, projection) reading the stored content hashes of docs"""
+    return ({'_id': {'$in': [doc['_id'] for doc in docs]}},
+            {'metadata.content_hash': 1, 'metadata.section_hashes': 1})
+
+
+def plan_individual_writes(docs, stored):
+    """
+    Return (writes, changed documents) for docs, given the stored documents
+    read with stored_hashes_query; unchanged documents get no write
+    """
+    stored = {doc['_id']: doc.get('metadata', {}) for doc in stored}
+    writes = []
+    changed = []
+    for doc in docs:
+        write = _individual_write(doc, stored.get(doc['_id']))
+        if write is not None:
+            writes.append(write)
+            changed.append(doc)
+    return writes, changed
+
+
+def bulk_write_failures(error, changed):
+    """
+    Return (written documents, failures) after an unordered bulk_write of
+    the changed documents raised error
+    """
+    if isinstance(error, pymongo.errors.BulkWriteError):
+        # writeErrors holds one entry per failed write, with its batch index
+        failed = {}
+        for write_error in error.details.get('writeErrors', []):
+            failed[write_error['index']] = write_error.get('errmsg', str(write_error))
+        failures = [(changed[index]['metadata']['source_file'], message) for index, message in failed.items()]
+        return [doc for index, doc in enumerate(changed) if index not in failed], failures
+    # The whole batch failed, e.g. the connection was lost
+    return [], [(doc['metadata']['source_file'], str(error)) for doc in changed]
+
+
+class IndividualBatchWriter:
+    """
+    Buffer college documents and write them to the individuals collection
+    in batches of batch_size with write_individual_batch.
+
+    Failed documents are printed with their source file as each batch is
+    written. written, skipped (unchanged), failed and write_seconds (time
+    spent in MongoDB) are kept for the run summary, changed_institutes
+    holds the institute of every written document for the master refresh and
+    failed_sources the source file of every document that failed.
+    """
+
+    def __init__(self, db, collection_name='individuals', batch_size=500):
+        self.db = db
+        self.collection_name = collection_name
+        self.batch_size = max(1, batch_size)
+        self.buffer = []
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self.write_seconds = 0.0
+        self.changed_institutes = []
+        self.failed_sources = []
+
+    def add(self, data):
+        """Prepare a parsed document and queue it, writing a batch when the buffer is full."""
+        self.add_prepared(prepare_individual_document(data))
+
+    def add_prepared(self, doc):
+        """Queue a document prepared by prepare_individual_document."""
+        self.buffer.append(doc)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered documents."""
+        if not self.buffer:
+            return
+        start = time.perf_counter()
+        written, skipped, failures = write_individual_batch(self.db, self.buffer, self.collection_name)
+        self.write_seconds += time.perf_counter() - start
+        for source_file, message in failures:
+            print(f"MongoDB error for {source_file}: {message}")
+        self.written += len(written)
+        self.skipped += skipped
+        self.failed += len(failures)
+        self.failed_sources.extend(source_file for source_file, _ in failures)
+        self.changed_institutes.extend(doc.get('institute', {}) for doc in written)
+        self.buffer = []
+
+
+def parse_for_import(xml_file):
+    """Parse and prepare one XML file in a worker process; returns (xml_file, document or None)"""
+    data = parse_xml_to_dict(xml_file)
+    return xml_file, (prepare_individual_document(data) if data is not None else None)
+
+
+def import_parallel(xml_files, writer, workers, queue_size=1000):
+    """
+    Parse xml_files in a process pool and write them with writer from a dedicated thread
+
+    The main thread hands parsed documents, in file order, to a queue of at
+    most queue_size documents that a writer thread drains into writer. When
+    MongoDB falls behind the queue fills up, the main thread blocks and no
+    new files are submitted to the pool, so memory stays bounded; at most
+    2 * workers files are being parsed at any time. An error on either side
+    stops the import: pending parses are cancelled, the writer thread is
+    stopped and the error is raised. When the main thread fails (or is
+    interrupted) the queued documents are discarded and the writer does not
+    flush what it has buffered. Returns the number of files that failed to
+    parse.
+    """
+    documents = queue.Queue(maxsize=max(1, queue_size))
+    writer_errors = []
+    stop = threading.Event()
+    
+    def drain():
+        while True:
+            doc = documents.get()
+            if doc is None or stop.is_set():
+                break
+            try:
+                writer.add_prepared(doc)
+            except BaseException as e:
+                writer_errors.append(e)
+                # Keep taking documents until the end marker so the main
+                # thread never blocks on a full queue
+                while documents.get() is not None:
+                    pass
+                return
+        if stop.is_set():
+            return
+        try:
+            writer.flush()
+        except BaseException as e:
+            # The end marker is already taken; nothing is left to drain
+            writer_errors.append(e)
+    
+    thread = threading.Thread(target=drain, name="mongodb-writer", daemon=True)
+    thread.start()
+    executor = ProcessPoolExecutor(max_workers=workers)
+    failed = 0
+    try:
+        pending = deque()
         
-        # Extract college ID for document ID
-        college_id = data.get('institute', {}).get('college_id')
-        if college_id:
-            # Use college_id as part of the document ID for better organization
-            data['_id'] = f"individual_{college_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        def hand_over():
+            nonlocal failed
+            xml_file, doc = pending.popleft().result()
+            if writer_errors:
+                raise RuntimeError("MongoDB writer stopped") from writer_errors[0]
+            if doc is None:
+                print(f"Failed to parse XML file: {xml_file}")
+                failed += 1
+            else:
+                # Blocks while the queue is full
+                documents.put(doc)
+            progress.update(1)
         
-        # Insert document
-        result = collection.insert_one(data)
-        return result.inserted_id
+        with tqdm(total=len(xml_files), desc="Processing XML files") as progress:
+            for xml_file in xml_files:
+                pending.append(executor.submit(parse_for_import, xml_file))
+                if len(pending) >= 2 * workers:
+                    hand_over()
+            while pending:
+                hand_over()
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if stop.is_set():
+            # Only this thread puts documents, so the None below fits once the queue is empty
+            while True:
+                try:
+                    documents.get_nowait()
+                except queue.Empty:
+                    break
+        documents.put(None)
+        thread.join()
     
-    except pymongo.errors.PyMongoError as e:
-        print(f"MongoDB error: {e}")
+    if writer_errors:
+        raise writer_errors[0]
+    return failed
+
+
+def changed_colleges_filter(institutes):
+    """
+    Query matching the individual documents of the colleges of the given institutes
+
+    Colleges without an ID are matched by name, as the master build groups them.
+    """
+    college_ids = sorted({inst['college_id'] for inst in institutes if inst.get('college_id')})
+    names = sorted({inst['name'] for inst in institutes if not inst.get('college_id') and inst.get('name')})
+    clauses = []
+    if college_ids:
+        clauses.append({'institute.college_id': {'$in': college_ids}})
+    if names:
+        clauses.append({'institute.college_id': {'$exists': False}, 'institute.name': {'$in': names}})
+    return {'$or': clauses} if clauses else {'_id': {'$in': []}}
+
+
+# Source documents processed per chunk by the client-side master build
+MASTER_CHUNK_SIZE = 500
+
+
+def _master_projection():
+    """Fields of an individual document the client-side master build reads"""
+    projection = {'_id': 1, 'institute.college_id': 1, 'institute.unnamed_id': 1, 'institute.name': 1,
+                  'metadata.source_file': 1, 'metadata.section_hashes': 1}
+    for section in SECTIONS:
+        projection[section.lower()] = 1
+    return projection
+
+
+def _structured_section(entries):
+    """Section entries with consistent header names and structure"""
+    structured_data = []
+    for entry in entries:
+        # Clean and standardize field names
+        cleaned_entry = {}
+        for key, value in entry.items():
+            # Convert keys to standard format
+            clean_key = key.strip()
+            # Keep the value as is
+            cleaned_entry[clean_key] = value
+        structured_data.append(cleaned_entry)
+    return structured_data
+
+
+def _apply_to_master(doc, college_id, college_name, existing):
+    """
+    Apply one source document to the master document existing (None for a new college)
+
+    Returns (write, master document); write is None if nothing changed.
+    existing is updated in place so later documents of the same chunk see the change.
+    """
+    doc_hashes = doc.get('metadata', {}).get('section_hashes', {})
+    source_file = doc.get('metadata', {}).get('source_file')
+    
+    if existing is None:
+        # Create new college document with structured data
+        master_doc = {
+            'college_id': college_id,
+            'college_name': college_name,
+            'metadata': {
+                'created_at': datetime.now(),
+                'last_updated': datetime.now(),
+                'source_files': [source_file or 'unknown'],
+                'section_hashes': dict(doc_hashes)
+            }
+        }
+        # Add each section with proper structure
+        for section in doc:
+            if section not in NON_SECTION_FIELDS:
+                master_doc[section] = _structured_section(doc[section])
+        return pymongo.InsertOne(master_doc), master_doc
+    
+    # Update existing college document
+    update_data = {}
+    stored_hashes = existing.setdefault('metadata', {}).setdefault('section_hashes', {})
+    for section in doc:
+        if section not in NON_SECTION_FIELDS:
+            if section in doc_hashes and stored_hashes.get(section) == doc_hashes[section]:
+                continue
+            update_data[section] = _structured_section(doc[section])
+            if section in doc_hashes:
+                update_data[f'metadata.section_hashes.{section}'] = doc_hashes[section]
+                stored_hashes[section] = doc_hashes[section]
+    
+    source_files = existing['metadata'].setdefault('source_files', [])
+    if not update_data and (not source_file or source_file in source_files):
+        return None, existing
+    
+    # Update metadata
+    if source_file and source_file not in source_files:
+        source_files.append(source_file)
+    update_data['metadata.last_updated'] = datetime.now()
+    update_data['metadata.source_files'] = list(source_files)
+    return pymongo.UpdateOne({'college_id': college_id}, {'$set': update_data}), existing
+
+
+def _master_key(doc):
+    """(college_id, college_name) of a source document, or None if it has neither"""
+    institute = doc.get('institute', {})
+    college_id = institute.get('college_id')
+    college_name = institute.get('name')
+    
+    if not college_name:
+        print(f"Warning: Missing college ID and name in document {doc.get('_id')}")
         return None
-    except Exception as e:
-        print(f"Unexpected error: {e}")
+    if not college_id:
+        # Documents imported before unnamed_id existed fall back to the name,
+        # as in master_build_pipeline
+        college_id = institute.get('unnamed_id') or f"unnamed_{college_name}"
+    return college_id, college_name
+
+
+def _apply_master_chunk(master, chunk):
+    """
+    Apply a chunk of source documents to the master collection
+
+    The chunk's existing master documents are read with one $in query and
+    the changes are written with one ordered bulk_write, so a college
+    inserted early in the chunk is updated by its later documents.
+    Returns the number of documents that changed nothing.
+    """
+    keyed = [(doc, _master_key(doc)) for doc in chunk]
+    college_ids = list({key[0] for _, key in keyed if key})
+    existing = {m['college_id']: m for m in master.find(
+        {'college_id': {'$in': college_ids}},
+        {'_id': 0, 'college_id': 1, 'metadata.source_files': 1, 'metadata.section_hashes': 1})}
+    
+    writes = []
+    unchanged = 0
+    for doc, key in keyed:
+        if key is None:
+            continue
+        college_id, college_name = key
+        write, existing[college_id] = _apply_to_master(doc, college_id, college_name, existing.get(college_id))
+        if write is None:
+            unchanged += 1
+        else:
+            writes.append(write)
+    if writes:
+        master.bulk_write(writes, ordered=True)
+    return unchanged
+
+
+def peak_rss_mib():
+    """Peak resident memory of this process in MiB, or None where the resource module is missing"""
+    try:
+        import resource
+    except ImportError:  # Windows
         return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB on Linux
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
 
 
-def create_master_database(db, source_collection='individuals', master_collection='master_database'):
+def create_master_database(db, source_collection='individuals', master_collection='master_database',
+                           query=None, chunk_size=MASTER_CHUNK_SIZE, trace_memory=False):
     """
     Create a structured master database by organizing data by college with proper headers
+
+    Only the source documents matching query are applied (all if None), in
+    import order (metadata.imported_at, then _id) as in master_build_pipeline,
+    and only sections whose content hash differs from the stored one are
+    rewritten.
+    Source documents are streamed from a batched cursor with only the fields
+    the build needs and applied chunk_size at a time, so memory use does not
+    grow with the collection. The peak resident memory of the process is
+    always reported; trace_memory also reports the build's own peak traced
+    memory (tracemalloc slows the build down).
     """
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
     try:
         # Get source collection
         source = db[source_collection]
@@ -185,95 +725,34 @@ def create_master_database(db, source_collection='individuals', master_collectio
         # Create or get master collection
         master = db[master_collection]
         
-        # Create index on college_id for faster lookups
-        master.create_index('college_id', unique=True)
+        # Unique college_id index plus the indexes the dashboard queries use
+        ensure_master_indexes(master)
         
-        # Get all documents from source collection
-        all_docs = list(source.find({}))
-        print(f"Creating structured master database from {len(all_docs)} documents...")
+        # Apply documents in import order, like master_build_pipeline; the
+        # index lets the server stream them sorted instead of sorting in memory
+        source.create_index([('metadata.imported_at', pymongo.ASCENDING), ('_id', pymongo.ASCENDING)],
+                            name='imported_at_id')
         
-        # Process each document
-        for doc in tqdm(all_docs, desc="Processing colleges"):
-            college_id = doc.get('institute', {}).get('college_id')
-            college_name = doc.get('institute', {}).get('name')
-            
-            if not college_id or not college_name:
-                # Generate a unique ID if college_id is missing
-                if not college_id and college_name:
-                    college_id = f"unnamed_{hash(college_name) % 10000}"
-                    print(f"Generated ID {college_id} for college: {college_name}")
-                else:
-                    print(f"Warning: Missing college ID and name in document {doc.get('_id')}")
-                    continue
-            
-            # Check if college already exists in master collection
-            existing = master.find_one({'college_id': college_id})
-            
-            if existing:
-                # Update existing college document
-                update_data = {}
-                
-                # Update each section with proper structure
-                for section in doc:
-                    if section not in ['_id', 'metadata', 'institute']:
-                        # Ensure consistent header names and structure
-                        structured_data = []
-                        for entry in doc[section]:
-                            # Clean and standardize field names
-                            cleaned_entry = {}
-                            for key, value in entry.items():
-                                # Convert keys to standard format (camelCase)
-                                clean_key = key.strip()
-                                # Keep the value as is
-                                cleaned_entry[clean_key] = value
-                            structured_data.append(cleaned_entry)
-                        
-                        update_data[section] = structured_data
-                
-                # Update metadata
-                update_data['metadata.last_updated'] = datetime.now()
-                update_data['metadata.source_files'] = existing.get('metadata', {}).get('source_files', [])
-                source_file = doc.get('metadata', {}).get('source_file')
-                if source_file and source_file not in update_data['metadata.source_files']:
-                    update_data['metadata.source_files'].append(source_file)
-                
-                # Update the document
-                master.update_one(
-                    {'college_id': college_id},
-                    {'$set': update_data}
-                )
-            else:
-                # Create new college document with structured data
-                master_doc = {
-                    'college_id': college_id,
-                    'college_name': college_name,
-                    'metadata': {
-                        'created_at': datetime.now(),
-                        'last_updated': datetime.now(),
-                        'source_files': [doc.get('metadata', {}).get('source_file', 'unknown')]
-                    }
-                }
-                
-                # Add each section with proper structure
-                for section in doc:
-                    if section not in ['_id', 'metadata', 'institute']:
-                        # Ensure consistent header names and structure
-                        structured_data = []
-                        for entry in doc[section]:
-                            # Clean and standardize field names
-                            cleaned_entry = {}
-                            for key, value in entry.items():
-                                # Convert keys to standard format
-                                clean_key = key.strip()
-                                # Keep the value as is
-                                cleaned_entry[clean_key] = value
-                            structured_data.append(cleaned_entry)
-                        
-                        master_doc[section] = structured_data
-                
-                # Insert the document
-                master.insert_one(master_doc)
+        total = source.count_documents(query or {})
+        print(f"Creating structured master database from {total} documents...")
+        cursor = source.find(query or {}, _master_projection(), batch_size=chunk_size).sort(
+            [('metadata.imported_at', pymongo.ASCENDING), ('_id', pymongo.ASCENDING)])
+        
+        unchanged = 0
+        chunk = []
+        with tqdm(total=total, desc="Processing colleges") as progress:
+            for doc in cursor:
+                chunk.append(doc)
+                if len(chunk) >= chunk_size:
+                    unchanged += _apply_master_chunk(master, chunk)
+                    progress.update(len(chunk))
+                    chunk = []
+            if chunk:
+                unchanged += _apply_master_chunk(master, chunk)
+                progress.update(len(chunk))
         
+        if unchanged:
+            print(f"{unchanged} documents already up to date in the master database")
         print(f"Master database created successfully with {master.count_documents({})} colleges")
         return True
     
@@ -283,12 +762,255 @@ def create_master_database(db, source_collection='individuals', master_collectio
     except Exception as e:
         print(f"Unexpected error: {e}")
         return False
+    finally:
+        peak_rss = peak_rss_mib()
+        if peak_rss is not None:
+            print(f"Process peak resident memory: {peak_rss:.1f} MiB")
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"Master build peak memory: {peak / 1024 / 1024:.1f} MiB")
+
+
+def _dedupe_in_order(array_expr, initial_expr):
+    """Aggregation expression appending array_expr items missing from initial_expr, keeping order"""
+    return {'$reduce': {
+        'input': array_expr,
+        'initialValue': initial_expr,
+        'in': {'$cond': [{'$in': ['$$this', '$$value']}, '$$value',
+                         {'$concatArrays': ['$$value', ['$$this']]}]}
+    }}
+
+
+def _without_fields(object_expr, fields):
+    """Aggregation expression for object_expr without the given top-level fields"""
+    return {'$arrayToObject': {'$filter': {
+        'input': {'$objectToArray': object_expr},
+        'cond': {'$not': [{'$in': ['$$this.k', fields]}]}
+    }}}
+
+
+def master_build_pipeline(master_collection='master_database', query=None):
+    """
+    Return the aggregation pipeline that builds master_collection from the individuals collection
+
+    It reproduces create_master_database inside MongoDB: documents are applied
+    in import order, each section comes from the latest document that has it,
+    the college name and created_at come from the first one, and source_files
+    lists every source file once in first-seen order. $merge on college_id
+    inserts new colleges and updates existing ones in place. Only the source
+    documents matching query are applied (all if None).
+    """
+    # Same ID as _master_key
+    college_id = {'$ifNull': ['$institute.college_id',
+                              {'$ifNull': ['$institute.unnamed_id',
+                                           {'$concat': ['unnamed_', '$institute.name']}]}]}
+    # Documents without a college name are skipped, like the client-side build
+    match = {'institute.name': {'$nin': [None, '']}}
+    if query:
+        match = {'$and': [match, query]}
+    return [
+        {'$match': match},
+        {'$sort': {'metadata.imported_at': 1, '_id': 1}},
+        {'$group': {
+            '_id': college_id,
+            'college_name': {'$first': '$institute.name'},
+            # Later documents overwrite the sections of earlier ones
+            'sections': {'$mergeObjects': '$$ROOT'},
+            'source_files': {'$push': {'$ifNull': ['$metadata.source_file', 'unknown']}},
+            'section_hashes': {'$mergeObjects': '$metadata.section_hashes'},
+        }},
+        {'$replaceRoot': {'newRoot': {'$mergeObjects': [
+            _without_fields('$sections', NON_SECTION_FIELDS),
+            {
+                'college_id': '$_id',
+                'college_name': '$college_name',
+                'metadata': {
+                    'created_at': '$$NOW',
+                    'last_updated': '$$NOW',
+                    'source_files': _dedupe_in_order('$source_files', []),
+                    'section_hashes': '$section_hashes',
+                },
+            },
+        ]}}},
+        {'$merge': {
+            'into': master_collection,
+            'on': 'college_id',
+            # Keep the existing name, _id and created_at; replace the sections
+            # and add new source files
+            'whenMatched': [
+                {'$replaceRoot': {'newRoot': {'$mergeObjects': [
+                    '$$ROOT',
+                    _without_fields('$$new', ['_id', 'college_id', 'college_name', 'metadata']),
+                    {'metadata': {'$mergeObjects': [
+                        '$metadata',
+                        {
+                            'last_updated': '$$NOW',
+                            'source_files': _dedupe_in_order('$$new.metadata.source_files',
+                                                             {'$ifNull': ['$metadata.source_files', []]}),
+                            'section_hashes': {'$mergeObjects': [{'$ifNull': ['$metadata.section_hashes', {}]},
+                                                                 '$$new.metadata.section_hashes']},
+                        },
+                    ]}},
+                ]}}},
+            ],
+            'whenNotMatched': 'insert',
+        }},
+    ]
+
+
+def create_master_database_pipeline(db, source_collection='individuals', master_collection='master_database',
+                                    query=None):
+    """
+    Build or refresh the master database inside MongoDB with one aggregation ending in $merge
+
+    Only the colleges of the source documents matching query are refreshed
+    (all if None). Needs MongoDB 4.2 or later. Returns False if the server
+    rejects the pipeline.
+    """
+    try:
+        master = db[master_collection]
+        # $merge on college_id requires a unique index on it
+        ensure_master_indexes(master)
+        
+        print(f"Building master database from {source_collection} with an aggregation pipeline...")
+        db[source_collection].aggregate(master_build_pipeline(master_collection, query), allowDiskUse=True)
+        
+        print(f"Master database created successfully with {master.count_documents({})} colleges")
+        return True
+    
+    except pymongo.errors.PyMongoError as e:
+        print(f"MongoDB error: {e}")
+        return False
+
+
+def build_master_database(db, source_collection='individuals', master_collection='master_database',
+                          mode='pipeline', query=None, chunk_size=MASTER_CHUNK_SIZE, trace_memory=False):
+    """
+    Build the master database with the aggregation pipeline (mode='pipeline') or
+    document by document in Python (mode='client')
+
+    query limits the refresh to the colleges of the matching source documents,
+    see changed_colleges_filter. chunk_size and trace_memory apply to the
+    client-side build, see create_master_database. The pipeline mode falls
+    back to the client-side build if the server cannot run it.
+    """
+    if mode == 'pipeline':
+        if create_master_database_pipeline(db, source_collection, master_collection, query):
+            return True
+        print("Falling back to the client-side master database build")
+    return create_master_database(db, source_collection, master_collection, query, chunk_size, trace_memory)
+
+
+def _comparable_master(collection):
+    """Master documents keyed by college_id, without _id and timestamps"""
+    docs = {}
+    for doc in collection.find({}, {'_id': 0, 'metadata.created_at': 0, 'metadata.last_updated': 0}):
+        docs[doc['college_id']] = doc
+    return docs
+
+
+def compare_master_builds(db, source_collection='individuals', master_collection='master_database'):
+    """
+    Time the client-side and pipeline master builds against each other
+
+    Both build into scratch copies of master_collection starting from its
+    current contents, so the real master database is not modified.
+    """
+    seconds = {}
+    results = {}
+    existing = list(db[master_collection].find({}))
+    for mode in ['client', 'pipeline']:
+        target = f"{master_collection}_{mode}_comparison"
+        db[target].drop()
+        if existing:
+            db[target].insert_many(existing)
+        start = time.perf_counter()
+        if mode == 'client':
+            ok = create_master_database(db, source_collection, target)
+        else:
+            ok = create_master_database_pipeline(db, source_collection, target)
+        seconds[mode] = time.perf_counter() - start
+        results[mode] = _comparable_master(db[target]) if ok else None
+        db[target].drop()
+    
+    print(f"Client-side build: {seconds['client']:.2f}s, aggregation pipeline: {seconds['pipeline']:.2f}s")
+    if results['pipeline'] is None:
+        print("The aggregation pipeline failed; only the client-side build is available on this server")
+    else:
+        if seconds['pipeline'] > 0:
+            print(f"Pipeline speedup: {seconds['client'] / seconds['pipeline']:.1f}x")
+        same = [cid for cid in results['client'] if results['client'][cid] == results['pipeline'].get(cid)]
+        print(f"{len(same)} of {len(results['client'])} colleges identical in both builds")
+    return seconds
+
+
+def changed_master_ids(db, master_collection, institutes):
+    """College IDs in the master database of the colleges of the given institutes"""
+    college_ids = sorted({inst['college_id'] for inst in institutes if inst.get('college_id')})
+    names = sorted({inst['name'] for inst in institutes if not inst.get('college_id') and inst.get('name')})
+    # Colleges without an ID got a generated one in the master build; find them by name
+    query = {'$or': [{'college_id': {'$in': college_ids}}, {'college_name': {'$in': names}}]}
+    return [doc['college_id'] for doc in db[master_collection].find(query, {'_id': 0, 'college_id': 1})]
+
+
+def refresh_master_database(db, individual_collection, master_collection, changed_institutes, processed,
+                            master_mode='pipeline', master_chunk_size=MASTER_CHUNK_SIZE, trace_memory=False,
+                            rollups=True):
+    """
+    Bring the master database up to date after an import
+
+    An empty master database is built from scratch; otherwise only the
+    colleges of changed_institutes are refreshed, and nothing is done if
+    there are none. processed is the number of imported documents, written
+    or unchanged. With rollups the analytics rollups of the same colleges
+    are refreshed afterwards, see master_rollups.refresh_rollups, unless
+    the master build failed.
+    """
+    if master_mode == 'compare' and processed > 0:
+        compare_master_builds(db, individual_collection, master_collection)
+        master_mode = 'pipeline'
+    if db[master_collection].estimated_document_count() == 0:
+        if processed > 0:
+            built = build_master_database(db, individual_collection, master_collection, master_mode,
+                                          None, master_chunk_size, trace_memory)
+            if not built:
+                print("Master database build failed; rollups not refreshed")
+            elif rollups:
+                start = time.perf_counter()
+                refreshed = refresh_rollups(db, master_collection)
+                print(f"Built {refreshed} rollups in {time.perf_counter() - start:.2f}s")
+    elif changed_institutes:
+        query = changed_colleges_filter(changed_institutes)
+        built = build_master_database(db, individual_collection, master_collection, master_mode,
+                                      query, master_chunk_size, trace_memory)
+        if not built:
+            print("Master database refresh failed; rollups not refreshed")
+        elif rollups:
+            start = time.perf_counter()
+            college_ids = changed_master_ids(db, master_collection, changed_institutes)
+            refreshed = refresh_rollups(db, master_collection, college_ids)
+            print(f"Refreshed {refreshed} rollups of {len(college_ids)} colleges "
+                  f"in {time.perf_counter() - start:.2f}s")
+    else:
+        print("Master database is up to date")
 
 
 def process_all_xml_files(xml_dir, host='localhost', port=27017, db_name='nirf_database', 
-                         individual_collection='individuals', master_collection='master_database'):
+                         individual_collection='individuals', master_collection='master_database',
+                         batch_size=500, master_mode='pipeline', master_chunk_size=MASTER_CHUNK_SIZE,
+                         trace_memory=False, workers=1, queue_size=1000, rollups=True):
     """
     Process all XML files in a directory and create a master database
+
+    With workers > 1 the files are parsed in that many processes while a
+    writer thread writes them, see import_parallel. Documents are written in
+    batches of batch_size, see write_individual_batch;
+    documents whose content did not change since the last import are skipped
+    and only the colleges with changed documents are refreshed in the master
+    database. master_mode, master_chunk_size and trace_memory select how the
+    master database is built, see build_master_database. rollups refreshes
+    the analytics rollups of the changed colleges afterwards.
     """
     # Get all XML files in the directory
     xml_files = glob.glob(os.path.join(xml_dir, '*.xml'))
@@ -308,29 +1030,39 @@ def process_all_xml_files(xml_dir, host='localhost', port=27017, db_name='nirf_d
     
     try:
         # Process each XML file
-        successful_imports = 0
         failed_imports = 0
+        writer = IndividualBatchWriter(db, individual_collection, batch_size)
+        start = time.perf_counter()
         
-        for xml_file in tqdm(xml_files, desc="Processing XML files"):
-            # Parse XML to dictionary
-            data = parse_xml_to_dict(xml_file)
-            if data is None:
-                print(f"Failed to parse XML file: {xml_file}")
-                failed_imports += 1
-                continue
+        if workers > 1:
+            print(f"Using {workers} worker processes")
+            failed_imports += import_parallel(xml_files, writer, workers, queue_size)
+        else:
+            for xml_file in tqdm(xml_files, desc="Processing XML files"):
+                # Parse XML to dictionary
+                data = parse_xml_to_dict(xml_file)
+                if data is None:
+                    print(f"Failed to parse XML file: {xml_file}")
+                    failed_imports += 1
+                    continue
+                
+                # Buffered; written once the batch is full
+                writer.add(data)
             
-            # Insert data to MongoDB individuals collection
-            result = insert_individual_data(db, data, individual_collection)
-            if result:
-                successful_imports += 1
-            else:
-                failed_imports += 1
+            writer.flush()
+        failed_imports += writer.failed
+        elapsed = time.perf_counter() - start
+        processed = writer.written + writer.skipped
         
-        print(f"XML import completed. Successful: {successful_imports}, Failed: {failed_imports}")
+        print(f"XML import completed. Written: {writer.written}, Unchanged (skipped): {writer.skipped}, "
+              f"Failed: {failed_imports}")
+        print(f"Imported {processed / elapsed if elapsed > 0 else 0.0:.1f} docs/sec overall, "
+              f"{writer.written / writer.write_seconds if writer.write_seconds > 0 else 0.0:.1f} docs/sec "
+              f"in MongoDB writes (batch size {batch_size})")
         
-        # Create master database
-        if successful_imports > 0:
-            create_master_database(db, individual_collection, master_collection)
+        # Create or refresh the master database
+        refresh_master_database(db, individual_collection, master_collection, writer.changed_institutes,
+                                processed, master_mode, master_chunk_size, trace_memory, rollups)
         
         return True
     
@@ -342,27 +1074,47 @@ def process_all_xml_files(xml_dir, host='localhost', port=27017, db_name='nirf_d
 
 
 def main():
-    # Check command line arguments
-    if len(sys.argv) > 1 and sys.argv[1] == '--help':
-        print("Usage: python xml_to_mongodb.py [xml_dir] [host] [port] [db_name] [individual_collection] [master_collection]")
-        print("Example: python xml_to_mongodb.py ./All-XML localhost 27017 nirf_database individuals master_database")
-        return
-    
-    # Get parameters
-    xml_dir = sys.argv[1] if len(sys.argv) > 1 else './All-XML'
-    host = sys.argv[2] if len(sys.argv) > 2 else 'localhost'
-    port = int(sys.argv[3]) if len(sys.argv) > 3 else 27017  # Default MongoDB port
-    db_name = sys.argv[4] if len(sys.argv) > 4 else 'nirf_database'
-    individual_collection = sys.argv[5] if len(sys.argv) > 5 else 'individuals'
-    master_collection = sys.argv[6] if len(sys.argv) > 6 else 'master_database'
+    # The positional arguments keep the original command line working
+    parser = argparse.ArgumentParser(
+        description="Import NIRF XML files into MongoDB and build the master database",
+        epilog="Example: python xml_to_mongodb.py ./All-XML localhost 27017 nirf_database individuals master_database")
+    parser.add_argument('xml_dir', nargs='?', default='./All-XML', help="Directory with XML files (default: ./All-XML)")
+    parser.add_argument('host', nargs='?', default='localhost', help="MongoDB host (default: localhost)")
+    parser.add_argument('port', nargs='?', type=int, default=27017, help="MongoDB port (default: 27017)")
+    parser.add_argument('db_name', nargs='?', default='nirf_database', help="Database name (default: nirf_database)")
+    parser.add_argument('individual_collection', nargs='?', default='individuals',
+                        help="Collection for per-file documents (default: individuals)")
+    parser.add_argument('master_collection', nargs='?', default='master_database',
+                        help="Collection for the master database (default: master_database)")
+    parser.add_argument('--batch-size', type=int, default=500,
+                        help="Documents per unordered bulk write (default: 500)")
+    parser.add_argument('--master-build', choices=['pipeline', 'client', 'compare'], default='pipeline',
+                        help="Build master_database with an aggregation pipeline inside MongoDB (default), "
+                             "document by document in Python, or time both first and then use the pipeline")
+    parser.add_argument('--master-chunk-size', type=int, default=MASTER_CHUNK_SIZE,
+                        help=f"Documents per chunk in the client-side master build (default: {MASTER_CHUNK_SIZE})")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Report the peak memory of the client-side master build (slower)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes parsing XML while a writer thread writes to MongoDB "
+                             "(default: 1 = parse and write in turn, 0 = one per CPU core)")
+    parser.add_argument('--queue-size', type=int, default=1000,
+                        help="Parsed documents waiting for the writer before parsing pauses (default: 1000)")
+    parser.add_argument('--no-rollups', action='store_true',
+                        help="Do not refresh the analytics rollup collections after the import")
+    args = parser.parse_args()
     
     # Check if directory exists
-    if not os.path.isdir(xml_dir):
-        print(f"Error: Directory '{xml_dir}' does not exist.")
+    if not os.path.isdir(args.xml_dir):
+        print(f"Error: Directory '{args.xml_dir}' does not exist.")
         return
     
     # Process all XML files
-    process_all_xml_files(xml_dir, host, port, db_name, individual_collection, master_collection)
+    process_all_xml_files(args.xml_dir, args.host, args.port, args.db_name, args.individual_collection,
+                          args.master_collection, args.batch_size, args.master_build,
+                          args.master_chunk_size, args.trace_memory,
+                          args.workers if args.workers > 0 else (os.cpu_count() or 1), args.queue_size,
+                          not args.no_rollups)
 
 
 if __name__ == "__main__":
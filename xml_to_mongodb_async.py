@@ -0,0 +1,302 @@
+"""
+Asyncio variant of xml_to_mongodb.py.
+
+Importing thousands of small college documents is dominated by round trips
+to MongoDB. This loader keeps several bulk writes in flight at once on an
+async driver, while XML files are read and parsed in a process pool, so
+the network latency of one batch is hidden behind the others.
+
+Documents, content hashes and change detection are the same as in
+xml_to_mongodb.py (see write_individual_batch); the master database is then
+refreshed with the same synchronous code.
+
+The async driver is pymongo's AsyncMongoClient (pymongo 4.10 or later, as
+requirements.txt asks for), or motor on an older pymongo if it is
+installed. AsyncIndividualLoader takes any async database object with the
+motor/pymongo async collection API, so it can run against a local mongod
+or an in-process stand-in.
+"""
+import argparse
+import asyncio
+import glob
+import inspect
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pymongo
+from tqdm import tqdm
+
+from xml_to_mongodb import (ENCODING_ERRORS, MASTER_CHUNK_SIZE, bulk_write_failures, connect_to_mongodb,
+                            parse_for_import, plan_individual_writes, refresh_master_database,
+                            stored_hashes_query)
+
+
+def async_mongo_client(host='localhost', port=27017):
+    """Return an async MongoDB client: pymongo's AsyncMongoClient, or motor's client"""
+    try:
+        from pymongo import AsyncMongoClient
+    except ImportError:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        return AsyncIOMotorClient(host, port)
+    return AsyncMongoClient(host, port)
+
+
+async def close_client(client):
+    """Close an async client; AsyncMongoClient.close is a coroutine, motor's is not"""
+    result = client.close()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def write_individual_batch_async(db, docs, collection_name='individuals'):
+    """
+    Async version of xml_to_mongodb.write_individual_batch
+
+    Returns (written documents, skipped count, failures).
+    """
+    if not docs:
+        return [], 0, []
+    collection = db[collection_name]
+    try:
+        stored = await collection.find(*stored_hashes_query(docs)).to_list(None)
+        writes, changed = plan_individual_writes(docs, stored)
+    except pymongo.errors.PyMongoError as e:
+        return [], 0, [(doc['metadata']['source_file'], str(e)) for doc in docs]
+
+    skipped = len(docs) - len(changed)
+    if not writes:
+        return [], skipped, []
+
+    try:
+        await collection.bulk_write(writes, ordered=False)
+        return changed, skipped, []
+    except ENCODING_ERRORS:
+        # Find the documents the encoder rejects, as in write_one_by_one
+        written = []
+        failures = []
+        for write, doc in zip(writes, changed):
+            try:
+                await collection.bulk_write([write], ordered=False)
+                written.append(doc)
+            except (pymongo.errors.PyMongoError, *ENCODING_ERRORS) as e:
+                failures.append((doc['metadata']['source_file'], str(e)))
+        return written, skipped, failures
+    except pymongo.errors.PyMongoError as e:
+        written, failures = bulk_write_failures(e, changed)
+        return written, skipped, failures
+
+
+class AsyncIndividualLoader:
+    """
+    Buffer prepared college documents and write them in batches of
+    batch_size, with up to concurrency batches in flight at once.
+
+    add_prepared waits while all write slots are busy, which slows the
+    parsing side down to what MongoDB can take. A batch whose write raises
+    (an error write_individual_batch_async does not turn into per-document
+    failures) stops the load: the error is raised from the next
+    add_prepared, flush or close. Counters are the same as
+    xml_to_mongodb.IndividualBatchWriter; write_seconds adds up the time of
+    every batch, so with concurrent writes it can exceed the wall time.
+    """
+
+    def __init__(self, db, collection_name='individuals', batch_size=500, concurrency=4):
+        self.db = db
+        self.collection_name = collection_name
+        self.batch_size = max(1, batch_size)
+        self.slots = asyncio.Semaphore(max(1, concurrency))
+        self.buffer = []
+        self.tasks = set()
+        self.errors = []
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self.write_seconds = 0.0
+        self.changed_institutes = []
+
+    async def add_prepared(self, doc):
+        """Queue a prepared document, starting a batch write when the buffer is full."""
+        self.buffer.append(doc)
+        if len(self.buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        """Start writing the buffered documents once a write slot is free."""
+        self._raise_error()
+        if not self.buffer:
+            return
+        docs = self.buffer
+        self.buffer = []
+        await self.slots.acquire()
+        if self.errors:
+            self.slots.release()
+            self._raise_error()
+        task = asyncio.create_task(self._write(docs))
+        self.tasks.add(task)
+        task.add_done_callback(self._write_done)
+
+    def _write_done(self, task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.errors.append(task.exception())
+
+    def _raise_error(self):
+        if self.errors:
+            raise self.errors[0]
+
+    async def _write(self, docs):
+        try:
+            start = time.perf_counter()
+            written, skipped, failures = await write_individual_batch_async(self.db, docs, self.collection_name)
+            self.write_seconds += time.perf_counter() - start
+        finally:
+            self.slots.release()
+        for source_file, message in failures:
+            print(f"MongoDB error for {source_file}: {message}")
+        self.written += len(written)
+        self.skipped += skipped
+        self.failed += len(failures)
+        self.changed_institutes.extend(doc.get('institute', {}) for doc in written)
+
+    async def close(self):
+        """Write what is left in the buffer and wait for every batch in flight."""
+        await self.flush()
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self._raise_error()
+
+    def cancel(self):
+        """Cancel the batches in flight."""
+        for task in list(self.tasks):
+            task.cancel()
+
+
+async def load_xml_files_async(xml_files, loader, workers=1):
+    """
+    Parse xml_files in a pool of worker processes and hand them to loader in file order
+
+    At most 2 * workers files are parsed at any time, and parsing waits
+    while all of the loader's write slots are busy. On an error the pending
+    parses and writes are cancelled and the error is raised. Returns the
+    number of files that failed to parse.
+    """
+    loop = asyncio.get_running_loop()
+    workers = max(1, workers)
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    failed = 0
+
+    async def hand_over():
+        nonlocal failed
+        xml_file, doc = await pending.popleft()
+        if doc is None:
+            print(f"Failed to parse XML file: {xml_file}")
+            failed += 1
+        else:
+            # Waits while every write slot is busy
+            await loader.add_prepared(doc)
+        progress.update(1)
+
+    try:
+        with tqdm(total=len(xml_files), desc="Processing XML files") as progress:
+            for xml_file in xml_files:
+                pending.append(loop.run_in_executor(executor, parse_for_import, xml_file))
+                if len(pending) >= 2 * workers:
+                    await hand_over()
+            while pending:
+                await hand_over()
+        await loader.close()
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        loader.cancel()
+        raise
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return failed
+
+
+async def import_xml_directory(xml_dir, host='localhost', port=27017, db_name='nirf_database',
+                               individual_collection='individuals', batch_size=500, concurrency=4, workers=1):
+    """
+    Import every XML file of xml_dir into individual_collection with the async driver
+
+    Returns the finished AsyncIndividualLoader, or None if there was nothing to import.
+    """
+    xml_files = sorted(glob.glob(os.path.join(xml_dir, '*.xml')))
+    if not xml_files:
+        print(f"No XML files found in directory: {xml_dir}")
+        return None
+    print(f"Found {len(xml_files)} XML files to process")
+
+    client = async_mongo_client(host, port)
+    try:
+        db = client[db_name]
+        await db.command('ping')
+        print(f"Connected successfully to MongoDB at {host}:{port}")
+        loader = AsyncIndividualLoader(db, individual_collection, batch_size, concurrency)
+        start = time.perf_counter()
+        failed = await load_xml_files_async(xml_files, loader, workers)
+        elapsed = time.perf_counter() - start
+    finally:
+        await close_client(client)
+
+    processed = loader.written + loader.skipped
+    print(f"XML import completed. Written: {loader.written}, Unchanged (skipped): {loader.skipped}, "
+          f"Failed: {failed + loader.failed}")
+    print(f"Imported {processed / elapsed if elapsed > 0 else 0.0:.1f} docs/sec "
+          f"(batch size {batch_size}, {concurrency} concurrent writes, {workers} worker processes)")
+    return loader
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import NIRF XML files into MongoDB with concurrent async bulk writes",
+        epilog="Example: python xml_to_mongodb_async.py ./All-XML localhost 27017 --concurrency 8")
+    parser.add_argument('xml_dir', nargs='?', default='./All-XML', help="Directory with XML files (default: ./All-XML)")
+    parser.add_argument('host', nargs='?', default='localhost', help="MongoDB host (default: localhost)")
+    parser.add_argument('port', nargs='?', type=int, default=27017, help="MongoDB port (default: 27017)")
+    parser.add_argument('db_name', nargs='?', default='nirf_database', help="Database name (default: nirf_database)")
+    parser.add_argument('individual_collection', nargs='?', default='individuals',
+                        help="Collection for per-file documents (default: individuals)")
+    parser.add_argument('master_collection', nargs='?', default='master_database',
+                        help="Collection for the master database (default: master_database)")
+    parser.add_argument('--batch-size', type=int, default=500, help="Documents per bulk write (default: 500)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Bulk writes in flight at once (default: 4)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes reading and parsing XML (default: 1, 0 = one per CPU core)")
+    parser.add_argument('--master-build', choices=['pipeline', 'client', 'compare'], default='pipeline',
+                        help="How master_database is refreshed, see xml_to_mongodb.py (default: pipeline)")
+    parser.add_argument('--no-rollups', action='store_true',
+                        help="Do not refresh the analytics rollup collections after the import")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.xml_dir):
+        print(f"Error: Directory '{args.xml_dir}' does not exist.")
+        return
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    loader = asyncio.run(import_xml_directory(args.xml_dir, args.host, args.port, args.db_name,
+                                              args.individual_collection, args.batch_size,
+                                              args.concurrency, workers))
+    if loader is None:
+        return
+
+    # The master refresh is a few server-side operations; run it on the synchronous driver
+    db, client = connect_to_mongodb(args.host, args.port, args.db_name)
+    if db is None:
+        print("Failed to connect to MongoDB.")
+        return
+    try:
+        refresh_master_database(db, args.individual_collection, args.master_collection, loader.changed_institutes,
+                                loader.written + loader.skipped, args.master_build, MASTER_CHUNK_SIZE,
+                                rollups=not args.no_rollups)
+    finally:
+        client.close()
+        print("MongoDB connection closed.")
+
+
+if __name__ == "__main__":
+    main()